@@ -0,0 +1,17 @@
+import os
+import sys
+
+# 세 데모의 성능 측정 (화면 없이 실행)
+# 사용법 (vibe 폴더에서): python -m bench --sizes 1e3,1e4,1e5 --out results.json
+# 자세한 내용은 bench/README.md
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+VIBE_DIR = os.path.dirname(BENCH_DIR)
+SHARED_DIR = os.path.join(VIBE_DIR, 'shared')
+DEMO_DIRS = {
+    'lecture': os.path.join(VIBE_DIR, 'demo1_lecture_manager'),
+    'faq': os.path.join(VIBE_DIR, 'demo2_faq_chatbot'),
+    'staff': os.path.join(VIBE_DIR, 'demo3_data_dashboard'),
+}
+# 메모리 측정(rss_bytes)은 앱의 성능 기록(shared/instrument.py)과 같은 것을 씁니다.
+if SHARED_DIR not in sys.path:
+    sys.path.insert(0, SHARED_DIR)
@@ -0,0 +1,139 @@
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from . import VIBE_DIR
+from .datagen import parse_count
+from .harness import REPEAT, Bench
+from .report import REGRESSION_RATIO, compare_reports, read_report, write_report
+from .scenarios import SCENARIOS, enter_demo
+
+# 명령줄 (vibe 폴더에서)
+#   python -m bench [run] --apps lecture,faq,staff --sizes 1e3,1e4,1e5 --out results.json
+#   python -m bench compare before.json after.json
+#   python -m bench one staff 1e5      (한 앱 x 한 크기만, 결과를 화면에 출력)
+# run은 (앱, 크기)마다 새 프로세스에서 'one'을 실행합니다. 모듈/메모리 상태가 서로 섞이지 않고,
+# 메모리가 모자라 프로세스가 죽어도 그 항목만 오류로 남습니다.
+DEFAULT_SIZES = '1e3,1e4,1e5'
+DEFAULT_OUTPUT = 'bench_results.json'
+
+
+def _list(text, parse=str):
+    return [parse(part.strip()) for part in text.split(',') if part.strip()]
+
+
+def _apps(text):
+    apps = _list(text)
+    unknown = [app for app in apps if app not in SCENARIOS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"알 수 없는 앱: {', '.join(unknown)} (가능: {', '.join(SCENARIOS)})")
+    return apps
+
+
+def run_one(app, rows, workdir, repeat=REPEAT, trace_memory=False):
+    workdir = os.path.abspath(workdir)
+    bench = Bench(app, rows, repeat, trace_memory)
+    enter_demo(app, os.path.join(workdir, f'{app}_{rows}'))
+    SCENARIOS[app](bench, os.path.join(workdir, 'data'))
+    return bench.results
+
+
+def run_all(args):
+    workdir = os.path.abspath(args.workdir) if args.workdir else tempfile.mkdtemp(prefix='vibe_bench_')
+    results = []
+    try:
+        for app in args.apps:
+            for rows in args.sizes:
+                out = os.path.join(workdir, f'{app}_{rows}.json')
+                cmd = [sys.executable, '-m', 'bench', 'one', app, str(rows), '--repeat', str(args.repeat),
+                       '--workdir', workdir, '--out', out] + (['--trace-memory'] if args.trace_memory else [])
+                try:
+                    code = subprocess.run(cmd, cwd=VIBE_DIR, timeout=args.timeout).returncode
+                except subprocess.TimeoutExpired:
+                    code = f'시간 초과({args.timeout}초)'
+                if code == 0:
+                    with open(out, encoding='utf-8') as f:
+                        results += json.load(f)
+                else:
+                    results.append({'app': app, 'step': None, 'rows': rows, 'error': f'측정 실패: {code}'})
+    finally:
+        if args.workdir is None and not args.keep:
+            shutil.rmtree(workdir, ignore_errors=True)
+    options = {'apps': args.apps, 'sizes': args.sizes, 'repeat': args.repeat, 'trace_memory': args.trace_memory}
+    write_report(args.out, results, options)
+    print(f'결과: {args.out}' + (f' (작업 폴더: {workdir})' if args.keep else ''), file=sys.stderr)
+
+
+def show_comparison(args):
+    rows = compare_reports(read_report(args.before), read_report(args.after), args.threshold)
+    if not rows:
+        print('비교할 항목이 없습니다.')
+        return 0
+    print(f"{'앱':8s} {'단계':24s} {'행 수':>10s} {'이전(ms)':>10s} {'이후(ms)':>10s} {'배율':>6s}")
+    slower = 0
+    for app, step, count, before, after, ratio, regressed in rows:
+        slower += regressed
+        print(f"{app:8s} {step:24s} {count:>10,} {before * 1000:10.1f} {after * 1000:10.1f} {ratio:6.2f}"
+              + ('  느려짐' if regressed else ''))
+    print(f'{len(rows)}개 항목 중 {slower}개가 {args.threshold}배 넘게 느려졌습니다.')
+    return 1 if slower else 0
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] not in ('run', 'one', 'compare', '-h', '--help'):
+        argv = ['run', *argv]
+    parser = argparse.ArgumentParser(prog='python -m bench', description='데모 성능 측정 (화면 없이)')
+    commands = parser.add_subparsers(dest='command', required=True)
+    run = commands.add_parser('run', help='여러 앱/크기를 측정하고 JSON으로 저장')
+    run.add_argument('--apps', type=_apps, default=list(SCENARIOS), help='lecture,faq,staff 중 쉼표로')
+    run.add_argument('--sizes', type=lambda text: _list(text, parse_count), default=_list(DEFAULT_SIZES, parse_count),
+                     help=f'데이터 행 수 (기본: {DEFAULT_SIZES}, 최대 1e7 정도까지)')
+    run.add_argument('--repeat', type=int, default=REPEAT, help='단계마다 반복 횟수')
+    run.add_argument('--trace-memory', action='store_true', help='tracemalloc 최대 메모리도 측정 (느림)')
+    run.add_argument('--out', default=DEFAULT_OUTPUT, help='결과 JSON 경로')
+    run.add_argument('--workdir', help='데이터/DB를 둘 폴더 (기본: 임시 폴더, 끝나면 지움)')
+    run.add_argument('--keep', action='store_true', help='임시 작업 폴더를 지우지 않음')
+    run.add_argument('--timeout', type=float, help='(앱, 크기) 하나당 최대 시간(초)')
+    one = commands.add_parser('one', help='한 앱 x 한 크기만 측정')
+    one.add_argument('app', choices=list(SCENARIOS))
+    one.add_argument('rows', type=parse_count)
+    one.add_argument('--repeat', type=int, default=REPEAT)
+    one.add_argument('--trace-memory', action='store_true')
+    one.add_argument('--workdir', help='데이터/DB를 둘 폴더 (기본: 임시 폴더)')
+    one.add_argument('--out', help='결과 JSON 경로 (없으면 화면에 출력)')
+    compare = commands.add_parser('compare', help='두 결과 JSON 비교 (느려진 항목이 있으면 종료 코드 1)')
+    compare.add_argument('before')
+    compare.add_argument('after')
+    compare.add_argument('--threshold', type=float, default=REGRESSION_RATIO, help='느려짐으로 볼 배율')
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return show_comparison(args)
+    if args.command == 'run':
+        run_all(args)
+        return 0
+    # 측정 중에는 작업 폴더로 이동하므로 경로를 먼저 절대 경로로 바꿉니다.
+    out = os.path.abspath(args.out) if args.out else None
+    cwd = os.getcwd()
+    workdir = args.workdir or tempfile.mkdtemp(prefix='vibe_bench_')
+    try:
+        results = run_one(args.app, args.rows, workdir, args.repeat, args.trace_memory)
+    finally:
+        os.chdir(cwd)
+        if args.workdir is None:
+            shutil.rmtree(workdir, ignore_errors=True)
+    text = json.dumps(results, ensure_ascii=False, indent=2)
+    if out:
+        with open(out, 'w', encoding='utf-8') as f:
+            f.write(text)
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,236 @@
+import argparse
+import os
+import numpy as np
+import pandas as pd
+
+# 벤치마크용 가짜 데이터(한글) 만들기
+# - 데모의 예제 파일(staff_dummy.csv, faq_dummy.csv, lectures_dummy.csv)과 같은 컬럼으로 만듭니다.
+# - 같은 (행 수, seed)면 항상 같은 데이터입니다. 큰 파일은 GEN_CHUNK_ROWS행씩 나눠 만들고 씁니다.
+# - 성씨는 실제 비율에 가깝게, 나이/입사년도/직급은 서로 어긋나지 않게 뽑고,
+#   나이/입사년도의 일부(MISSING_RATE)는 빈 값으로 둡니다. (빈 값 처리 경로도 측정)
+# - FAQ 질문은 주제 x 질문 형태 x 학과 x 학년 x 학기 조합이라 서로 겹치지 않습니다.
+#   (조합 수를 넘으면 뒤에 번호를 붙입니다)
+# 명령줄: python -m bench.datagen staff 1e6 -o staff.csv
+GEN_CHUNK_ROWS = 100000
+DEFAULT_SEED = 42
+BASE_YEAR = 2024
+MISSING_RATE = 0.001
+CSV_ENCODING = 'utf-8-sig'
+
+SURNAMES = ('김', '이', '박', '최', '정', '강', '조', '윤', '장', '임',
+            '한', '오', '서', '신', '권', '황', '안', '송', '류', '홍')
+SURNAME_WEIGHTS = (21.5, 14.7, 8.4, 4.7, 4.3, 2.4, 2.1, 2.1, 2.0, 1.7,
+                   1.5, 1.5, 1.5, 1.4, 1.3, 1.3, 1.3, 1.2, 1.1, 1.1)
+GIVEN_FIRST = ('민', '서', '지', '현', '준', '도', '하', '예', '수', '영',
+               '은', '승', '재', '유', '태', '성', '혜', '동', '상', '진')
+GIVEN_SECOND = ('준', '우', '연', '희', '수', '호', '민', '아', '원', '훈',
+                '진', '빈', '윤', '영', '석', '혁', '경', '주', '은', '철')
+DEPARTMENTS = ('행정팀', '기획팀', '연구팀', '인사팀', '재무팀',
+               '교무팀', '학생지원팀', '시설관리팀', '전산팀', '홍보팀')
+DEPARTMENT_WEIGHTS = (15, 10, 25, 6, 6, 10, 10, 8, 6, 4)
+RESEARCH_DEPARTMENT = '연구팀'
+RANKS = ('사원', '주임', '대리', '과장', '차장', '부장')
+RESEARCH_RANKS = ('연구원', '선임연구원', '책임연구원', '수석연구원')
+# 근속 몇 년마다 직급이 한 단계 오르는지 (앞뒤로 한 단계씩 차이를 둠)
+RANK_YEARS = 5
+
+FAQ_TOPICS = ('수강신청', '수강정정', '성적 조회', '성적 이의신청', '교내 장학금', '국가장학금',
+              '등록금 납부', '등록금 분할납부', '휴학', '복학', '자퇴', '졸업 요건', '졸업 논문',
+              '기숙사 입사', '기숙사 퇴사', '도서관 대출', '열람실 예약', '학생증 발급', '전과',
+              '복수전공', '부전공', '계절학기', '출결 인정', '증명서 발급', '교환학생',
+              '동아리 등록', '주차 등록', '교내 와이파이', '학점 교류', '수업 평가')
+FAQ_ASKS = ('{} 기간이 언제인가요?', '{} 신청 방법을 알려주세요', '{} 관련 문의는 어디로 하나요?',
+            '{} 취소는 어떻게 하나요?', '{} 필요한 서류가 무엇인가요?', '{} 자격 조건이 궁금합니다',
+            '{} 결과는 언제 확인할 수 있나요?', '{} 변경이 가능한가요?',
+            '{} 온라인으로도 할 수 있나요?', '{} 마감 후에도 가능한가요?')
+FAQ_MAJORS = ('컴퓨터공학과', '경영학과', '국어국문학과', '영어영문학과', '수학과', '물리학과', '화학과',
+              '생명과학과', '기계공학과', '전자공학과', '건축학과', '간호학과', '경제학과', '심리학과',
+              '사회학과', '법학과', '교육학과', '미술학과', '음악학과', '체육학과')
+FAQ_GRADES = ('1학년', '2학년', '3학년', '4학년', '대학원')
+FAQ_TERMS = ('1학기', '2학기', '여름학기', '겨울학기')
+FAQ_SENTENCES = ('학사 포털의 신청 메뉴에서 진행할 수 있습니다.', '자세한 일정은 학사 공지사항을 확인하세요.',
+                 '담당 부서(학사지원팀, 내선 1234)로 문의하세요.', '신분증과 신청서 1부가 필요합니다.',
+                 '마감일 이후에는 처리할 수 없습니다.', '학과 사무실에서도 접수합니다.',
+                 '처리 결과는 문자와 이메일로 안내됩니다.', '온라인 신청 후 출력물을 제출해야 합니다.',
+                 '자격 요건은 직전 학기 성적을 기준으로 합니다.', '변경은 정해진 기간에 한 번만 가능합니다.')
+# 사용자 질문: 짧게 줄인 표현과, FAQ에 없는 질문(답을 못 찾는 경우)
+FAQ_SHORT_ASKS = ('기간', '신청 방법', '문의처', '취소 방법', '서류', '조건', '결과 확인', '변경')
+FAQ_OTHER_QUESTIONS = ('오늘 학식 메뉴 추천해 주세요', '주말에 볼 만한 영화가 있나요?', '내일 비 오나요?',
+                       '근처에 맛집 있어요?', '좋은 노트북 추천해 주세요')
+FAQ_OTHER_RATE = 0.1
+
+LECTURE_SUBJECTS = ('프로그래밍', '자료구조', '알고리즘', '운영체제', '데이터베이스', '컴퓨터네트워크',
+                    '선형대수', '미적분학', '확률과통계', '이산수학', '영문학개론', '영어회화', '유기화학',
+                    '일반화학', '일반물리학', '생명과학', '경영학원론', '회계원리', '미시경제학',
+                    '거시경제학', '심리학개론', '사회학개론', '한국사', '철학의이해', '글쓰기', '대학국어',
+                    '인공지능', '머신러닝', '컴퓨터그래픽스', '소프트웨어공학')
+LECTURE_LEVELS = ('', ' Ⅰ', ' Ⅱ', ' 실습', ' 세미나')
+LECTURE_LEVEL_WEIGHTS = (50, 20, 15, 10, 5)
+LECTURE_DAYS = ('월', '화', '수', '목', '금', '토')
+LECTURE_DAY_WEIGHTS = (20, 20, 20, 20, 17, 3)
+LECTURE_HOURS = range(9, 19)
+# 강의실 번호: 건물(1~15) x 100 + 호실(1~20), 교원 한 명이 맡는 평균 강의 수
+LECTURE_BUILDINGS = 15
+LECTURE_ROOMS = 20
+LECTURES_PER_TEACHER = 20
+
+DATA_KINDS = ('staff', 'faq', 'lectures')
+
+_NAMES = np.array([s + a + b for s in SURNAMES for a in GIVEN_FIRST for b in GIVEN_SECOND], dtype=object)
+
+
+def parse_count(text):
+    # '1e6', '100000', '1,000' 모두 받습니다.
+    count = int(float(str(text).replace(',', '')))
+    if count < 1:
+        raise ValueError(f'행 수는 1 이상이어야 합니다: {text}')
+    return count
+
+
+def _weights(weights):
+    weights = np.asarray(weights, dtype=float)
+    return weights / weights.sum()
+
+
+def _with_missing(values, rng, rate):
+    # 일부를 빈 값으로 바꾼 Int64 배열
+    return pd.arrays.IntegerArray(np.asarray(values, dtype=np.int64), rng.random(len(values)) < rate)
+
+
+def staff_frame(rows, seed=DEFAULT_SEED, start=0, missing_rate=MISSING_RATE):
+    # 이름,부서,직급,입사년도,성별,나이 (staff_dummy.csv와 같은 컬럼)
+    rng = np.random.default_rng(seed)
+    surname = rng.choice(len(SURNAMES), rows, p=_weights(SURNAME_WEIGHTS))
+    names = _NAMES[surname * (len(GIVEN_FIRST) * len(GIVEN_SECOND))
+                   + rng.integers(0, len(GIVEN_FIRST) * len(GIVEN_SECOND), rows)]
+    departments = np.array(DEPARTMENTS, dtype=object)[
+        rng.choice(len(DEPARTMENTS), rows, p=_weights(DEPARTMENT_WEIGHTS))]
+    ages = np.clip(np.rint(rng.normal(38, 9, rows)), 22, 60).astype(np.int64)
+    service = (rng.random(rows) * (ages - 21)).astype(np.int64)
+    level = service // RANK_YEARS + rng.integers(-1, 2, rows)
+    research = departments == RESEARCH_DEPARTMENT
+    ranks = np.where(
+        research,
+        np.array(RESEARCH_RANKS, dtype=object)[np.clip(level, 0, len(RESEARCH_RANKS) - 1)],
+        np.array(RANKS, dtype=object)[np.clip(level, 0, len(RANKS) - 1)])
+    genders = np.array(('남', '여'), dtype=object)[rng.integers(0, 2, rows)]
+    return pd.DataFrame({
+        '이름': names,
+        '부서': departments,
+        '직급': ranks,
+        '입사년도': _with_missing(BASE_YEAR - service, rng, missing_rate),
+        '성별': genders,
+        '나이': _with_missing(ages, rng, missing_rate),
+    })
+
+
+def _mixed_radix(index, *sizes):
+    # index를 자리마다 크기가 다른 수로 나눕니다. 마지막 값은 모든 조합을 넘은 횟수
+    digits = []
+    for size in sizes:
+        digits.append(index % size)
+        index = index // size
+    return digits + [index]
+
+
+def faq_frame(rows, seed=DEFAULT_SEED, start=0):
+    # 질문,답변 (faq_dummy.csv와 같은 컬럼). start: 질문 번호의 시작 (나눠 만들 때 겹치지 않게)
+    rng = np.random.default_rng(seed)
+    topic, ask, major, grade, term, repeat = _mixed_radix(
+        np.arange(start, start + rows), len(FAQ_TOPICS), len(FAQ_ASKS), len(FAQ_MAJORS),
+        len(FAQ_GRADES), len(FAQ_TERMS))
+    questions = [
+        f'{FAQ_MAJORS[m]} {FAQ_GRADES[g]} {FAQ_TERMS[t]} {FAQ_ASKS[a].format(FAQ_TOPICS[p])}'
+        + (f' ({r + 1})' if r else '')
+        for p, a, m, g, t, r in zip(topic, ask, major, grade, term, repeat)]
+    first = rng.integers(0, len(FAQ_SENTENCES), rows)
+    second = (first + rng.integers(1, len(FAQ_SENTENCES), rows)) % len(FAQ_SENTENCES)
+    answers = [f'{FAQ_MAJORS[m]} {FAQ_GRADES[g]} {FAQ_TOPICS[p]} 안내입니다. {FAQ_SENTENCES[a]} {FAQ_SENTENCES[b]}'
+               for p, m, g, a, b in zip(topic, major, grade, first, second)]
+    return pd.DataFrame({'질문': questions, '답변': answers})
+
+
+def faq_queries(count, seed=DEFAULT_SEED):
+    # 사용자가 입력할 법한 질문 목록: FAQ를 짧게 줄여 묻거나(학과/주제 + 짧은 표현), FAQ에 없는 질문
+    rng = np.random.default_rng(seed)
+    queries = []
+    for _ in range(count):
+        if rng.random() < FAQ_OTHER_RATE:
+            queries.append(FAQ_OTHER_QUESTIONS[rng.integers(len(FAQ_OTHER_QUESTIONS))])
+            continue
+        major = FAQ_MAJORS[rng.integers(len(FAQ_MAJORS))]
+        topic = FAQ_TOPICS[rng.integers(len(FAQ_TOPICS))]
+        ask = FAQ_SHORT_ASKS[rng.integers(len(FAQ_SHORT_ASKS))]
+        queries.append(f'{major} {topic} {ask}' if rng.random() < 0.5 else f'{topic} {ask} 알려주세요')
+    return queries
+
+
+def lectures_frame(rows, seed=DEFAULT_SEED, start=0):
+    # 과목명,요일,시간,강의실,담당교원ID (lectures_dummy.csv와 같은 컬럼)
+    rng = np.random.default_rng(seed)
+    subjects = rng.integers(0, len(LECTURE_SUBJECTS), rows)
+    levels = rng.choice(len(LECTURE_LEVELS), rows, p=_weights(LECTURE_LEVEL_WEIGHTS))
+    names = np.array([s + lv for s in LECTURE_SUBJECTS for lv in LECTURE_LEVELS], dtype=object)
+    hours = np.array([f'{h:02d}:00' for h in LECTURE_HOURS], dtype=object)
+    teachers = max(1, (start + rows) // LECTURES_PER_TEACHER)
+    return pd.DataFrame({
+        '과목명': names[subjects * len(LECTURE_LEVELS) + levels],
+        '요일': np.array(LECTURE_DAYS, dtype=object)[
+            rng.choice(len(LECTURE_DAYS), rows, p=_weights(LECTURE_DAY_WEIGHTS))],
+        '시간': hours[rng.integers(0, len(hours), rows)],
+        '강의실': rng.integers(1, LECTURE_BUILDINGS + 1, rows) * 100 + rng.integers(1, LECTURE_ROOMS + 1, rows),
+        '담당교원ID': rng.integers(1, teachers + 1, rows),
+    })
+
+
+FRAME_MAKERS = {'staff': staff_frame, 'faq': faq_frame, 'lectures': lectures_frame}
+
+
+def make_frame(kind, rows, seed=DEFAULT_SEED, chunk_rows=GEN_CHUNK_ROWS):
+    # 한 번에 DataFrame으로 만듭니다. (나눠 만든 파일과 같은 내용)
+    return pd.concat(list(iter_frames(kind, rows, seed, chunk_rows)), ignore_index=True)
+
+
+def iter_frames(kind, rows, seed=DEFAULT_SEED, chunk_rows=GEN_CHUNK_ROWS):
+    make = FRAME_MAKERS[kind]
+    for i, start in enumerate(range(0, rows, chunk_rows)):
+        yield make(min(chunk_rows, rows - start), seed=seed + i, start=start)
+
+
+def write_csv(kind, rows, path, seed=DEFAULT_SEED, chunk_rows=GEN_CHUNK_ROWS):
+    # 임시 파일에 나눠 쓴 뒤 교체합니다. (중간에 멈춰도 반쯤 쓰인 파일이 남지 않음)
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding=CSV_ENCODING, newline='') as f:
+            for i, frame in enumerate(iter_frames(kind, rows, seed, chunk_rows)):
+                frame.to_csv(f, index=False, header=i == 0)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def data_file(kind, rows, directory, seed=DEFAULT_SEED):
+    # directory에 (종류, 행 수, seed)별 CSV를 한 번만 만들고 경로를 돌려줍니다.
+    path = os.path.join(directory, f'{kind}_{rows}_{seed}.csv')
+    if not os.path.exists(path):
+        os.makedirs(directory, exist_ok=True)
+        write_csv(kind, rows, path, seed)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='벤치마크용 한글 가짜 데이터 CSV 만들기')
+    parser.add_argument('kind', choices=DATA_KINDS)
+    parser.add_argument('rows', type=parse_count, help='행 수 (예: 1e6)')
+    parser.add_argument('-o', '--output', help='저장할 CSV 경로 (기본: <종류>_<행 수>.csv)')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    args = parser.parse_args()
+    path = args.output or f'{args.kind}_{args.rows}.csv'
+    write_csv(args.kind, args.rows, path, args.seed)
+    print(f'{path}: {args.rows:,}행')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,130 @@
+import gc
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from instrument import MIB, rss_bytes
+
+# 시간/메모리 측정 도구
+# - 시간: 단계마다 repeat번 실행해 time.perf_counter 기준 최솟값/중앙값을 남깁니다.
+# - 메모리: 첫 실행 동안 작업 스레드가 RSS(프로세스가 실제로 쓰는 메모리)를 SAMPLE_INTERVAL마다 재서
+#   실행 전보다 가장 많이 늘어난 양(peak_rss_mib)을 남깁니다. pandas/pyarrow/Qt가 C에서 잡는 메모리도 포함됩니다.
+#   RSS는 psutil이 있으면 psutil로, 없으면 리눅스의 /proc/self/statm으로 읽습니다. (둘 다 없으면 None,
+#   shared/instrument.py의 rss_bytes)
+# - trace_memory=True면 한 번 더 실행하면서 tracemalloc으로 파이썬/numpy가 잡은 메모리의 최대치도 남깁니다.
+#   (tracemalloc은 실행을 몇 배 느리게 하므로 시간 측정과 따로 돌립니다)
+REPEAT = 3
+SAMPLE_INTERVAL = 0.005
+
+
+class RssSampler:
+    # with RssSampler() as sampler: ... 끝나면 sampler.peak_delta (바이트, 못 재면 None)
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.start = None
+        self.peak = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self.start = self.peak = rss_bytes()
+        if self.start is not None:
+            self._thread = threading.Thread(target=self._run, name='rss-sampler', daemon=True)
+            self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def _sample(self):
+        rss = rss_bytes()
+        if rss is not None and rss > self.peak:
+            self.peak = rss
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._sample()
+        return False
+
+    @property
+    def peak_delta(self):
+        return None if self.start is None else self.peak - self.start
+
+
+def _mib(value):
+    return None if value is None else round(value / MIB, 2)
+
+
+def measure(fn, setup=None, repeat=REPEAT, trace_memory=False):
+    # setup()은 실행마다 fn() 직전에 부르고 시간에 넣지 않습니다.
+    seconds = []
+    peak_rss = None
+    for i in range(repeat):
+        if setup is not None:
+            setup()
+        gc.collect()
+        if i == 0:
+            with RssSampler() as sampler:
+                start = time.perf_counter()
+                fn()
+                seconds.append(time.perf_counter() - start)
+            peak_rss = sampler.peak_delta
+        else:
+            start = time.perf_counter()
+            fn()
+            seconds.append(time.perf_counter() - start)
+    result = {
+        'seconds': [round(s, 6) for s in seconds],
+        'min': round(min(seconds), 6),
+        'median': round(statistics.median(seconds), 6),
+        'peak_rss_mib': _mib(peak_rss),
+    }
+    if trace_memory:
+        if setup is not None:
+            setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            fn()
+            result['traced_peak_mib'] = _mib(tracemalloc.get_traced_memory()[1])
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+class Bench:
+    # 한 앱 x 한 데이터 크기의 측정 결과를 모읍니다.
+    # step()은 실패해도 오류를 결과에 남기고 다음 단계로 넘어갑니다.
+    def __init__(self, app, rows, repeat=REPEAT, trace_memory=False, mode=None):
+        self.app = app
+        self.rows = rows
+        self.repeat = repeat
+        self.trace_memory = trace_memory
+        self.mode = mode
+        self.results = []
+
+    def step(self, name, fn, setup=None, repeat=None, items=None):
+        # items: 한 번 실행에서 처리하는 건수 (예: 질문 수). 있으면 건당 시간도 남깁니다.
+        record = {'app': self.app, 'step': name, 'rows': self.rows, 'mode': self.mode}
+        try:
+            record.update(measure(fn, setup, repeat or self.repeat, self.trace_memory))
+        except Exception as e:
+            record['error'] = f'{type(e).__name__}: {e}'
+        if items and 'median' in record:
+            record['items'] = items
+            record['median_per_item'] = round(record['median'] / items, 9)
+        self.results.append(record)
+        self.log(record)
+        return record
+
+    def log(self, record):
+        if 'error' in record:
+            text = f"오류 - {record['error']}"
+        else:
+            peak = record['peak_rss_mib']
+            text = f"{record['median'] * 1000:10.1f} ms" + (f'  +{peak:.1f} MiB' if peak is not None else '')
+        print(f"  {self.app:8s} {self.rows:>10,}행  {record['step']:24s} {text}", file=sys.stderr, flush=True)
@@ -0,0 +1,69 @@
+import importlib.metadata
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+from . import VIBE_DIR
+from instrument import HAS_PSUTIL, STATM_PATH
+
+# 결과 JSON 저장과 두 결과 비교
+# 결과 파일: {'meta': 실행 환경(커밋, 파이썬/라이브러리 버전...), 'results': [단계별 측정값]}
+# 비교는 (앱, 단계, 행 수)가 같은 항목끼리 중앙값 시간의 배율(이후/이전)을 봅니다.
+REPORT_VERSION = 1
+PACKAGES = ('numpy', 'pandas', 'pyarrow', 'scikit-learn', 'scipy', 'matplotlib', 'PyQt5', 'openpyxl')
+REGRESSION_RATIO = 1.2
+
+
+def _git(*args):
+    try:
+        result = subprocess.run(['git', *args], cwd=VIBE_DIR, capture_output=True, text=True)
+    except OSError:
+        return None
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def environment():
+    versions = {}
+    for name in PACKAGES:
+        try:
+            versions[name] = importlib.metadata.version(name)
+        except importlib.metadata.PackageNotFoundError:
+            versions[name] = None
+    status = _git('status', '--porcelain', '--untracked-files=no')
+    return {
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'commit': _git('rev-parse', '--short', 'HEAD'),
+        'dirty': None if status is None else bool(status),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'rss_source': 'psutil' if HAS_PSUTIL else ('statm' if os.path.exists(STATM_PATH) else None),
+        'packages': versions,
+    }
+
+
+def write_report(path, results, options):
+    report = {'version': REPORT_VERSION, 'meta': dict(environment(), options=options), 'results': results}
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    return report
+
+
+def read_report(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare_reports(old, new, threshold=REGRESSION_RATIO):
+    # [(앱, 단계, 행 수, 이전 중앙값, 이후 중앙값, 배율, 느려졌는지)] (한쪽에만 있거나 오류인 항목은 제외)
+    before = {(r['app'], r['step'], r['rows']): r for r in old['results'] if 'median' in r}
+    rows = []
+    for r in new['results']:
+        key = (r['app'], r['step'], r['rows'])
+        if 'median' not in r or key not in before:
+            continue
+        old_median = before[key]['median']
+        ratio = r['median'] / old_median if old_median > 0 else float('inf')
+        rows.append((*key, old_median, r['median'], ratio, ratio > threshold))
+    return rows
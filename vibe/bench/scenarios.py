@@ -0,0 +1,288 @@
+import os
+import shutil
+import sqlite3
+import sys
+import time
+import warnings
+from . import DEMO_DIRS, SHARED_DIR, datagen
+
+# 앱별 측정 단계 (한 프로세스에서 한 앱 x 한 데이터 크기만 실행합니다)
+# - 데모 폴더를 sys.path에 넣고 작업 폴더로 이동한 뒤 앱 모듈을 그대로 불러옵니다.
+#   앱이 상대 경로로 만드는 DB/캐시/모델 파일은 작업 폴더에 생기므로 저장소의 파일은 바뀌지 않습니다.
+# - lecture(PyQt5): offscreen 플랫폼에서 실제 MainWindow를 만들고 핸들러(파일 목록 선택(on_file_select),
+#   display_data, search_data, apply_filters)를 부릅니다. 표가 그려지는 시간까지 재려고 매번 표 화면을 grab()으로 그립니다.
+# - faq: 엔진(FAQEngine)으로 ask_question과 같은 경로(engine.answer)를 잽니다. (채팅창 출력은 제외)
+# - staff(Tk): 화면(DISPLAY)이 있으면 실제 앱을 창을 띄우지 않은 채(withdraw) 만들어 핸들러를 부르고('tk'),
+#   없으면 핸들러가 부르는 데이터 경로(로더, 큐브, 차트 계산 + Agg 캔버스 그리기)만 잽니다('data').
+LECTURE_SEARCH_TERM = '구조'
+LECTURE_SEARCH_REGEX = '^(자료|선형)'
+LECTURE_FILTERS = {'요일': '월,수', '강의실': '200~499', '과목명': '자료*'}
+FAQ_QUERIES = 200
+STAFF_FILTERS = {'부서': '연구팀', '직급': '선임연구원', '성별': '여'}
+STAFF_GROUPS = ['부서', '연령대', '성별']
+STAFF_SORT_COLUMN = '이름'
+POLL_SECONDS = 0.01
+
+
+def enter_demo(app, workdir):
+    os.makedirs(workdir, exist_ok=True)
+    os.chdir(workdir)
+    sys.path[:0] = [DEMO_DIRS[app], SHARED_DIR]
+
+
+def bench_lecture(bench, data_dir):
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtWidgets import QApplication
+    import main
+    import storage
+    import search_index
+    import table_export
+    qt_app = QApplication.instance() or QApplication([])
+    main.init_db()
+    window = main.MainWindow()
+    window.show()
+    qt_app.processEvents()
+    bench.mode = 'qt-' + qt_app.platformName()
+    try:
+        # 업로드가 끝난 파일처럼 컬럼형 캐시와 file_info 행을 만들어 두고, 파일 목록에서 선택합니다.
+        # (원본 엑셀은 캐시가 유효하면 읽지 않으므로 캐시보다 먼저 빈 파일로 만들어 둡니다)
+        filename = 'lectures.xlsx'
+        open(os.path.join(main.UPLOADED_FILES_DIR, filename), 'wb').close()
+        df = datagen.make_frame('lectures', bench.rows)
+        cache_filename = storage.write_cache(df, main.UPLOADED_FILES_DIR, filename)
+        columns = df.columns.tolist()
+        del df
+        conn = sqlite3.connect(main.DB_PATH)
+        file_id = conn.execute(
+            'INSERT INTO file_info (filename, original_filename, upload_date, columns, cache_filename) '
+            'VALUES (?, ?, ?, ?, ?)',
+            (filename, filename, time.strftime('%Y-%m-%d %H:%M:%S'), ','.join(columns), cache_filename)).lastrowid
+        conn.commit()
+        conn.close()
+        window.load_files()
+        paint = window.data_table.viewport().grab
+
+        def open_setup():
+            # 선택을 풀고 저장된 검색 색인을 지워, 매번 불러오기 -> 표시 -> 색인 만들기를 모두 거치게 합니다.
+            window.file_table.clearSelection()
+            window.current_file_id = window.loaded_file_id = None
+            window.current_data = window.search_index = None
+            window.data_model.set_frame(None)
+            conn = sqlite3.connect(main.DB_PATH)
+            conn.execute('DELETE FROM search_index WHERE file_id = ?', (file_id,))
+            conn.commit()
+            conn.close()
+
+        def open_file():
+            # on_file_select -> load_task -> on_load_finished(표시) -> search_index_task 가 모두 끝날 때까지
+            window.file_table.selectRow(0)
+            while window.tasks.running_count():
+                qt_app.processEvents()
+                time.sleep(POLL_SECONDS)
+            qt_app.processEvents()
+            if window.search_index is None:
+                raise RuntimeError('파일을 불러오거나 검색 색인을 만들지 못했습니다.')
+            paint()
+
+        bench.step('open_file', open_file, setup=open_setup)
+        df = window.current_data
+        if df is None:
+            return
+
+        def display():
+            window.display_data()
+            paint()
+
+        bench.step('display_data', display, setup=lambda: window.data_model.set_frame(None))
+
+        def search_setup(term, regex, index):
+            def setup():
+                window.search_index = index
+                window.search_entry.setText(term)
+                window.regex_check.setChecked(regex)
+            return setup
+
+        def search():
+            window.search_data()
+            paint()
+
+        bench.step('search_data_scan', search, setup=search_setup(LECTURE_SEARCH_TERM, False, None))
+        built = {}
+        bench.step('search_index_build', lambda: built.update(index=search_index.SearchIndex.build(df)))
+        if 'index' in built:
+            bench.step('search_data_index', search,
+                       setup=search_setup(LECTURE_SEARCH_TERM, False, built['index']))
+            bench.step('search_data_regex', search,
+                       setup=search_setup(LECTURE_SEARCH_REGEX, True, built['index']))
+        window.search_entry.clear()
+        window.regex_check.setChecked(False)
+        window.search_rows = None
+
+        def filter_setup():
+            # 같은 값을 다시 넣으면 textChanged가 없으므로 바뀐 컬럼 목록을 직접 채웁니다.
+            window.filter_engine.clear()
+            for col, text in LECTURE_FILTERS.items():
+                window.filter_entries[col].setText(text)
+            window.filter_timer.stop()
+            window.dirty_filters = set(LECTURE_FILTERS)
+
+        def apply_filters():
+            window.apply_filters()
+            paint()
+
+        bench.step('apply_filters', apply_filters, setup=filter_setup)
+        export_path = os.path.abspath('export.csv')
+        bench.step('export_csv', lambda: table_export.export_dataframe(df, export_path))
+    finally:
+        window.close()
+        qt_app.processEvents()
+
+
+def bench_faq(bench, data_dir):
+    import engine
+    import faq_import
+    csv_path = datagen.data_file('faq', bench.rows, data_dir)
+    queries = datagen.faq_queries(FAQ_QUERIES)
+    bench.mode = 'engine'
+    engine.init_db(engine.DB_PATH)
+    # 가져오기는 두 번째부터 모두 중복으로 건너뛰므로 한 번만, 첫 로드는 학습 후 모델을 저장합니다.
+    bench.step('import_faq', lambda: faq_import.import_faq(engine.DB_PATH, csv_path), repeat=1)
+
+    def load():
+        faq = engine.FAQEngine(engine.DB_PATH, log_history=False)
+        faq.load()
+        faq.close()
+
+    bench.step('engine_load_fit', load, repeat=1)
+    bench.step('engine_load_saved', load)
+    faq = engine.FAQEngine(engine.DB_PATH)
+    try:
+        faq.load()
+
+        def ask():
+            for question in queries:
+                faq.answer(question, k=engine.TOP_K)
+
+        bench.step('ask_question', ask, setup=faq.cache.clear, items=len(queries))
+        bench.step('ask_question_cached', ask, items=len(queries))
+    finally:
+        faq.close()
+
+
+def bench_staff(bench, data_dir):
+    csv_path = datagen.data_file('staff', bench.rows, data_dir)
+    import tkinter as tk
+    try:
+        tk.Tk().destroy()
+    except tk.TclError:
+        bench.mode = 'data'
+        _staff_data(bench, csv_path)
+        return
+    bench.mode = 'tk'
+    _staff_tk(bench, csv_path)
+
+
+def _staff_tk(bench, csv_path):
+    import main
+    import staff_chart
+    shutil.copyfile(csv_path, main.DATA_FILE)
+    app = main.StaffDashboardApp()
+    # 창을 화면에 띄우지 않습니다. (이벤트는 update()로 직접 처리)
+    app.withdraw()
+
+    def wait_loaded():
+        while app.cube is None:
+            app.update()
+            time.sleep(POLL_SECONDS)
+
+    def load_setup():
+        # 앞 단계가 예약해 둔 그래프 그리기가 불러오기 시간에 섞이지 않게 합니다.
+        app.chart.cancel()
+        app.cube = None
+
+    def load():
+        app.load_data()
+        wait_loaded()
+
+    try:
+        wait_loaded()
+        bench.step('load_data', load, setup=load_setup)
+        app.chart.cancel()
+
+        def filter_setup():
+            app.dept_var.set(STAFF_FILTERS['부서'])
+            app.rank_var.set(STAFF_FILTERS['직급'])
+            app.gender_var.set(STAFF_FILTERS['성별'])
+
+        def apply_filter():
+            # 그래프는 아래 update_stats_and_chart에서 따로 잽니다.
+            app.apply_filter()
+            app.chart.cancel()
+            app.update_idletasks()
+
+        bench.step('apply_filter', apply_filter, setup=filter_setup)
+
+        def update_table():
+            app.update_table()
+            app.update_idletasks()
+
+        bench.step('update_table', update_table)
+        app.opt_dept.set('부서' in STAFF_GROUPS)
+        app.opt_age.set('연령대' in STAFF_GROUPS)
+        app.opt_gender.set('성별' in STAFF_GROUPS)
+
+        def update_stats_and_chart():
+            # 모아 그리기(after)를 기다리지 않고 같은 그래프를 바로 그립니다.
+            app.update_stats_and_chart()
+            app.chart.cancel()
+            app.chart.render(staff_chart.chart_spec(app.cube, app.filters, app.group_columns()))
+            app.update_idletasks()
+
+        bench.step('update_stats_and_chart', update_stats_and_chart)
+
+        def sort_table():
+            app.table.sort_by(STAFF_SORT_COLUMN)
+            app.update_idletasks()
+
+        # 정렬 순서는 컬럼마다 캐시하므로 매번 표 데이터를 다시 넣어 캐시를 비웁니다.
+        bench.step('table_sort', sort_table, setup=lambda: app.table.set_frame(app.df, app.rows))
+    finally:
+        app.on_close()
+
+
+def _staff_data(bench, csv_path):
+    import staff_loader
+    import staff_cube
+    import staff_chart
+    import chart_font
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    if chart_font.use_korean_font() is None:
+        warnings.filterwarnings('ignore', message='Glyph .* missing from font')
+    loaded = {}
+
+    def load():
+        df = staff_loader.read_staff_csv(csv_path)
+        loaded.update(df=df, cube=staff_cube.StaffCube(df))
+
+    bench.step('load_data', load)
+    if 'cube' not in loaded:
+        return
+    cube = loaded['cube']
+    bench.step('apply_filter', lambda: cube.select(STAFF_FILTERS))
+    fig = Figure(figsize=(10, 5))
+    chart = staff_chart.StaffChart(fig, fig.subplots(), FigureCanvasAgg(fig))
+
+    def update_stats_and_chart():
+        # main.update_stats_and_chart와 같은 계산 (통계 글자 출력 대신 값만)
+        cube.total(STAFF_FILTERS)
+        for col in ('부서', '직급', '성별'):
+            cube.value_counts(col, STAFF_FILTERS).to_dict()
+        cube.mean('나이', STAFF_FILTERS)
+        cube.mean('입사년도', STAFF_FILTERS)
+        chart.render(staff_chart.chart_spec(cube, STAFF_FILTERS, STAFF_GROUPS))
+
+    bench.step('update_stats_and_chart', update_stats_and_chart)
+
+
+SCENARIOS = {'lecture': bench_lecture, 'faq': bench_faq, 'staff': bench_staff}
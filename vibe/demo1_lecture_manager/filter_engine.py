@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+
+# 필터 입력 형식 안내
+FILTER_HELP = ('값: 같음 / >=10, <5: 비교 / 10~20: 범위 (한쪽 생략 가능) / '
+               '김*: 접두어 / A,B,C: 목록 중 하나')
+COMPARE_OPS = ('>=', '<=', '>', '<', '=')
+
+
+def parse_expression(text):
+    # 필터 입력 문자열을 (연산, 값...) 형태로 바꿉니다.
+    text = text.strip()
+    for op in COMPARE_OPS:
+        if text.startswith(op):
+            value = text[len(op):].strip()
+            if not value:
+                raise ValueError(f"'{op}' 뒤에 값을 입력하세요.")
+            return ('eq', value) if op == '=' else (op, value)
+    if '~' in text:
+        low, high = (part.strip() for part in text.split('~', 1))
+        if not low and not high:
+            raise ValueError('범위의 시작이나 끝을 입력하세요.')
+        return ('range', low or None, high or None)
+    if ',' in text:
+        values = [part.strip() for part in text.split(',') if part.strip()]
+        return ('in', values)
+    if text.endswith('*') and len(text) > 1:
+        return ('prefix', text[:-1])
+    return ('eq', text)
+
+
+def _compare(values, op, operand):
+    if op == '>=':
+        return values >= operand
+    if op == '<=':
+        return values <= operand
+    if op == '>':
+        return values > operand
+    if op == '<':
+        return values < operand
+    return values == operand
+
+
+def _evaluate(values, predicate, convert):
+    # values(배열 또는 Series)에 조건을 벡터 연산으로 적용합니다.
+    op = predicate[0]
+    if op == 'range':
+        _, low, high = predicate
+        mask = np.ones(len(values), dtype=bool)
+        if low is not None:
+            mask &= np.asarray(values >= convert(low))
+        if high is not None:
+            mask &= np.asarray(values <= convert(high))
+        return mask
+    if op == 'in':
+        return np.asarray(pd.Series(values).isin([convert(v) for v in predicate[1]]))
+    return np.asarray(_compare(values, op, convert(predicate[1])))
+
+
+class FilterEngine:
+    # 컬럼별 필터 조건을 불리언 마스크로 계산해 캐시하고,
+    # 한 컬럼이 바뀌면 그 컬럼의 마스크만 다시 계산해 나머지와 AND 합니다.
+    def __init__(self, df):
+        self.df = df
+        self.masks = {}
+        self._text_columns = {}
+
+    def clear(self):
+        self.masks = {}
+
+    def set_expression(self, col, text):
+        # 잘못된 입력이면 ValueError (이 컬럼의 필터는 해제됩니다)
+        self.masks.pop(col, None)
+        if not text.strip():
+            return
+        self.masks[col] = self.column_mask(col, parse_expression(text))
+
+    def column_mask(self, col, predicate):
+        series = self.df[col]
+        op = predicate[0]
+        if op != 'prefix' and pd.api.types.is_bool_dtype(series):
+            return self._text_mask(col, predicate)
+        if op != 'prefix' and pd.api.types.is_numeric_dtype(series):
+            return _evaluate(series.to_numpy(), predicate, to_number)
+        if op != 'prefix' and pd.api.types.is_datetime64_any_dtype(series):
+            # 시간대가 있는 컬럼은 그 시간대의 시각으로 비교합니다.
+            tz = series.dt.tz
+            values = (series if tz is None else series.dt.tz_localize(None)).to_numpy()
+            return _evaluate(values, predicate, lambda value: to_datetime64(value, tz))
+        return self._text_mask(col, predicate)
+
+    def _text_mask(self, col, predicate):
+        # 문자열 조건은 고유값에만 적용한 뒤 행 코드로 펼칩니다.
+        # 빈 값의 코드는 -1이므로 끝에 False를 붙여 어떤 조건에도 맞지 않게 합니다.
+        uniques, codes = self._text_column(col)
+        if predicate[0] == 'prefix':
+            hit = uniques.str.startswith(predicate[1].lower()).to_numpy(dtype=bool)
+        else:
+            hit = _evaluate(uniques, predicate, str.lower)
+        return np.append(hit, False)[codes]
+
+    def _text_column(self, col):
+        if col not in self._text_columns:
+            series = self.df[col]
+            codes, uniques = pd.factorize(series.astype(str).str.lower().where(series.notna()))
+            self._text_columns[col] = (pd.Series(uniques, dtype=object), codes)
+        return self._text_columns[col]
+
+    def mask(self):
+        # 모든 컬럼 마스크의 AND (필터가 없으면 None)
+        if not self.masks:
+            return None
+        return np.logical_and.reduce(list(self.masks.values()))
+
+
+def to_number(value):
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"'{value}'은(는) 숫자가 아닙니다.")
+
+
+def to_datetime64(value, tz=None):
+    # 시간대를 붙여 입력한 값은 컬럼의 시간대(tz, 없으면 UTC) 시각으로 바꿉니다.
+    try:
+        stamp = pd.Timestamp(value)
+    except (ValueError, TypeError):
+        raise ValueError(f"'{value}'은(는) 날짜 형식이 아닙니다.")
+    if stamp.tzinfo is not None:
+        stamp = stamp.tz_convert(tz).tz_localize(None)
+    return np.datetime64(stamp)
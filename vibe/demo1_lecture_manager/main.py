@@ -1,17 +1,65 @@
 import sys
 import os
+import re
 import sqlite3
-import pandas as pd
+import time
+import numpy as np
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                            QHBoxLayout, QTabWidget, QTableWidget, QTableWidgetItem,
                            QPushButton, QFileDialog, QMessageBox, QLabel, QLineEdit,
-                           QFrame, QScrollArea, QGridLayout, QGroupBox)
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont, QIcon
+                           QFrame, QScrollArea, QGridLayout, QGroupBox, QTableView,
+                           QHeaderView, QProgressBar, QCheckBox, QDialog,
+                           QListWidget, QListWidgetItem, QDialogButtonBox, QShortcut)
+from PyQt5.QtCore import Qt, QSize, QTimer
+from PyQt5.QtGui import QFont, QIcon, QKeySequence
+# 여러 데모가 함께 쓰는 모듈 (vibe/shared)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'shared'))
+from lazy_import import lazy_module, preload
+from table_model import DataFrameModel, SqlTableModel, estimate_column_widths
+from workers import TaskRunner, TaskCancelled, wait_future
+import instrument
+from perf_dialog import PerfDialog
+# pandas/pyarrow/openpyxl을 쓰는 모듈은 창을 띄운 뒤 작업 스레드에서 불러옵니다. (시작 시간 단축)
+# 이 모듈들의 함수는 storage.load_dataframe처럼 모듈 이름을 붙여서 씁니다.
+LAZY_MODULES = ('storage', 'search_index', 'filter_engine', 'sql_store', 'table_export')
+storage = lazy_module('storage')
+search_index = lazy_module('search_index')
+filter_engine = lazy_module('filter_engine')
+sql_store = lazy_module('sql_store')
+table_export = lazy_module('table_export')
 
 DB_PATH = 'excel_manager.db'
 UPLOADED_FILES_DIR = 'uploaded_files'
+# 필터 입력 후 결과를 갱신하기까지 기다리는 시간(ms)
+FILTER_DEBOUNCE_MS = 250
+# 업로드 직후 백그라운드에서 컬럼형 캐시를 미리 만들지 여부
+# (False면 파일을 처음 열 때 만듭니다.)
+BACKGROUND_INDEXING = True
+
+class IndexColumnDialog(QDialog):
+    # 행 단위 저장 파일에서 인덱스를 만들 컬럼을 고르는 창
+    def __init__(self, columns, indexed, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('인덱스 컬럼 선택')
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel('자주 필터링하는 컬럼에 인덱스를 만들면 조회가 빨라집니다.'))
+        self.list_widget = QListWidget()
+        for pos, col in enumerate(columns):
+            item = QListWidgetItem(col)
+            item.setFlags(item.flags() | Qt.ItemIsUserCheckable)
+            item.setCheckState(Qt.Checked if pos in indexed else Qt.Unchecked)
+            self.list_widget.addItem(item)
+        layout.addWidget(self.list_widget)
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def selected_positions(self):
+        return [i for i in range(self.list_widget.count())
+                if self.list_widget.item(i).checkState() == Qt.Checked]
 
 def init_db():
     conn = sqlite3.connect(DB_PATH)
@@ -23,6 +71,29 @@ def init_db():
         upload_date TEXT NOT NULL,
         columns TEXT NOT NULL
     )''')
+    # 컬럼형 캐시 파일명 컬럼 추가 (기존 DB 마이그레이션)
+    c.execute('PRAGMA table_info(file_info)')
+    existing = [row[1] for row in c.fetchall()]
+    if 'cache_filename' not in existing:
+        c.execute('ALTER TABLE file_info ADD COLUMN cache_filename TEXT')
+    # 저장 방식: 'file'(엑셀 + 컬럼형 캐시) 또는 'sqlite'(행 단위 DB, rows_db 파일)
+    if 'storage' not in existing:
+        c.execute("ALTER TABLE file_info ADD COLUMN storage TEXT NOT NULL DEFAULT 'file'")
+    if 'rows_db' not in existing:
+        c.execute('ALTER TABLE file_info ADD COLUMN rows_db TEXT')
+    # 파일별 전체 컬럼 검색 색인 (컬럼마다 한 행)
+    c.execute('''CREATE TABLE IF NOT EXISTS search_index (
+        file_id INTEGER NOT NULL,
+        col INTEGER NOT NULL,
+        uniques TEXT NOT NULL,
+        codes BLOB NOT NULL,
+        grams TEXT NOT NULL,
+        offsets BLOB NOT NULL,
+        ids BLOB NOT NULL,
+        PRIMARY KEY (file_id, col)
+    )''')
+    # 삭제 도중 저장된 색인 정리
+    c.execute('DELETE FROM search_index WHERE file_id NOT IN (SELECT id FROM file_info)')
     conn.commit()
     conn.close()
     if not os.path.exists(UPLOADED_FILES_DIR):
@@ -34,6 +105,12 @@ class MainWindow(QMainWindow):
         self.setWindowTitle('엑셀 파일 관리 시스템')
         self.setGeometry(100, 100, 1200, 700)
         
+        # 백그라운드 작업 (업로드/로드/내보내기는 스레드, 색인용 전체 파싱은 프로세스)
+        self.tasks = TaskRunner(self)
+        self.parse_pool = ProcessPoolExecutor(max_workers=min(4, os.cpu_count() or 1))
+        self.upload_results = {'success': 0, 'failed': 0}
+        self.progress_message = ''
+        
         # 메인 위젯과 레이아웃
         main_widget = QWidget()
         self.setCentralWidget(main_widget)
@@ -54,8 +131,23 @@ class MainWindow(QMainWindow):
         self.create_data_tab()
         
         self.current_file_id = None
+        self.loaded_file_id = None
         self.current_columns = []
         self.current_data = None
+        self.search_index = None
+        
+        # 상태 표시줄 (작업 진행률 및 취소)
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setMaximumWidth(200)
+        self.cancel_btn = QPushButton('취소')
+        self.cancel_btn.clicked.connect(self.cancel_tasks)
+        self.statusBar().addPermanentWidget(self.progress_bar)
+        self.statusBar().addPermanentWidget(self.cancel_btn)
+        self.update_task_status()
+        
+        # 숨은 성능 기록 창 (핸들러별 처리 시간, Ctrl+Shift+D)
+        self.perf_dialog = None
+        QShortcut(QKeySequence('Ctrl+Shift+D'), self, self.show_perf_dialog)
         
         # 스타일 설정
         self.setStyleSheet("""
@@ -89,14 +181,14 @@ class MainWindow(QMainWindow):
             QPushButton:pressed {
                 background-color: #005a9e;
             }
-            QTableWidget {
+            QTableView {
                 border: 1px solid #cccccc;
                 gridline-color: #e0e0e0;
             }
-            QTableWidget::item {
+            QTableView::item {
                 padding: 5px;
             }
-            QTableWidget::item:selected {
+            QTableView::item:selected {
                 background-color: #e5f3ff;
             }
             QLineEdit {
@@ -138,10 +230,13 @@ class MainWindow(QMainWindow):
         delete_btn.clicked.connect(self.delete_file)
         refresh_btn = QPushButton('새로고침')
         refresh_btn.clicked.connect(self.load_files)
+        # 체크하면 업로드한 파일을 SQLite에 행 단위로 저장 (메모리보다 큰 파일용)
+        self.sql_storage_check = QCheckBox('DB에 행 단위로 저장 (대용량 파일)')
         
         btn_layout.addWidget(upload_btn)
         btn_layout.addWidget(delete_btn)
         btn_layout.addWidget(refresh_btn)
+        btn_layout.addWidget(self.sql_storage_check)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
         
@@ -159,6 +254,14 @@ class MainWindow(QMainWindow):
         filter_layout = QGridLayout()
         self.filter_entries = {}
         self.filter_frame = filter_layout
+        self.filter_engine = None
+        self.dirty_filters = set()
+        self.search_rows = None
+        # 입력이 멈춘 뒤 한 번만 필터를 적용합니다.
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filters)
         filter_group.setLayout(filter_layout)
         top_layout.addWidget(filter_group)
         
@@ -167,72 +270,174 @@ class MainWindow(QMainWindow):
         search_layout = QHBoxLayout()
         search_label = QLabel('검색어:')
         self.search_entry = QLineEdit()
+        self.search_entry.returnPressed.connect(self.search_data)
+        self.regex_check = QCheckBox('정규식')
         search_btn = QPushButton('검색')
         search_btn.clicked.connect(self.search_data)
         
         search_layout.addWidget(search_label)
         search_layout.addWidget(self.search_entry)
+        search_layout.addWidget(self.regex_check)
         search_layout.addWidget(search_btn)
         search_group.setLayout(search_layout)
         top_layout.addWidget(search_group)
         
         layout.addWidget(top_frame)
         
-        # 데이터 테이블
-        self.data_table = QTableWidget()
+        # 데이터 테이블 (DataFrame을 직접 참조하는 모델/뷰)
+        # 행 단위 저장 파일은 SQL로 페이지를 읽는 sql_model로 바꿔 보여줍니다.
+        self.data_model = DataFrameModel(self)
+        self.sql_model = SqlTableModel(self)
+        self.sql_table = None
+        self.data_table = QTableView()
+        self.data_table.setModel(self.data_model)
+        self.data_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.data_table.horizontalHeader().setStretchLastSection(True)
         layout.addWidget(self.data_table)
         
         # 하단 버튼
         btn_layout = QHBoxLayout()
-        export_btn = QPushButton('엑셀로 내보내기')
+        export_btn = QPushButton('파일로 내보내기')
         export_btn.clicked.connect(self.export_to_excel)
         reset_btn = QPushButton('필터 초기화')
         reset_btn.clicked.connect(self.reset_filters)
+        self.index_btn = QPushButton('인덱스 컬럼 선택')
+        self.index_btn.clicked.connect(self.choose_index_columns)
+        self.index_btn.setEnabled(False)
         
         btn_layout.addWidget(export_btn)
         btn_layout.addWidget(reset_btn)
+        btn_layout.addWidget(self.index_btn)
         btn_layout.addStretch()
         layout.addLayout(btn_layout)
 
     def upload_excel(self):
-        file_path, _ = QFileDialog.getOpenFileName(
+        file_paths, _ = QFileDialog.getOpenFileNames(
             self, '엑셀 파일 선택', '', 'Excel files (*.xlsx *.xls)'
         )
-        if not file_path:
+        if not file_paths:
             return
-            
+        
+        # 원본 복사와 컬럼 확인만 하므로 업로드는 파일 크기와 무관하게 가볍습니다.
+        self.upload_results = {'success': 0, 'failed': 0}
+        as_rows = self.sql_storage_check.isChecked()
+        for file_path in file_paths:
+            self.tasks.submit(
+                ('upload', file_path), self.upload_task, file_path,
+                on_finished=lambda info, as_rows=as_rows: self.on_upload_finished(info, as_rows),
+                on_failed=lambda msg, path=file_path: self.on_upload_failed(path, msg),
+                on_progress=self.on_task_progress,
+                on_done=self.on_upload_done)
+        self.update_task_status()
+
+    @instrument.timed()
+    def upload_task(self, task, file_path):
+        task.report(0, f'{os.path.basename(file_path)} 업로드 중...')
+        info = storage.ingest_excel(file_path, UPLOADED_FILES_DIR)
         try:
-            # 엑셀 파일 읽기
-            df = pd.read_excel(file_path)
-            if df.empty:
-                QMessageBox.critical(self, '오류', '파일에 데이터가 없습니다.')
-                return
-                
-            # 파일 저장
-            original_filename = os.path.basename(file_path)
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            saved_filename = f"{timestamp}_{original_filename}"
-            saved_path = os.path.join(UPLOADED_FILES_DIR, saved_filename)
-            
-            # 엑셀 파일 저장
-            df.to_excel(saved_path, index=False)
-            
-            # DB에 파일 정보 저장
-            conn = sqlite3.connect(DB_PATH)
-            c = conn.cursor()
-            c.execute('''INSERT INTO file_info (filename, original_filename, upload_date, columns)
-                        VALUES (?, ?, ?, ?)''',
-                     (saved_filename, original_filename, 
-                      datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-                      ','.join(df.columns.tolist())))
-            conn.commit()
-            conn.close()
-            
-            QMessageBox.information(self, '성공', '파일이 성공적으로 업로드되었습니다.')
-            self.load_files()
-            
-        except Exception as e:
-            QMessageBox.critical(self, '오류', f'파일 업로드 중 오류가 발생했습니다: {str(e)}')
+            task.check_cancelled()
+        except TaskCancelled:
+            storage.remove_ingested(UPLOADED_FILES_DIR, info)
+            raise
+        return info
+
+    def on_upload_finished(self, info, as_rows=False):
+        # DB에 파일 정보 저장 (GUI 스레드)
+        rows_db = sql_store.rows_db_filename(info['filename']) if as_rows else None
+        conn = sqlite3.connect(DB_PATH)
+        c = conn.cursor()
+        c.execute('''INSERT INTO file_info (filename, original_filename, upload_date, columns,
+                                           cache_filename, storage, rows_db)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)''',
+                 (info['filename'], info['original_filename'],
+                  datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                  ','.join(info['columns']), info['cache_filename'],
+                  'sqlite' if as_rows else 'file', rows_db))
+        file_id = c.lastrowid
+        conn.commit()
+        conn.close()
+        self.upload_results['success'] += 1
+        self.load_files()
+        if as_rows:
+            self.start_sql_import(file_id, info['filename'], rows_db)
+        elif BACKGROUND_INDEXING:
+            self.start_indexing(file_id, info['filename'])
+
+    def start_sql_import(self, file_id, filename, rows_db):
+        self.tasks.submit(
+            ('sql_import', file_id), self.sql_import_task, file_id, filename, rows_db,
+            on_finished=self.on_sql_import_finished,
+            on_failed=lambda msg: QMessageBox.critical(
+                self, '오류', f'DB 저장 중 오류가 발생했습니다: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    def sql_import_task(self, task, file_id, filename, rows_db):
+        # 엑셀 행을 묶음 단위로 SQLite에 넣습니다. (메모리 사용량은 파일 크기와 무관)
+        file_path = os.path.join(UPLOADED_FILES_DIR, filename)
+        task.report(0, f'{filename} DB 저장 중...')
+        columns, _ = storage.read_header(file_path)
+        count = sql_store.import_excel(
+            file_path, os.path.join(UPLOADED_FILES_DIR, rows_db), columns,
+            check_cancelled=task.check_cancelled,
+            progress=lambda n: task.report(0, f'{filename} DB 저장 중... ({n:,}행)'))
+        return file_id, rows_db, count
+
+    def on_sql_import_finished(self, result):
+        file_id, rows_db, count = result
+        self.statusBar().showMessage(f'DB 저장 완료: {count:,}행')
+        if file_id == self.current_file_id and self.loaded_file_id != file_id:
+            self.open_sql_file(file_id, rows_db)
+
+    def start_indexing(self, file_id, filename):
+        # 전체 파싱은 작업 프로세스에서 하므로 여러 파일을 동시에 색인할 수 있습니다.
+        self.tasks.submit(
+            ('index', file_id), self.index_task, file_id, filename,
+            on_finished=self.on_index_finished,
+            on_failed=lambda msg: self.statusBar().showMessage(f'캐시 생성 실패: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    def index_task(self, task, file_id, filename):
+        task.report(0, f'{filename} 색인 중...')
+        future = self.parse_pool.submit(storage.build_cache, UPLOADED_FILES_DIR, filename)
+        # 색인 중에 파일이 삭제되었으면 뒤늦게 만들어진 캐시를 지웁니다.
+        cache_filename = wait_future(
+            task, future,
+            on_abandoned=lambda name: os.path.exists(os.path.join(UPLOADED_FILES_DIR, filename))
+            or storage.remove_cache(UPLOADED_FILES_DIR, name))
+        return file_id, filename, cache_filename
+
+    def on_index_finished(self, result):
+        file_id, filename, cache_filename = result
+        conn = sqlite3.connect(DB_PATH)
+        c = conn.cursor()
+        c.execute('UPDATE file_info SET cache_filename=? WHERE id=?', (cache_filename, file_id))
+        deleted = c.rowcount == 0
+        conn.commit()
+        conn.close()
+        if deleted:
+            storage.remove_cache(UPLOADED_FILES_DIR, cache_filename)
+            return
+        # 색인 중에 선택된 파일이면 이제 캐시에서 불러옵니다.
+        if file_id == self.current_file_id and self.loaded_file_id != file_id:
+            self.start_load(file_id, filename)
+
+    def on_upload_failed(self, file_path, message):
+        self.upload_results['failed'] += 1
+        QMessageBox.critical(
+            self, '오류',
+            f'{os.path.basename(file_path)} 업로드 중 오류가 발생했습니다: {message}')
+
+    def on_upload_done(self):
+        self.update_task_status()
+        # 마지막 업로드가 끝나면 결과를 한 번만 알립니다.
+        if self.tasks.running_count('upload') == 0 and self.upload_results['success']:
+            QMessageBox.information(
+                self, '성공', f"{self.upload_results['success']}개 파일이 성공적으로 업로드되었습니다.")
+            self.upload_results['success'] = 0
 
     def load_files(self):
         self.file_table.setRowCount(0)
@@ -249,37 +454,228 @@ class MainWindow(QMainWindow):
         # 컬럼 너비 조정
         self.file_table.resizeColumnsToContents()
 
+    @instrument.timed()
     def on_file_select(self):
         selected_items = self.file_table.selectedItems()
         if not selected_items:
             return
             
         row = selected_items[0].row()
-        self.current_file_id = int(self.file_table.item(row, 0).text())
+        file_id = int(self.file_table.item(row, 0).text())
         filename = self.file_table.item(row, 1).text()
+        self.current_file_id = file_id
+        
+        # 새 파일을 선택하면 아직 진행 중인 다른 파일의 로드/검색 색인은 취소
+        self.tasks.cancel_kind('load', keep=('load', file_id))
+        self.tasks.cancel_kind('search_index', keep=('search_index', file_id))
+        
+        conn = sqlite3.connect(DB_PATH)
+        c = conn.cursor()
+        c.execute('SELECT storage, rows_db FROM file_info WHERE id=?', (file_id,))
+        row = c.fetchone()
+        conn.close()
+        if row and row[0] == 'sqlite':
+            # 행 단위 저장 파일: 저장이 끝났으면 바로 열고, 아니면 저장 후 엽니다.
+            if self.tasks.is_running(('sql_import', file_id)):
+                self.statusBar().showMessage(f'{filename} DB 저장이 끝나면 표시합니다...')
+            elif os.path.exists(os.path.join(UPLOADED_FILES_DIR, row[1])):
+                self.open_sql_file(file_id, row[1])
+            else:
+                self.start_sql_import(file_id, filename, row[1])
+            return
+        
+        # 아직 색인 중이면 색인이 끝난 뒤 불러옵니다.
+        if self.tasks.is_running(('index', file_id)):
+            self.statusBar().showMessage(f'{filename} 색인이 끝나면 표시합니다...')
+            return
+        self.start_load(file_id, filename)
+
+    def start_load(self, file_id, filename):
+        conn = sqlite3.connect(DB_PATH)
+        c = conn.cursor()
+        c.execute('SELECT cache_filename FROM file_info WHERE id=?', (file_id,))
+        row = c.fetchone()
+        conn.close()
+        cache_filename = row[0] if row else None
+        
+        # 컬럼형 캐시에서 읽기 (캐시가 없는 기존 파일은 이때 변환)
+        self.tasks.submit(
+            ('load', file_id), self.load_task, file_id, filename, cache_filename,
+            on_finished=self.on_load_finished,
+            on_failed=lambda msg: QMessageBox.critical(
+                self, '오류', f'파일 로드 중 오류가 발생했습니다: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    @instrument.timed()
+    def load_task(self, task, file_id, filename, cache_filename):
+        task.report(0, f'{filename} 불러오는 중...')
+        df, new_cache_filename = storage.load_dataframe(UPLOADED_FILES_DIR, filename, cache_filename)
+        instrument.rows(len(df))
+        return file_id, df, new_cache_filename
+
+    @instrument.timed()
+    def on_load_finished(self, result):
+        file_id, df, new_cache_filename = result
+        if new_cache_filename:
+            conn = sqlite3.connect(DB_PATH)
+            c = conn.cursor()
+            c.execute('UPDATE file_info SET cache_filename=? WHERE id=?',
+                      (new_cache_filename, file_id))
+            conn.commit()
+            conn.close()
+        # 그 사이 다른 파일이 선택되었으면 결과를 버립니다.
+        if file_id != self.current_file_id:
+            return
+        
+        self.close_sql_table()
+        self.loaded_file_id = file_id
+        self.current_data = df
+        self.current_columns = self.current_data.columns.tolist()
+        self.search_index = None
+        instrument.rows(len(df))
+        
+        # 데이터 테이블 설정
+        self.setup_data_table()
         
+        # 필터 프레임 업데이트
+        self.update_filter_frame()
+        
+        # 데이터 표시
+        self.display_data()
+        
+        # 검색 색인은 표시한 뒤 따로 불러오거나 만듭니다.
+        self.tasks.submit(
+            ('search_index', file_id), self.search_index_task, file_id, df,
+            on_finished=self.on_search_index_finished,
+            on_failed=lambda msg: self.statusBar().showMessage(f'검색 색인 생성 실패: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    @instrument.timed()
+    def search_index_task(self, task, file_id, df):
+        # 저장된 색인이 있으면 불러오고, 없으면 한 번 만들어 DB에 저장합니다.
+        instrument.rows(len(df))
+        conn = sqlite3.connect(DB_PATH)
         try:
-            # 엑셀 파일 읽기
-            file_path = os.path.join(UPLOADED_FILES_DIR, filename)
-            self.current_data = pd.read_excel(file_path)
-            self.current_columns = self.current_data.columns.tolist()
-            
-            # 데이터 테이블 설정
-            self.setup_data_table()
-            
-            # 필터 프레임 업데이트
-            self.update_filter_frame()
-            
-            # 데이터 표시
-            self.display_data()
-            
-        except Exception as e:
-            QMessageBox.critical(self, '오류', f'파일 로드 중 오류가 발생했습니다: {str(e)}')
+            index = search_index.SearchIndex.load(conn, file_id, df.shape[1], len(df))
+            if index is None:
+                task.report(0, '검색 색인 생성 중...')
+                index = search_index.SearchIndex.build(df, check_cancelled=task.check_cancelled)
+                index.save(conn, file_id)
+        finally:
+            conn.close()
+        return file_id, index
+
+    def on_search_index_finished(self, result):
+        file_id, index = result
+        if file_id == self.loaded_file_id:
+            self.search_index = index
+
+    def open_sql_file(self, file_id, rows_db):
+        # 행 단위 저장 파일은 DataFrame으로 읽지 않고 SQL로 필요한 페이지만 읽습니다.
+        self.close_sql_table()
+        self.sql_table = sql_store.SqlTable(os.path.join(UPLOADED_FILES_DIR, rows_db))
+        self.loaded_file_id = file_id
+        self.current_data = None
+        self.search_index = None
+        self.current_columns = list(self.sql_table.columns)
+        self.data_table.setModel(self.sql_model)
+        self.sql_model.set_table(self.sql_table)
+        self.resize_data_columns()
+        self.update_filter_frame()
+        self.index_btn.setEnabled(True)
+        self.statusBar().showMessage(f'{self.sql_table.row_count:,}행 (DB 저장 파일)')
+
+    def close_sql_table(self):
+        if self.sql_table is None:
+            return
+        self.tasks.cancel_kind('sql_query')
+        self.sql_model.set_table(None)
+        self.data_table.setModel(self.data_model)
+        self.sql_table.close()
+        self.sql_table = None
+        self.index_btn.setEnabled(False)
+
+    def refresh_sql_view(self):
+        # 필터와 검색어를 SQL 조건으로 바꿔 조건에 맞는 행 키만 백그라운드에서 조회합니다.
+        filters = {pos: self.filter_entries[col].text()
+                   for pos, col in enumerate(self.current_columns) if col in self.filter_entries}
+        try:
+            where, params = sql_store.build_where(filters, self.sql_table.kinds,
+                                                  self.search_entry.text().strip(),
+                                                  self.regex_check.isChecked())
+        except (ValueError, re.error) as e:
+            self.statusBar().showMessage(f'조건 오류: {e}')
+            return
+        self.tasks.cancel_kind('sql_query')
+        if not where:
+            self.sql_model.set_rows(None)
+            self.statusBar().showMessage(f'{self.sql_table.row_count:,}행 (DB 저장 파일)')
+            return
+        self.tasks.submit(
+            ('sql_query', self.loaded_file_id, where, tuple(params)), self.sql_query_task,
+            self.loaded_file_id, self.sql_table.db_path, where, params,
+            on_finished=self.on_sql_query_finished,
+            on_failed=lambda msg: self.statusBar().showMessage(f'조회 실패: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    @instrument.timed()
+    def sql_query_task(self, task, file_id, db_path, where, params):
+        # SQLite 연결은 스레드마다 따로 엽니다. (WAL 모드라 읽기끼리 막지 않음)
+        task.report(0, '조회 중...')
+        start = time.perf_counter()
+        table = sql_store.SqlTable(db_path)
+        try:
+            row_ids = table.query_ids(where, params, should_cancel=task.is_cancelled)
+        except sqlite3.OperationalError:
+            task.check_cancelled()
+            raise
+        finally:
+            table.close()
+        instrument.rows(len(row_ids))
+        return file_id, row_ids, (time.perf_counter() - start) * 1000
+
+    def on_sql_query_finished(self, result):
+        file_id, row_ids, elapsed = result
+        if file_id != self.loaded_file_id or self.sql_table is None:
+            return
+        self.sql_model.set_rows(row_ids)
+        self.statusBar().showMessage(f'조회 결과 {len(row_ids):,}건 ({elapsed:.1f}ms, SQL)')
+
+    def choose_index_columns(self):
+        if self.sql_table is None:
+            return
+        dialog = IndexColumnDialog(self.current_columns, sql_store.indexed_columns(self.sql_table.conn), self)
+        if dialog.exec_() != QDialog.Accepted:
+            return
+        self.tasks.submit(
+            ('sql_index', self.loaded_file_id), self.sql_index_task,
+            self.sql_table.db_path, dialog.selected_positions(),
+            on_finished=lambda _: self.statusBar().showMessage('인덱스를 갱신했습니다.'),
+            on_failed=lambda msg: QMessageBox.critical(
+                self, '오류', f'인덱스 생성 중 오류가 발생했습니다: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    def sql_index_task(self, task, db_path, positions):
+        task.report(0, '인덱스 생성 중...')
+        sql_store.set_indexes(db_path, positions, check_cancelled=task.check_cancelled)
 
     def setup_data_table(self):
-        self.data_table.setColumnCount(len(self.current_columns))
-        self.data_table.setHorizontalHeaderLabels(self.current_columns)
-        self.data_table.horizontalHeader().setStretchLastSection(True)
+        self.data_model.set_frame(self.current_data)
+        self.resize_data_columns()
+
+    def resize_data_columns(self):
+        # 표본 행으로 컬럼 너비 추정
+        widths = estimate_column_widths(self.data_table.model(), self.data_table.fontMetrics())
+        for col, width in enumerate(widths):
+            self.data_table.setColumnWidth(col, width)
 
     def update_filter_frame(self):
         # 기존 필터 위젯 제거
@@ -290,63 +686,216 @@ class MainWindow(QMainWindow):
         
         # 새 필터 위젯 생성
         self.filter_entries = {}
+        self.dirty_filters = set()
+        self.search_rows = None
+        self.filter_engine = filter_engine.FilterEngine(self.current_data) if self.current_data is not None else None
         for i, col in enumerate(self.current_columns):
             label = QLabel(f'{col}:')
             entry = QLineEdit()
+            entry.setPlaceholderText('예: 10~20, 김*, A,B')
+            entry.setToolTip(filter_engine.FILTER_HELP)
+            entry.textChanged.connect(lambda _, col=col: self.on_filter_changed(col))
             self.filter_entries[col] = entry
             self.filter_frame.addWidget(label, i//3, (i%3)*2)
             self.filter_frame.addWidget(entry, i//3, (i%3)*2+1)
 
-    def display_data(self, filtered_data=None):
-        data_to_display = filtered_data if filtered_data is not None else self.current_data
-        self.data_table.setRowCount(len(data_to_display))
-        
-        for i, (_, row) in enumerate(data_to_display.iterrows()):
-            for j, value in enumerate(row):
-                self.data_table.setItem(i, j, QTableWidgetItem(str(value)))
-        
-        self.data_table.resizeColumnsToContents()
+    @instrument.timed()
+    def display_data(self, rows=None):
+        # rows: current_data 기준 행 위치 배열 (복사 없이 필터 결과 표시)
+        if self.data_model.frame() is not self.current_data:
+            self.setup_data_table()
+            self.data_model.set_rows(rows)
+        else:
+            # 같은 데이터에서 행만 바뀌면 컬럼 너비는 그대로 둡니다.
+            self.data_model.set_rows(rows)
+        instrument.rows(self.data_model.rowCount())
 
+    @instrument.timed()
     def search_data(self):
+        if self.sql_table is not None:
+            self.refresh_sql_view()
+            return
         if self.current_data is None:
             return
             
-        search_term = self.search_entry.text().strip().lower()
+        search_term = self.search_entry.text().strip()
         if not search_term:
-            self.display_data()
+            self.search_rows = None
+            self.refresh_view()
             return
-            
-        # 모든 컬럼에서 검색
-        mask = pd.DataFrame(False, index=self.current_data.index, columns=['match'])
-        for col in self.current_columns:
-            mask['match'] |= self.current_data[col].astype(str).str.lower().str.contains(search_term)
         
-        filtered_data = self.current_data[mask['match']]
-        self.display_data(filtered_data)
+        # 모든 컬럼에서 검색 (색인이 준비되기 전에는 전체 검색)
+        regex = self.regex_check.isChecked()
+        start = time.perf_counter()
+        try:
+            if self.search_index is not None:
+                rows = self.search_index.search(search_term, regex)
+            else:
+                rows = search_index.scan_search(self.current_data, search_term, regex)
+        except re.error as e:
+            self.statusBar().showMessage(f'정규식 오류: {e}')
+            return
+        elapsed = (time.perf_counter() - start) * 1000
+        
+        self.search_rows = rows
+        count = self.refresh_view()
+        instrument.rows(count)
+        mode = '색인' if self.search_index is not None else '전체 검색'
+        self.statusBar().showMessage(f'검색 결과 {count}건 ({elapsed:.1f}ms, {mode})')
+
+    def on_filter_changed(self, col):
+        self.dirty_filters.add(col)
+        self.filter_timer.start()
+
+    @instrument.timed()
+    def apply_filters(self):
+        # 바뀐 컬럼의 마스크만 다시 계산합니다. (DB 저장 파일은 SQL 조건으로 다시 조회)
+        if self.sql_table is not None:
+            self.dirty_filters = set()
+            self.refresh_sql_view()
+            return
+        if self.filter_engine is None:
+            return
+        start = time.perf_counter()
+        errors = []
+        for col in self.dirty_filters:
+            entry = self.filter_entries.get(col)
+            try:
+                self.filter_engine.set_expression(col, entry.text() if entry else '')
+            except ValueError as e:
+                errors.append(f'{col}: {e}')
+        self.dirty_filters = set()
+        count = self.refresh_view()
+        instrument.rows(count)
+        elapsed = (time.perf_counter() - start) * 1000
+        if errors:
+            self.statusBar().showMessage('필터 오류 - ' + ' / '.join(errors))
+        else:
+            self.statusBar().showMessage(f'필터 결과 {count}건 ({elapsed:.1f}ms)')
+
+    def refresh_view(self):
+        # 검색 결과와 컬럼 필터 마스크를 합쳐 표시하고, 표시된 행 수를 돌려줍니다.
+        if self.current_data is None:
+            return 0
+        mask = self.filter_engine.mask() if self.filter_engine is not None else None
+        rows = self.search_rows
+        if mask is not None:
+            rows = np.flatnonzero(mask) if rows is None else rows[mask[rows]]
+        self.display_data(rows=rows)
+        return len(self.current_data) if rows is None else len(rows)
 
+    @instrument.timed()
     def reset_filters(self):
         # 필터 초기화
+        self.filter_timer.stop()
         for entry in self.filter_entries.values():
+            entry.blockSignals(True)
             entry.clear()
+            entry.blockSignals(False)
         self.search_entry.clear()
+        self.dirty_filters = set()
+        self.search_rows = None
+        if self.filter_engine is not None:
+            self.filter_engine.clear()
+        if self.sql_table is not None:
+            self.refresh_sql_view()
+            return
         self.display_data()
 
     def export_to_excel(self):
-        if self.current_data is None:
+        if self.current_data is None and self.sql_table is None:
             QMessageBox.warning(self, '알림', '내보낼 데이터가 없습니다.')
             return
             
-        file_path, _ = QFileDialog.getSaveFileName(
-            self, '엑셀 파일로 저장', '', 'Excel files (*.xlsx)'
+        # 엑셀 외에 훨씬 빠른 CSV/Parquet도 고를 수 있습니다.
+        formats = table_export.export_formats()
+        name_filters = [f'{name} files (*{ext})' for ext, name in formats]
+        file_path, selected = QFileDialog.getSaveFileName(
+            self, '파일로 저장', '', ';;'.join(name_filters)
         )
         if not file_path:
             return
-            
-        try:
-            self.current_data.to_excel(file_path, index=False)
-            QMessageBox.information(self, '성공', '파일이 성공적으로 저장되었습니다.')
-        except Exception as e:
-            QMessageBox.critical(self, '오류', f'파일 저장 중 오류가 발생했습니다: {str(e)}')
+        if os.path.splitext(file_path)[1].lower() not in table_export.EXPORT_FORMATS:
+            file_path += formats[name_filters.index(selected)][0] if selected in name_filters else '.xlsx'
+
+        # 지금 화면에 보이는(검색/필터가 적용된) 행만 내보냅니다.
+        if self.sql_table is None:
+            source = (self.current_data, self.data_model.visible_rows())
+        else:
+            source = (self.sql_table.db_path, self.sql_model.visible_row_ids())
+        self.tasks.submit(
+            ('export', file_path), self.export_task, source, file_path,
+            on_finished=lambda _: QMessageBox.information(
+                self, '성공', '파일이 성공적으로 저장되었습니다.'),
+            on_failed=lambda msg: QMessageBox.critical(
+                self, '오류', f'파일 저장 중 오류가 발생했습니다: {msg}'),
+            on_progress=self.on_task_progress,
+            on_done=self.update_task_status)
+        self.update_task_status()
+
+    @instrument.timed()
+    def export_task(self, task, source, file_path):
+        # source: (DataFrame, 행 위치 배열) 또는 (DB 경로, 행 키 배열). 배열이 None이면 전체
+        data, rows = source
+        name = os.path.basename(file_path)
+        task.report(0, f'{name} 저장 중...')
+
+        def progress(done, total):
+            if total:
+                task.report(max(1, done * 100 // total), f'{name} 저장 중... ({done:,}/{total:,}행)')
+
+        if isinstance(data, str):
+            # DB 저장 파일은 작업 스레드에서 따로 연결해 페이지 단위로 읽습니다.
+            table = sql_store.SqlTable(data)
+            try:
+                total = table.row_count if rows is None else len(rows)
+                done = table_export.export_chunks(table.iter_frames(rows), file_path, table.columns, total,
+                                                  progress=progress, should_cancel=task.is_cancelled)
+            finally:
+                table.close()
+        else:
+            total = len(data) if rows is None else len(rows)
+            done = table_export.export_dataframe(data, file_path, rows, progress=progress,
+                                                 should_cancel=task.is_cancelled)
+        if not done:
+            task.check_cancelled()
+        instrument.rows(total)
+        return file_path
+
+    def show_perf_dialog(self):
+        if self.perf_dialog is None:
+            self.perf_dialog = PerfDialog(self)
+        self.perf_dialog.show()
+        self.perf_dialog.raise_()
+        self.perf_dialog.activateWindow()
+
+    def on_task_progress(self, percent, message):
+        # 진행률을 알 수 없는 단계(0)는 진행 중 표시만 합니다.
+        if percent <= 0:
+            self.progress_bar.setRange(0, 0)
+        else:
+            self.progress_bar.setRange(0, 100)
+            self.progress_bar.setValue(percent)
+        self.progress_message = message
+        self.statusBar().showMessage(message)
+
+    def update_task_status(self):
+        running = self.tasks.running_count() > 0
+        self.progress_bar.setVisible(running)
+        self.cancel_btn.setVisible(running)
+        # 작업이 모두 끝나면 진행 메시지만 지우고, 결과 메시지는 남겨 둡니다.
+        if not running and self.statusBar().currentMessage() == self.progress_message:
+            self.statusBar().clearMessage()
+
+    def cancel_tasks(self):
+        self.tasks.cancel_all()
+        self.statusBar().showMessage('작업을 취소하는 중...')
+
+    def closeEvent(self, event):
+        self.tasks.cancel_all()
+        self.close_sql_table()
+        self.parse_pool.shutdown(cancel_futures=True)
+        super().closeEvent(event)
 
     def delete_file(self):
         if not self.current_file_id:
@@ -359,24 +908,40 @@ class MainWindow(QMainWindow):
         )
         
         if reply == QMessageBox.Yes:
+            self.tasks.cancel(('load', self.current_file_id))
+            self.tasks.cancel(('index', self.current_file_id))
+            self.tasks.cancel(('search_index', self.current_file_id))
+            importing = self.tasks.is_running(('sql_import', self.current_file_id))
+            self.tasks.cancel(('sql_import', self.current_file_id))
+            if self.loaded_file_id == self.current_file_id:
+                self.close_sql_table()
             try:
                 # DB에서 파일 정보 삭제
                 conn = sqlite3.connect(DB_PATH)
                 c = conn.cursor()
-                c.execute('SELECT filename FROM file_info WHERE id=?', (self.current_file_id,))
-                filename = c.fetchone()[0]
+                c.execute('SELECT filename, cache_filename, rows_db FROM file_info WHERE id=?',
+                          (self.current_file_id,))
+                filename, cache_filename, rows_db = c.fetchone()
                 c.execute('DELETE FROM file_info WHERE id=?', (self.current_file_id,))
                 conn.commit()
+                search_index.delete_index(conn, self.current_file_id)
                 conn.close()
                 
                 # 실제 파일 삭제
                 file_path = os.path.join(UPLOADED_FILES_DIR, filename)
                 if os.path.exists(file_path):
                     os.remove(file_path)
+                storage.remove_cache(UPLOADED_FILES_DIR,
+                                     cache_filename or storage.find_cache(UPLOADED_FILES_DIR, filename))
+                # 저장 중이던 행 DB는 취소된 저장 작업이 지웁니다.
+                if rows_db and not importing:
+                    sql_store.remove_rows_db(os.path.join(UPLOADED_FILES_DIR, rows_db))
                 
                 self.current_file_id = None
+                self.loaded_file_id = None
                 self.current_columns = []
                 self.current_data = None
+                self.search_index = None
                 self.load_files()
                 self.setup_data_table()
                 self.update_filter_frame()
@@ -391,4 +956,5 @@ if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = MainWindow()
     window.show()
+    preload(LAZY_MODULES)
     sys.exit(app.exec_()) 
\ No newline at end of file
@@ -0,0 +1,107 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                             QPushButton, QComboBox, QLabel, QPlainTextEdit, QFileDialog, QMessageBox,
+                             QHeaderView)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFontDatabase
+import instrument
+
+# 핸들러별 처리 시간 창 (메뉴/버튼 없이 Ctrl+Shift+D로 엽니다)
+# 열려 있는 동안 REFRESH_MS마다 instrument의 기록(p50/p95 등)을 다시 읽어 보여줍니다.
+# - '다음 동작 프로파일': 고른 핸들러(기본: 아무 동작)의 다음 한 번을 cProfile로 재서 아래에 요약을 보여줍니다.
+# - '기록 파일...': 이후 기록을 JSONL/SQLite 파일에도 남깁니다.
+REFRESH_MS = 1000
+ANY_HANDLER = '(다음 동작)'
+
+
+class PerfDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle('성능 기록 (핸들러별 처리 시간)')
+        self.resize(900, 600)
+        self.shown_profile = None
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(instrument.SUMMARY_HEADERS))
+        self.table.setHorizontalHeaderLabels(instrument.SUMMARY_HEADERS)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        controls = QHBoxLayout()
+        self.target = QComboBox()
+        self.target.setMinimumWidth(200)
+        self.target.addItem(ANY_HANDLER)
+        profile_btn = QPushButton('다음 동작 프로파일')
+        profile_btn.clicked.connect(self.arm_profile)
+        clear_btn = QPushButton('기록 지우기')
+        clear_btn.clicked.connect(self.clear)
+        log_btn = QPushButton('기록 파일...')
+        log_btn.clicked.connect(self.choose_log)
+        for widget in (self.target, profile_btn, clear_btn, log_btn):
+            controls.addWidget(widget)
+        controls.addStretch()
+        layout.addLayout(controls)
+        self.status = QLabel()
+        layout.addWidget(self.status)
+        self.profile_text = QPlainTextEdit()
+        self.profile_text.setReadOnly(True)
+        self.profile_text.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.profile_text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        layout.addWidget(self.profile_text)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(REFRESH_MS)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start()
+        self.refresh()
+
+    def arm_profile(self):
+        name = self.target.currentText()
+        instrument.profile_next(None if name == ANY_HANDLER else name)
+        self.refresh_status()
+
+    def clear(self):
+        instrument.recorder.clear()
+        self.refresh()
+
+    def choose_log(self):
+        path, _ = QFileDialog.getSaveFileName(self, '기록 파일', 'perf_log.jsonl',
+                                              'JSON Lines (*.jsonl);;SQLite DB (*.db)')
+        if not path:
+            return
+        try:
+            instrument.recorder.open_log(path)
+        except (ValueError, OSError) as e:
+            QMessageBox.critical(self, '오류', str(e))
+        self.refresh_status()
+
+    def refresh(self):
+        rows = instrument.summary_rows()
+        self.table.setRowCount(len(rows))
+        for r, row in enumerate(rows):
+            for c, value in enumerate(row):
+                item = QTableWidgetItem(str(value))
+                if c > 0:
+                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                self.table.setItem(r, c, item)
+        # 고른 핸들러는 목록을 다시 채워도 그대로 둡니다.
+        current = self.target.currentText()
+        names = [ANY_HANDLER] + sorted(row[0] for row in rows)
+        if names != [self.target.itemText(i) for i in range(self.target.count())]:
+            self.target.clear()
+            self.target.addItems(names)
+            self.target.setCurrentText(current if current in names else ANY_HANDLER)
+        self.refresh_status()
+        self.show_profile()
+
+    def refresh_status(self):
+        parts = [f'기록 파일: {instrument.recorder.log_path or "없음"}']
+        if instrument.recorder.profile_pending:
+            parts.append('다음 동작을 프로파일합니다...')
+        self.status.setText('  |  '.join(parts))
+
+    def show_profile(self):
+        profiles = instrument.recorder.profiles
+        if not profiles or profiles[-1] is self.shown_profile:
+            return
+        profile = self.shown_profile = profiles[-1]
+        self.profile_text.setPlainText(f"[{profile['name']}] {profile['path'] or ''}\n{profile['text']}")
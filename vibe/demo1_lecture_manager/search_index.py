@@ -0,0 +1,151 @@
+import json
+import re
+from collections import defaultdict
+from itertools import chain
+import numpy as np
+import pandas as pd
+
+# 부분 문자열 검색에 쓰는 n-gram 길이 (한글은 2글자 단위가 적당합니다)
+GRAM_SIZE = 2
+
+
+def normalize_column(series):
+    # 기존 검색과 같은 기준: 문자열로 바꾼 뒤 소문자로
+    return series.astype(str).str.lower()
+
+
+def make_grams(text, n=GRAM_SIZE):
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class ColumnIndex:
+    # 한 컬럼의 역색인
+    # 셀 값을 고유값(uniques)과 행별 코드(codes)로 나누고,
+    # n-gram -> 그 n-gram을 포함하는 고유값 번호 목록(CSR: offsets/ids)을 저장합니다.
+    def __init__(self, uniques, codes, grams, offsets, ids):
+        self.uniques = uniques
+        self.codes = codes
+        self.grams = grams
+        self.gram_lookup = {gram: i for i, gram in enumerate(grams)}
+        self.offsets = offsets
+        self.ids = ids
+
+    @classmethod
+    def build(cls, series):
+        codes, uniques = pd.factorize(normalize_column(series))
+        uniques = uniques.tolist()
+        postings = defaultdict(list)
+        for value_id, value in enumerate(uniques):
+            for gram in make_grams(value):
+                postings[gram].append(value_id)
+        grams = list(postings)
+        offsets = np.zeros(len(grams) + 1, dtype=np.int64)
+        np.cumsum([len(postings[gram]) for gram in grams], out=offsets[1:])
+        ids = np.fromiter(chain.from_iterable(postings[gram] for gram in grams),
+                          dtype=np.int32, count=int(offsets[-1]))
+        return cls(uniques, codes.astype(np.int32), grams, offsets, ids)
+
+    def postings(self, gram):
+        i = self.gram_lookup.get(gram)
+        if i is None:
+            return np.empty(0, dtype=np.int32)
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def candidates(self, term):
+        # 검색어의 n-gram을 모두 포함하는 고유값 번호 (짧은 목록부터 교집합)
+        if len(term) < GRAM_SIZE:
+            return range(len(self.uniques))
+        lists = sorted((self.postings(gram) for gram in make_grams(term)), key=len)
+        result = lists[0]
+        for ids in lists[1:]:
+            if not len(result):
+                break
+            result = np.intersect1d(result, ids, assume_unique=True)
+        return result
+
+    def match_values(self, term=None, pattern=None):
+        if pattern is not None:
+            return [i for i, value in enumerate(self.uniques) if pattern.search(value)]
+        # n-gram은 순서를 보장하지 않으므로 후보를 실제 문자열로 확인합니다.
+        return [i for i in self.candidates(term) if term in self.uniques[i]]
+
+    def row_mask(self, value_ids):
+        # 빈 값(NaN/None)의 코드는 -1이므로 끝에 False 칸을 하나 더 두어 어떤 검색어에도 맞지 않게 합니다.
+        hit = np.zeros(len(self.uniques) + 1, dtype=bool)
+        hit[np.asarray(value_ids, dtype=np.intp)] = True
+        return hit[self.codes]
+
+
+class SearchIndex:
+    # 파일 하나의 전체 컬럼 검색 색인
+    def __init__(self, columns, row_count):
+        self.columns = columns
+        self.row_count = row_count
+
+    @classmethod
+    def build(cls, df, check_cancelled=None):
+        # check_cancelled는 컬럼마다 호출되며, 취소되었으면 예외를 던집니다.
+        columns = []
+        for j in range(df.shape[1]):
+            if check_cancelled is not None:
+                check_cancelled()
+            columns.append(ColumnIndex.build(df.iloc[:, j]))
+        return cls(columns, len(df))
+
+    def search(self, term, regex=False):
+        # 조건에 맞는 행 위치 배열을 돌려줍니다. 잘못된 정규식이면 re.error
+        # 정규식은 \D 같은 패턴이 바뀌지 않도록 소문자로 바꾸지 않고 대소문자만 무시합니다.
+        pattern = re.compile(term, re.IGNORECASE) if regex else None
+        term = term.lower()
+        mask = np.zeros(self.row_count, dtype=bool)
+        for column in self.columns:
+            value_ids = column.match_values(term, pattern)
+            if value_ids:
+                mask |= column.row_mask(value_ids)
+        return np.flatnonzero(mask)
+
+    def save(self, conn, file_id):
+        c = conn.cursor()
+        c.execute('DELETE FROM search_index WHERE file_id=?', (file_id,))
+        c.executemany(
+            '''INSERT INTO search_index (file_id, col, uniques, codes, grams, offsets, ids)
+               VALUES (?, ?, ?, ?, ?, ?, ?)''',
+            [(file_id, j, json.dumps(col.uniques, ensure_ascii=False), col.codes.tobytes(),
+              json.dumps(col.grams, ensure_ascii=False), col.offsets.tobytes(), col.ids.tobytes())
+             for j, col in enumerate(self.columns)])
+        conn.commit()
+
+    @classmethod
+    def load(cls, conn, file_id, column_count, row_count):
+        # 저장된 색인이 없거나 데이터 모양과 다르면 None
+        c = conn.cursor()
+        c.execute('''SELECT uniques, codes, grams, offsets, ids FROM search_index
+                     WHERE file_id=? ORDER BY col''', (file_id,))
+        columns = [ColumnIndex(json.loads(uniques), np.frombuffer(codes, dtype=np.int32),
+                               json.loads(grams), np.frombuffer(offsets, dtype=np.int64),
+                               np.frombuffer(ids, dtype=np.int32))
+                   for uniques, codes, grams, offsets, ids in c.fetchall()]
+        if len(columns) != column_count or any(len(col.codes) != row_count for col in columns):
+            return None
+        return cls(columns, row_count)
+
+
+def delete_index(conn, file_id):
+    conn.execute('DELETE FROM search_index WHERE file_id=?', (file_id,))
+    conn.commit()
+
+
+def scan_search(df, term, regex=False):
+    # 색인이 아직 없을 때 쓰는 전체 검색 (결과는 SearchIndex.search와 같습니다)
+    if regex:
+        pattern = re.compile(term, re.IGNORECASE)
+    else:
+        term = term.lower()
+    mask = np.zeros(len(df), dtype=bool)
+    for j in range(df.shape[1]):
+        values = normalize_column(df.iloc[:, j])
+        if regex:
+            mask |= values.str.contains(pattern, regex=True).to_numpy()
+        else:
+            mask |= values.str.contains(term, regex=False).to_numpy()
+    return np.flatnonzero(mask)
@@ -0,0 +1,298 @@
+import os
+import re
+import sqlite3
+from datetime import date, datetime, time
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from filter_engine import parse_expression, to_datetime64, to_number
+
+# 행 단위 저장 모드: 업로드 파일마다 별도 SQLite DB(uploaded_files/<파일명>.db)에
+# data 테이블(_row, c0, c1, ...)과 원래 컬럼명/값 종류(columns 테이블)를 저장합니다.
+DATA_TABLE = 'data'
+# 컬럼 값 종류: 필터 값을 어떻게 비교할지 정합니다. (pandas로 읽었을 때의 dtype에 따라
+# FilterEngine이 비교하는 방식과 같게)
+# number: 숫자, datetime: 날짜(ISO 문자열로 저장), bool: 'true'/'false', text: 문자열,
+# mixed: 여러 종류가 섞인 컬럼은 값을 문자열로 바꿔 비교
+NUMBER_TYPES = (int, float, np.integer, np.floating)
+DATETIME_TYPES = (datetime, date)
+IMPORT_CHUNK_ROWS = 5000
+# 행 키로 조회할 때 IN (...)에 한 번에 넣는 키 개수 (오래된 SQLite의 변수 개수 제한 999보다 작게)
+FETCH_KEYS_ROWS = 900
+PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+    'PRAGMA mmap_size=268435456',
+)
+
+
+def rows_db_filename(filename):
+    return os.path.splitext(filename)[0] + '.db'
+
+
+def connect(db_path):
+    # 트랜잭션은 직접 BEGIN/COMMIT 합니다.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in PRAGMAS:
+        conn.execute(pragma)
+    conn.create_function('regexp', 2, _regexp, deterministic=True)
+    return conn
+
+
+def remove_rows_db(db_path):
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+@lru_cache(maxsize=32)
+def _compile(pattern):
+    return re.compile(pattern, re.IGNORECASE)
+
+
+def _regexp(pattern, value):
+    # SQL의 "값 REGEXP 패턴"은 regexp(패턴, 값)으로 호출됩니다.
+    if value is None:
+        return False
+    return _compile(pattern).search(str(value)) is not None
+
+
+def _sql_value(value):
+    # 날짜는 ISO 문자열로 저장해 정렬/비교가 되게 합니다.
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _column_kind(types):
+    # types: 컬럼에 나온 값의 타입 집합 (빈 값은 NoneType)
+    values = {t for t in types if t is not type(None)}
+    if values and all(t is bool for t in values):
+        # 빈 값이 섞인 참/거짓 컬럼은 pandas에서 숫자(1.0/0.0)가 됩니다.
+        return 'number' if len(values) < len(types) else 'bool'
+    if all(issubclass(t, NUMBER_TYPES) and t is not bool for t in values):
+        return 'number'
+    if all(issubclass(t, DATETIME_TYPES) for t in values):
+        return 'datetime'
+    if all(issubclass(t, str) for t in values):
+        return 'text'
+    return 'mixed'
+
+
+def _iter_sheet_rows(file_path):
+    # 헤더를 제외한 데이터 행을 하나씩 돌려줍니다. (빈 행은 pandas처럼 건너뜀)
+    if os.path.splitext(file_path)[1].lower() not in ('.xlsx', '.xlsm'):
+        df = pd.read_excel(file_path)
+        for row in df.astype(object).where(df.notna(), None).itertuples(index=False):
+            yield list(row)
+        return
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+        next(rows, None)
+        for row in rows:
+            row = list(row)
+            while row and row[-1] in (None, ''):
+                row.pop()
+            if row:
+                yield row
+    finally:
+        wb.close()
+
+
+def import_excel(file_path, db_path, columns, check_cancelled=None, progress=None):
+    # 엑셀을 스트리밍으로 읽어 한 트랜잭션 안에서 executemany로 넣습니다.
+    # 메모리는 IMPORT_CHUNK_ROWS 행만큼만 사용합니다. 반환값: 저장한 행 수
+    remove_rows_db(db_path)
+    columns = list(columns)
+    types = [set() for _ in columns]
+    conn = connect(db_path)
+    count = 0
+    try:
+        conn.execute('BEGIN')
+        conn.execute('CREATE TABLE columns (pos INTEGER PRIMARY KEY, name TEXT NOT NULL, kind TEXT)')
+        col_defs = ', '.join(f'c{j}' for j in range(len(columns)))
+        conn.execute(f'CREATE TABLE {DATA_TABLE} (_row INTEGER PRIMARY KEY, {col_defs})')
+        batch = []
+        for row in _iter_sheet_rows(file_path):
+            # 헤더보다 긴 행이 나오면 컬럼을 늘립니다. (pandas의 Unnamed: n 과 같음)
+            if len(row) > len(columns):
+                count += _flush(conn, batch, len(columns))
+                while len(row) > len(columns):
+                    conn.execute(f'ALTER TABLE {DATA_TABLE} ADD COLUMN c{len(columns)}')
+                    columns.append(f'Unnamed: {len(columns)}')
+                    types.append(set())
+            # 컬럼별 값 종류 (모자란 칸은 빈 값)
+            for j, value in enumerate(row):
+                types[j].add(type(value))
+            for j in range(len(row), len(columns)):
+                types[j].add(type(None))
+            batch.append([_sql_value(v) for v in row] + [None] * (len(columns) - len(row)))
+            if len(batch) >= IMPORT_CHUNK_ROWS:
+                count += _flush(conn, batch, len(columns))
+                if check_cancelled is not None:
+                    check_cancelled()
+                if progress is not None:
+                    progress(count)
+        count += _flush(conn, batch, len(columns))
+        conn.executemany('INSERT INTO columns (pos, name, kind) VALUES (?, ?, ?)',
+                         [(j, name, _column_kind(types[j])) for j, name in enumerate(columns)])
+        conn.execute('COMMIT')
+    except BaseException:
+        conn.close()
+        remove_rows_db(db_path)
+        raise
+    conn.close()
+    return count
+
+
+def _flush(conn, batch, width):
+    if not batch:
+        return 0
+    placeholders = ', '.join('?' * width)
+    names = ', '.join(f'c{j}' for j in range(width))
+    conn.executemany(f'INSERT INTO {DATA_TABLE} ({names}) VALUES ({placeholders})', batch)
+    n = len(batch)
+    batch.clear()
+    return n
+
+
+def indexed_columns(conn):
+    rows = conn.execute("SELECT name FROM sqlite_master WHERE type='index' AND name LIKE 'idx_c%'")
+    return sorted(int(name[len('idx_c'):]) for (name,) in rows)
+
+
+def set_indexes(db_path, positions, check_cancelled=None):
+    # 선택한 컬럼에만 인덱스가 있도록 만들고 나머지는 지웁니다.
+    # 필터와 같은 NOCASE 비교를 쓰므로 인덱스도 NOCASE로 만듭니다.
+    conn = connect(db_path)
+    try:
+        current = set(indexed_columns(conn))
+        wanted = set(positions)
+        for pos in current - wanted:
+            conn.execute(f'DROP INDEX idx_c{pos}')
+        for pos in sorted(wanted - current):
+            if check_cancelled is not None:
+                check_cancelled()
+            conn.execute(f'CREATE INDEX idx_c{pos} ON {DATA_TABLE} (c{pos} COLLATE NOCASE)')
+        conn.execute('ANALYZE')
+    finally:
+        conn.close()
+
+
+def _param(text, kind):
+    # 필터 값을 컬럼 종류에 맞게 바꿉니다. 잘못된 값이면 FilterEngine과 같은 ValueError
+    if kind == 'number':
+        return to_number(text)
+    if kind == 'datetime':
+        return pd.Timestamp(to_datetime64(text)).isoformat(sep=' ')
+    if kind == 'bool':
+        # 참/거짓은 1/0으로 저장되어 있습니다. 다른 값은 어느 행과도 같지 않습니다.
+        return {'true': 1, 'false': 0}.get(text.lower(), text)
+    return text
+
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def predicate_sql(col, predicate, kind='text'):
+    op = predicate[0]
+    # 섞인 컬럼은 메모리 필터처럼 값을 문자열로 바꿔 비교합니다. (이 컬럼은 인덱스를 쓰지 못함)
+    target = f'CAST({col} AS TEXT) COLLATE NOCASE' if kind == 'mixed' else f'{col} COLLATE NOCASE'
+    if op == 'prefix':
+        return f"{col} LIKE ? ESCAPE '\\'", [_escape_like(predicate[1]) + '%']
+    if op == 'range':
+        _, low, high = predicate
+        clauses, params = [], []
+        if low is not None:
+            clauses.append(f'{target} >= ?')
+            params.append(_param(low, kind))
+        if high is not None:
+            clauses.append(f'{target} <= ?')
+            params.append(_param(high, kind))
+        return ' AND '.join(clauses), params
+    if op == 'in':
+        values = [_param(v, kind) for v in predicate[1]]
+        return f"{target} IN ({', '.join('?' * len(values))})", values
+    sql_op = '=' if op == 'eq' else op
+    return f'{target} {sql_op} ?', [_param(predicate[1], kind)]
+
+
+def build_where(filters, kinds, search_term='', regex=False):
+    # filters: {컬럼 위치: 필터 입력 문자열}, kinds: 컬럼별 값 종류 (SqlTable.kinds)
+    # 잘못된 입력이면 ValueError
+    column_count = len(kinds)
+    clauses, params = [], []
+    for pos, text in sorted(filters.items()):
+        if text.strip():
+            clause, values = predicate_sql(f'c{pos}', parse_expression(text), kinds[pos])
+            clauses.append(f'({clause})')
+            params.extend(values)
+    if search_term:
+        if regex:
+            re.compile(search_term)
+            parts = [f'c{j} REGEXP ?' for j in range(column_count)]
+            params.extend([search_term] * column_count)
+        else:
+            parts = [f"c{j} LIKE ? ESCAPE '\\'" for j in range(column_count)]
+            params.extend(['%' + _escape_like(search_term) + '%'] * column_count)
+        clauses.append('(' + ' OR '.join(parts) + ')')
+    return ' AND '.join(clauses), params
+
+
+class SqlTable:
+    # 행 단위로 저장된 파일 하나를 읽기 위한 연결
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.conn = connect(db_path)
+        rows = self.conn.execute('SELECT name, kind FROM columns ORDER BY pos').fetchall()
+        self.columns = [name for name, _ in rows]
+        self.kinds = [kind for _, kind in rows]
+        # _row는 1부터 빈틈없이 매겨지므로 MAX가 곧 행 수입니다.
+        self.row_count = self.conn.execute(f'SELECT MAX(_row) FROM {DATA_TABLE}').fetchone()[0] or 0
+
+    def close(self):
+        self.conn.close()
+
+    def query_ids(self, where, params, should_cancel=None):
+        # 조건에 맞는 행 키(_row) 배열. 화면에는 이 배열로 페이지 단위 조회를 합니다.
+        # should_cancel()이 참이 되면 실행 중인 쿼리를 중단합니다. (OperationalError)
+        if should_cancel is not None:
+            self.conn.set_progress_handler(should_cancel, 10000)
+        try:
+            cursor = self.conn.execute(
+                f'SELECT _row FROM {DATA_TABLE} WHERE {where} ORDER BY _row', params)
+            return np.fromiter((row_id for (row_id,) in cursor), dtype=np.int64)
+        finally:
+            self.conn.set_progress_handler(None, 0)
+
+    def fetch_page(self, row_ids=None, start=0, stop=0):
+        # row_ids가 None이면 전체 행(_row = 위치 + 1), 아니면 row_ids[start:stop]의 행
+        names = ', '.join(f'c{j}' for j in range(len(self.columns)))
+        if row_ids is None:
+            return self.conn.execute(
+                f'SELECT {names} FROM {DATA_TABLE} WHERE _row BETWEEN ? AND ? ORDER BY _row',
+                (start + 1, stop)).fetchall()
+        keys = [int(k) for k in row_ids[start:stop]]
+        return self.conn.execute(
+            f"SELECT {names} FROM {DATA_TABLE} WHERE _row IN ({', '.join('?' * len(keys))}) ORDER BY _row",
+            keys).fetchall()
+
+    def iter_frames(self, row_ids=None, chunk_rows=IMPORT_CHUNK_ROWS):
+        # 내보내기용: 행(row_ids가 None이면 전체)을 chunk_rows행씩 DataFrame으로 읽습니다.
+        total = self.row_count if row_ids is None else len(row_ids)
+        if row_ids is not None:
+            chunk_rows = min(chunk_rows, FETCH_KEYS_ROWS)
+        for start in range(0, total, chunk_rows):
+            rows = self.fetch_page(row_ids, start, min(start + chunk_rows, total))
+            yield pd.DataFrame.from_records(rows, columns=self.columns)
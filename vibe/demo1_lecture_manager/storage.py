@@ -0,0 +1,171 @@
+import os
+import shutil
+import pandas as pd
+from datetime import datetime
+from openpyxl import load_workbook
+
+# Parquet 캐시는 pyarrow가 있을 때만 사용하고, 없으면 pickle로 대체합니다.
+try:
+    import pyarrow  # noqa: F401
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+PARQUET_EXT = '.parquet'
+PICKLE_EXT = '.pkl'
+# 업로드 시 컬럼 목록을 확인하기 위해 읽는 앞부분 행 수
+HEADER_SAMPLE_ROWS = 50
+
+
+def cache_filename_for(filename, ext=None):
+    # 원본 엑셀 파일명 옆에 둘 컬럼형 캐시 파일명
+    if ext is None:
+        ext = PARQUET_EXT if HAS_PARQUET else PICKLE_EXT
+    return os.path.splitext(filename)[0] + ext
+
+
+def write_cache(df, directory, filename):
+    # 캐시를 임시 파일에 쓴 뒤 교체하여, 중간에 실패해도 깨진 캐시가 남지 않게 합니다.
+    # 혼합 타입 컬럼처럼 Parquet로 저장할 수 없는 데이터는 pickle로 저장합니다.
+    cache_filename = cache_filename_for(filename)
+    if cache_filename.endswith(PARQUET_EXT):
+        try:
+            _write_atomic(df, os.path.join(directory, cache_filename))
+            return cache_filename
+        except Exception:
+            cache_filename = cache_filename_for(filename, PICKLE_EXT)
+    _write_atomic(df, os.path.join(directory, cache_filename))
+    return cache_filename
+
+
+def _write_atomic(df, cache_path):
+    tmp_path = cache_path + '.tmp'
+    try:
+        if cache_path.endswith(PARQUET_EXT):
+            df.to_parquet(tmp_path, index=False)
+        else:
+            df.to_pickle(tmp_path)
+        os.replace(tmp_path, cache_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def read_cache(cache_path):
+    if cache_path.endswith(PARQUET_EXT):
+        return pd.read_parquet(cache_path)
+    return pd.read_pickle(cache_path)
+
+
+def is_cache_valid(file_path, cache_path):
+    # 캐시가 있고 원본보다 오래되지 않았으면 유효
+    if not cache_path or not os.path.exists(cache_path):
+        return False
+    if cache_path.endswith(PARQUET_EXT) and not HAS_PARQUET:
+        return False
+    return os.path.getmtime(cache_path) >= os.path.getmtime(file_path)
+
+
+def find_cache(directory, filename, cache_filename=None):
+    # 기록된 캐시가 없으면 기본 이름의 캐시(중단된 색인 작업이 남긴 것)도 찾아봅니다.
+    file_path = os.path.join(directory, filename)
+    if cache_filename:
+        candidates = [cache_filename]
+    else:
+        candidates = [cache_filename_for(filename, PARQUET_EXT),
+                      cache_filename_for(filename, PICKLE_EXT)]
+    for name in candidates:
+        if is_cache_valid(file_path, os.path.join(directory, name)):
+            return name
+    return None
+
+
+def load_dataframe(directory, filename, cache_filename=None):
+    # 캐시가 유효하면 캐시에서, 아니면 엑셀을 읽고 캐시를 새로 만듭니다.
+    # 반환값: (DataFrame, 새로 기록해야 할 캐시 파일명 또는 None)
+    found = find_cache(directory, filename, cache_filename)
+    if found:
+        df = read_cache(os.path.join(directory, found))
+        return df, (found if found != cache_filename else None)
+    df = pd.read_excel(os.path.join(directory, filename))
+    new_cache_filename = write_cache(df, directory, filename)
+    if cache_filename and cache_filename != new_cache_filename:
+        remove_cache(directory, cache_filename)
+    return df, new_cache_filename
+
+
+def remove_cache(directory, cache_filename):
+    if not cache_filename:
+        return
+    cache_path = os.path.join(directory, cache_filename)
+    if os.path.exists(cache_path):
+        os.remove(cache_path)
+
+
+def read_header(file_path, sample_rows=HEADER_SAMPLE_ROWS):
+    # 앞부분 몇 행만 읽어 pd.read_excel과 같은 컬럼명 목록과 데이터 행 존재 여부를 구합니다.
+    # .xlsx는 openpyxl 읽기 전용 모드로 스트리밍하므로 시트 크기와 무관하게 메모리를 적게 씁니다.
+    if os.path.splitext(file_path)[1].lower() not in ('.xlsx', '.xlsm'):
+        df = pd.read_excel(file_path, nrows=sample_rows)
+        return [str(col) for col in df.columns], not df.empty
+
+    wb = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        ws = wb.worksheets[0]
+        ws.reset_dimensions()
+        rows = []
+        for row in ws.iter_rows(max_row=sample_rows + 1, values_only=True):
+            row = list(row)
+            while row and row[-1] in (None, ''):
+                row.pop()
+            rows.append(row)
+    finally:
+        wb.close()
+    if not rows:
+        return [], False
+
+    width = max(len(row) for row in rows)
+    header = rows[0] + [None] * (width - len(rows[0]))
+    columns = []
+    for i, value in enumerate(header):
+        name = f'Unnamed: {i}' if value in (None, '') else str(value)
+        # 중복 컬럼명은 pandas처럼 .1, .2를 붙입니다.
+        base, count = name, 0
+        while name in columns:
+            count += 1
+            name = f'{base}.{count}'
+        columns.append(name)
+    # pandas처럼 첫 행은 비어 있어도 헤더로 쓰고, 이후 빈 행은 데이터로 치지 않습니다.
+    return columns, any(rows[1:])
+
+
+def ingest_excel(file_path, directory):
+    # 업로드한 엑셀의 원본 바이트를 그대로 복사하고 컬럼 목록만 읽습니다.
+    # 전체 파싱(컬럼형 캐시 생성)은 build_cache에서 따로 합니다.
+    columns, has_data = read_header(file_path)
+    if not has_data:
+        raise ValueError('파일에 데이터가 없습니다.')
+    original_filename = os.path.basename(file_path)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S_%f')
+    saved_filename = f"{timestamp}_{original_filename}"
+    shutil.copyfile(file_path, os.path.join(directory, saved_filename))
+    return {
+        'filename': saved_filename,
+        'original_filename': original_filename,
+        'columns': columns,
+        'cache_filename': None,
+    }
+
+
+def build_cache(directory, filename):
+    # 저장된 엑셀 전체를 읽어 컬럼형 캐시를 만들고 캐시 파일명을 돌려줍니다.
+    # 작업 프로세스에서 실행되므로 DataFrame은 돌려주지 않습니다.
+    df = pd.read_excel(os.path.join(directory, filename))
+    return write_cache(df, directory, filename)
+
+
+def remove_ingested(directory, info):
+    # 취소된 업로드가 남긴 원본/캐시 파일 정리
+    for name in (info.get('filename'), info.get('cache_filename')):
+        remove_cache(directory, name)
+
@@ -0,0 +1,162 @@
+from collections import OrderedDict
+import numpy as np
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+# 컬럼 너비 추정에 사용할 표본 행 수와 너비 범위(px)
+WIDTH_SAMPLE_ROWS = 100
+MIN_COLUMN_WIDTH = 60
+MAX_COLUMN_WIDTH = 300
+COLUMN_PADDING = 24
+# SQLite 모델이 한 번에 읽는 행 수와 메모리에 유지하는 페이지 수
+SQL_PAGE_ROWS = 200
+SQL_CACHED_PAGES = 20
+
+
+class DataFrameModel(QAbstractTableModel):
+    # DataFrame의 컬럼 배열을 그대로 참조하는 테이블 모델
+    # 셀 문자열은 화면에 보이는 셀에 대해서만 data()에서 만들어집니다.
+    # rows에 원본 행 위치 배열을 주면 복사 없이 필터링된 결과를 보여줍니다.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._df = None
+        self._headers = []
+        self._arrays = []
+        self._rows = None
+
+    def set_frame(self, df, rows=None):
+        self.beginResetModel()
+        self._df = df
+        if df is None:
+            self._headers = []
+            self._arrays = []
+        else:
+            self._headers = [str(col) for col in df.columns]
+            self._arrays = [df.iloc[:, j].array for j in range(df.shape[1])]
+        self._rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+        self.endResetModel()
+
+    def set_rows(self, rows=None):
+        # 같은 DataFrame에서 보여줄 행만 바꿉니다.
+        self.beginResetModel()
+        self._rows = None if rows is None else np.asarray(rows, dtype=np.intp)
+        self.endResetModel()
+
+    def frame(self):
+        return self._df
+
+    def visible_rows(self):
+        return self._rows
+
+    def source_row(self, row):
+        return row if self._rows is None else int(self._rows[row])
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._df is None:
+            return 0
+        return len(self._df) if self._rows is None else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._headers)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        return str(self._arrays[index.column()][self.source_row(index.row())])
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            return self._headers[section] if section < len(self._headers) else QVariant()
+        return str(section + 1)
+
+    def sample_rows(self, sample_size):
+        return sample_positions(self.rowCount(), sample_size)
+
+
+class SqlTableModel(QAbstractTableModel):
+    # SQLite에 행 단위로 저장된 파일을 보여주는 모델
+    # 보이는 행이 속한 페이지만 SQL로 읽고, 최근 페이지 몇 개만 캐시합니다.
+    # row_ids에 조건에 맞는 행 키 배열을 주면 그 행들만 보여줍니다.
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._table = None
+        self._row_ids = None
+        self._pages = OrderedDict()
+
+    def set_table(self, table, row_ids=None):
+        self.beginResetModel()
+        self._table = table
+        self._row_ids = row_ids
+        self._pages.clear()
+        self.endResetModel()
+
+    def set_rows(self, row_ids=None):
+        self.set_table(self._table, row_ids)
+
+    def visible_row_ids(self):
+        return self._row_ids
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._table is None:
+            return 0
+        return self._table.row_count if self._row_ids is None else len(self._row_ids)
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid() or self._table is None:
+            return 0
+        return len(self._table.columns)
+
+    def _page(self, number):
+        page = self._pages.get(number)
+        if page is None:
+            start = number * SQL_PAGE_ROWS
+            stop = min(start + SQL_PAGE_ROWS, self.rowCount())
+            page = self._table.fetch_page(self._row_ids, start, stop)
+            self._pages[number] = page
+            if len(self._pages) > SQL_CACHED_PAGES:
+                self._pages.popitem(last=False)
+        else:
+            self._pages.move_to_end(number)
+        return page
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or role != Qt.DisplayRole:
+            return QVariant()
+        row = index.row()
+        value = self._page(row // SQL_PAGE_ROWS)[row % SQL_PAGE_ROWS][index.column()]
+        return '' if value is None else str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return QVariant()
+        if orientation == Qt.Horizontal:
+            if self._table is None or section >= len(self._table.columns):
+                return QVariant()
+            return self._table.columns[section]
+        return str(section + 1)
+
+    def sample_rows(self, sample_size):
+        # 페이지를 여러 번 읽지 않도록 앞쪽 행만 표본으로 씁니다.
+        return np.arange(min(self.rowCount(), sample_size, SQL_PAGE_ROWS))
+
+
+def sample_positions(row_count, sample_size=WIDTH_SAMPLE_ROWS):
+    # 전체 행에서 고르게 표본 행 위치를 뽑습니다.
+    if row_count <= sample_size:
+        return np.arange(row_count)
+    return np.unique(np.linspace(0, row_count - 1, sample_size).astype(np.intp))
+
+
+def estimate_column_widths(model, font_metrics, sample_size=WIDTH_SAMPLE_ROWS):
+    # resizeColumnsToContents 대신 표본 행만 측정해 컬럼 너비를 정합니다.
+    positions = model.sample_rows(sample_size)
+    widths = []
+    for col in range(model.columnCount()):
+        texts = [model.headerData(col, Qt.Horizontal)]
+        texts += [model.data(model.index(row, col)) for row in positions]
+        width = max(font_metrics.horizontalAdvance(text) for text in texts) + COLUMN_PADDING
+        widths.append(min(max(width, MIN_COLUMN_WIDTH), MAX_COLUMN_WIDTH))
+    return widths
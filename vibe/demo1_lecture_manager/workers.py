@@ -0,0 +1,149 @@
+import threading
+import traceback
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskCancelled(Exception):
+    pass
+
+
+class WorkerSignals(QObject):
+    # 작업 스레드에서 GUI 스레드로 결과를 전달하는 시그널
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+    done = pyqtSignal()
+
+
+class Task(QRunnable):
+    # fn(task, *args)는 작업 스레드에서 실행됩니다.
+    # 긴 작업 중간중간 task.report()로 진행률을 알리고 task.check_cancelled()로 취소를 확인합니다.
+    def __init__(self, key, fn, *args):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.signals = WorkerSignals()
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._finished = False
+
+    def cancel(self):
+        with self._lock:
+            self._cancelled = True
+
+    def resume(self):
+        # 아직 끝나지 않은 작업의 취소를 철회합니다. 이미 끝났으면 False
+        with self._lock:
+            if self._finished:
+                return False
+            self._cancelled = False
+            return True
+
+    def is_cancelled(self):
+        with self._lock:
+            return self._cancelled
+
+    def check_cancelled(self):
+        with self._lock:
+            if self._cancelled:
+                self._finished = True
+                raise TaskCancelled()
+
+    def report(self, percent, message=''):
+        self.check_cancelled()
+        self.signals.progress.emit(percent, message)
+
+    def run(self):
+        try:
+            result = self.fn(self, *self.args)
+            self.check_cancelled()
+            with self._lock:
+                self._finished = True
+            self.signals.finished.emit(result)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            with self._lock:
+                self._finished = True
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        finally:
+            self.signals.done.emit()
+
+
+class TaskRunner(QObject):
+    # 키별로 실행 중인 작업을 관리하는 QThreadPool 래퍼
+    # 같은 키의 작업은 동시에 하나만 실행됩니다.
+    def __init__(self, parent=None, max_threads=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self.tasks = {}
+
+    def submit(self, key, fn, *args, on_finished=None, on_failed=None,
+               on_progress=None, on_cancelled=None, on_done=None):
+        running = self.tasks.get(key)
+        if running is not None and running.resume():
+            return running
+        task = Task(key, fn, *args)
+        if on_finished:
+            task.signals.finished.connect(on_finished)
+        if on_failed:
+            task.signals.failed.connect(on_failed)
+        if on_progress:
+            task.signals.progress.connect(on_progress)
+        if on_cancelled:
+            task.signals.cancelled.connect(on_cancelled)
+        task.signals.done.connect(lambda: self._on_done(task))
+        if on_done:
+            # _on_done 다음에 호출되므로 running_count()에 이 작업은 빠져 있습니다.
+            task.signals.done.connect(on_done)
+        self.tasks[key] = task
+        self.pool.start(task)
+        return task
+
+    def _on_done(self, task):
+        if self.tasks.get(task.key) is task:
+            del self.tasks[task.key]
+
+    def is_running(self, key):
+        return key in self.tasks
+
+    def running_count(self, kind=None):
+        return sum(1 for key in self.tasks if kind is None or key[0] == kind)
+
+    def cancel(self, key):
+        task = self.tasks.get(key)
+        if task is not None:
+            task.cancel()
+
+    def cancel_kind(self, kind, keep=None):
+        # key[0]이 kind인 작업을 모두 취소합니다. (keep 키는 제외)
+        for key, task in self.tasks.items():
+            if key[0] == kind and key != keep:
+                task.cancel()
+
+    def cancel_all(self):
+        for task in self.tasks.values():
+            task.cancel()
+
+
+def wait_future(task, future, on_abandoned=None, poll_interval=0.1):
+    # 다른 프로세스에서 실행 중인 future를 기다리면서 취소 요청을 확인합니다.
+    # 이미 실행 중이라 멈출 수 없는 future는 끝난 뒤 on_abandoned(결과)로 정리합니다.
+    while True:
+        try:
+            return future.result(timeout=poll_interval)
+        except FutureTimeoutError:
+            try:
+                task.check_cancelled()
+            except TaskCancelled:
+                if not future.cancel() and on_abandoned is not None:
+                    future.add_done_callback(
+                        lambda f: f.exception() is None and on_abandoned(f.result()))
+                raise
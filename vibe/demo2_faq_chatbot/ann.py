@@ -0,0 +1,230 @@
+import argparse
+import time
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.preprocessing import normalize
+
+# 아주 큰 FAQ용 근사 최근접 이웃(ANN) 검색
+# 1) TF-IDF 행렬을 TruncatedSVD(LSA)로 DIMENSIONS차원 float32 벡터로 줄이고
+# 2) k-means 중심(IVF 리스트)으로 나눠 리스트별로 벡터를 연속해서 저장합니다.
+# 3) 질문과 가까운 n_probe개 리스트만 훑어 후보를 고르고, 상위 rerank개를 원래 TF-IDF로
+#    정확히 다시 점수 매깁니다. (점수는 정확 검색과 같은 코사인 유사도)
+# n_probe/rerank를 늘리면 정확도(recall)가 오르고 느려집니다.
+DIMENSIONS = 128
+N_PROBE = 8
+RERANK = 50
+# SVD와 k-means는 이 만큼의 표본 행으로 학습합니다.
+SVD_SAMPLE_ROWS = 50000
+KMEANS_SAMPLE_ROWS = 100000
+KMEANS_ITERATIONS = 10
+# 중심까지의 거리를 한 번에 계산하는 행 수 (메모리 사용량 조절)
+ASSIGN_BATCH_ROWS = 65536
+
+
+def _sample(n, size, rng):
+    return np.arange(n) if n <= size else np.sort(rng.choice(n, size, replace=False))
+
+
+class IVFIndex:
+    # build()로 만들고 candidates()로 후보 행(빌드 당시 행 위치)을 찾습니다.
+    def __init__(self, components, centroids, offsets, rows, vectors):
+        self.components = components
+        self.centroids = centroids
+        self.offsets = offsets
+        self.rows = rows
+        self.vectors = vectors
+
+    @classmethod
+    def build(cls, matrix, dimensions=DIMENSIONS, n_lists=None, random_state=0, check_cancelled=None):
+        # matrix: 행마다 L2 정규화된 TF-IDF (희소, 행 수 x 어휘 수)
+        rng = np.random.default_rng(random_state)
+        n = matrix.shape[0]
+        dimensions = max(1, min(dimensions, matrix.shape[1] - 1, n - 1))
+        svd = TruncatedSVD(n_components=dimensions, random_state=random_state)
+        svd.fit(matrix[_sample(n, SVD_SAMPLE_ROWS, rng)])
+        # (어휘 수 x 차원) 배열로 연속 저장해 질문마다 복사 없이 곱합니다.
+        components = np.ascontiguousarray(svd.components_.T, dtype=np.float32)
+        vectors = cls._project(matrix, components)
+        if check_cancelled is not None:
+            check_cancelled()
+        n_lists = n_lists or max(1, min(4096, int(np.sqrt(n))))
+        centroids = _kmeans(vectors[_sample(n, KMEANS_SAMPLE_ROWS, rng)], n_lists, rng)
+        assign = _assign(vectors, centroids)
+        # 같은 리스트의 벡터를 연속해서 저장합니다. (리스트 하나 = 슬라이스 하나)
+        rows = np.argsort(assign, kind='stable').astype(np.int64)
+        offsets = np.zeros(len(centroids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(assign, minlength=len(centroids)), out=offsets[1:])
+        return cls(components, centroids, offsets, rows, np.ascontiguousarray(vectors[rows]))
+
+    @staticmethod
+    def _project(matrix, components):
+        # 희소 행렬 쪽을 float32로 바꿔야 components가 float64로 통째로 복사되지 않습니다.
+        dense = np.asarray(matrix.astype(np.float32) @ components)
+        return normalize(dense, norm='l2', copy=False)
+
+    def candidates(self, query, n_probe=N_PROBE, limit=RERANK):
+        # query: 정규화된 TF-IDF 한 행. 가까운 리스트 n_probe개에서 근사 점수 상위 limit개 행 위치
+        # 빌드 뒤에 늘어난 어휘의 열은 빌드한 행에 없으므로 떼고 봅니다.
+        q = self._project(query[:, :len(self.components)], self.components)[0]
+        n_probe = min(n_probe, len(self.centroids))
+        lists = np.argpartition(-(self.centroids @ q), n_probe - 1)[:n_probe]
+        rows, scores = [], []
+        for lst in lists:
+            start, end = self.offsets[lst], self.offsets[lst + 1]
+            if start < end:
+                rows.append(self.rows[start:end])
+                scores.append(self.vectors[start:end] @ q)
+        if not rows:
+            return np.empty(0, dtype=np.int64)
+        rows = np.concatenate(rows)
+        scores = np.concatenate(scores)
+        if len(rows) > limit:
+            rows = rows[np.argpartition(-scores, limit - 1)[:limit]]
+        return rows
+
+    def memory_bytes(self):
+        parts = {
+            'vectors': self.vectors.nbytes,
+            'svd_components': self.components.nbytes,
+            'centroids': self.centroids.nbytes,
+            'lists': self.offsets.nbytes + self.rows.nbytes,
+        }
+        parts['total'] = sum(parts.values())
+        return parts
+
+
+def _assign(vectors, centroids):
+    # 각 벡터에서 가장 가까운(내적이 가장 큰) 중심 번호
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), ASSIGN_BATCH_ROWS):
+        block = vectors[start:start + ASSIGN_BATCH_ROWS]
+        assign[start:start + len(block)] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+def _kmeans(sample, n_lists, rng):
+    # 구면 k-means (정규화된 벡터, 내적 기준)
+    n_lists = min(n_lists, len(sample))
+    centroids = sample[rng.choice(len(sample), n_lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assign = _assign(sample, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, sample)
+        empty = np.bincount(assign, minlength=n_lists) == 0
+        # 빈 리스트는 임의의 표본으로 다시 시작합니다.
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        centroids = normalize(sums, norm='l2', copy=False).astype(np.float32)
+    return centroids
+
+
+class ANNRetriever:
+    # FAQRetriever와 같은 search() 인터페이스. 빌드 이후 추가/수정된 행(delta)은 정확히 계산하고,
+    # 삭제되거나 수정된 빌드 행은 후보에서 뺍니다.
+    # ivf_ids: 빌드 당시 행 위치 -> faq id, positions: 현재 faq id -> 현재 행 위치
+    def __init__(self, exact, ivf, ivf_ids, positions, stale_ids, delta_positions,
+                 n_probe=N_PROBE, rerank=RERANK):
+        self.exact = exact
+        self.vectorizer = exact.vectorizer
+        self.ivf = ivf
+        self.ivf_ids = ivf_ids
+        self.positions = positions
+        self.stale_ids = stale_ids
+        self.delta_positions = np.asarray(delta_positions, dtype=np.int64)
+        self.n_probe = n_probe
+        self.rerank = rerank
+
+    def __len__(self):
+        return len(self.exact)
+
+    def search(self, queries, k=5):
+        query_matrix = normalize(self.vectorizer.transform(queries), norm='l2')
+        results = []
+        for i in range(query_matrix.shape[0]):
+            query = query_matrix[i]
+            found = []
+            for row in self.ivf.candidates(query, self.n_probe, max(self.rerank, k)):
+                faq_id = self.ivf_ids[row]
+                if faq_id not in self.stale_ids:
+                    pos = self.positions.get(faq_id)
+                    if pos is not None:
+                        found.append(pos)
+            positions = np.unique(np.concatenate([np.asarray(found, dtype=np.int64), self.delta_positions]))
+            if len(positions) == 0:
+                results.append([])
+                continue
+            scores = np.asarray((self.exact.matrix[positions] @ query.T).todense()).ravel()
+            keep = scores > 0
+            positions, scores = positions[keep], scores[keep]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+                positions, scores = positions[top], scores[top]
+            order = np.lexsort((positions, -scores))
+            results.append([(int(positions[j]), float(scores[j])) for j in order])
+        return results
+
+
+def sparse_bytes(matrix):
+    return matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+
+
+def evaluate(exact, ann, queries, k=5):
+    # 정확 검색 대비 recall@k와 질문당 평균 검색 시간(ms)
+    # 정확 검색의 k번째 점수 이상인 결과는 맞은 것으로 봅니다. (점수가 같은 질문이 여러 개일 때)
+    start = time.perf_counter()
+    truth = [exact.search([q], k=k)[0] for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    start = time.perf_counter()
+    approx = [ann.search([q], k=k)[0] for q in queries]
+    ann_ms = (time.perf_counter() - start) * 1000 / len(queries)
+    hits = total = 0
+    for t, a in zip(truth, approx):
+        if not t:
+            continue
+        kth = t[-1][1] - 1e-6
+        hits += min(len(t), sum(1 for _, score in a if score >= kth))
+        total += len(t)
+    return {'recall': round(hits / total, 4) if total else 1.0,
+            'exact_ms': round(exact_ms, 3), 'ann_ms': round(ann_ms, 3)}
+
+
+def main():
+    # 현재 FAQ DB로 ANN 인덱스를 만들어 n_probe별 recall/속도와 메모리를 보여줍니다.
+    #   python ann.py --queries 200 --probe 1,2,4,8,16
+    from engine import DB_PATH, FAQEngine
+    parser = argparse.ArgumentParser(description='ANN 인덱스 recall/속도/메모리 확인')
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--probe', default='1,2,4,8,16')
+    parser.add_argument('--rerank', type=int, default=RERANK)
+    parser.add_argument('--k', type=int, default=5)
+    args = parser.parse_args()
+
+    engine = FAQEngine(args.db, log_history=False, ann='off')
+    engine.load()
+    snapshot = engine.faq.snapshot
+    exact = snapshot.retriever
+    print(f'FAQ {len(snapshot.ids):,}개, TF-IDF 행렬 {sparse_bytes(exact.matrix) / 2**20:.1f} MiB')
+    start = time.perf_counter()
+    ivf = IVFIndex.build(exact.matrix)
+    print(f'ANN 인덱스 생성 {time.perf_counter() - start:.1f}초, 리스트 {len(ivf.centroids)}개')
+    for name, size in ivf.memory_bytes().items():
+        print(f'  {name}: {size / 2**20:.1f} MiB')
+    rng = np.random.default_rng(1)
+    picks = rng.choice(len(snapshot.ids), min(args.queries, len(snapshot.ids)), replace=False)
+    # FAQ 질문에서 첫 단어를 뺀 것을 질문으로 씁니다. (그대로 쓰면 자기 자신만 찾는 쉬운 문제가 됨)
+    queries = []
+    for i in picks:
+        words = snapshot.questions[i].split()
+        queries.append(' '.join(words[1:] if len(words) > 2 else words))
+    positions = {faq_id: pos for pos, faq_id in enumerate(snapshot.ids)}
+    for n_probe in (int(p) for p in args.probe.split(',')):
+        ann = ANNRetriever(exact, ivf, snapshot.ids, positions, set(), [], n_probe=n_probe, rerank=args.rerank)
+        top1 = evaluate(exact, ann, queries, k=1)
+        result = evaluate(exact, ann, queries, k=args.k)
+        print(f"n_probe={n_probe:>3}: recall@1={top1['recall']:.3f}  recall@{args.k}={result['recall']:.3f}  "
+              f"정확 {result['exact_ms']:.2f}ms  ANN {result['ann_ms']:.2f}ms")
+    engine.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+# 같은 질문이 반복되면 검색하지 않고 이전 답변을 그대로 돌려주는 캐시 (LRU + TTL)
+# 항목마다 만들 때의 인덱스 버전을 같이 저장해서, FAQ나 인덱스가 바뀌면 자동으로 무효가 됩니다.
+CACHE_SIZE = 1024
+CACHE_TTL_SECONDS = 600
+
+PUNCT_RE = re.compile(r'[^\w\s]+')
+SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_question(text):
+    # 공백, 대소문자, 문장부호 차이를 없앤 캐시 키 ("파이썬이란?" == " 파이썬이란 ")
+    text = unicodedata.normalize('NFKC', text).lower()
+    return SPACE_RE.sub(' ', PUNCT_RE.sub(' ', text)).strip()
+
+
+class AnswerCache:
+    # 여러 스레드(HTTP 서버)에서 함께 쓰므로 잠금 안에서만 고칩니다.
+    def __init__(self, maxsize=CACHE_SIZE, ttl=CACHE_TTL_SECONDS):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.stale = 0
+
+    def get(self, key, version):
+        now = time.monotonic()
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            item_version, expires, value = item
+            if item_version != version or expires < now:
+                # 인덱스가 바뀌었거나 오래된 항목
+                del self._items[key]
+                if item_version != version:
+                    self.stale += 1
+                else:
+                    self.expired += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, version, value):
+        with self._lock:
+            self._items[key] = (version, time.monotonic() + self.ttl, value)
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'size': len(self._items),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / total, 3) if total else 0.0,
+                'expired': self.expired,
+                'stale': self.stale,
+            }
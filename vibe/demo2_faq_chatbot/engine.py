@@ -0,0 +1,174 @@
+import os
+import sqlite3
+from answer_cache import AnswerCache, normalize_question
+from faq_import import import_faq, migrate_faq
+from history_store import migrate_history
+from history_writer import HistoryWriter
+from tokenizer import DEFAULT_TOKENIZER, SIMILARITY_THRESHOLDS, get_analyzer
+
+# GUI 없이 FAQ 답변을 찾는 엔진. Tk 앱(main.py)과 HTTP 서버(server.py)가 함께 씁니다.
+# scikit-learn/scipy(faq_index)는 엔진을 만들 때 불러오므로, 이 모듈만 import 하는 것은 가볍습니다.
+# (Tk 앱은 창을 먼저 띄우고 작업 스레드에서 엔진을 만듭니다)
+DB_PATH = 'faq_chatbot.db'
+FAQ_DUMMY = 'faq_dummy.csv'
+# 함께 찾을 후보 질문 수 (답변으로 인정하는 최소 유사도는 토크나이저마다 다름: tokenizer.py)
+TOP_K = 3
+# 질문을 토큰으로 나누는 방식 (tokenizer.py의 TOKENIZERS 중 하나)
+TOKENIZER = DEFAULT_TOKENIZER
+# 근사 검색(ANN) 사용 방식: 'off', 'on', 'auto'(FAQ가 ANN_MIN_ROWS개 이상일 때만) (faq_index.py의 ANN_MODES)
+# 근사 검색은 가장 비슷한 질문을 놓칠 수 있으므로 ann.py로 정확도를 확인한 뒤에 켭니다.
+ANN_MODE = 'off'
+NO_ANSWER = '죄송합니다. 해당 질문에 대한 답변을 찾지 못했습니다.'
+
+
+def init_db(db_path=DB_PATH):
+    conn = sqlite3.connect(db_path)
+    c = conn.cursor()
+    # FAQ 테이블
+    c.execute('''CREATE TABLE IF NOT EXISTS faq (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        question TEXT,
+        answer TEXT
+    )''')
+    # 답변 이력 테이블
+    c.execute('''CREATE TABLE IF NOT EXISTS history (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_question TEXT,
+        matched_question TEXT,
+        answer TEXT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )''')
+    # 이력 조회용 인덱스와 검색(FTS5) 테이블
+    migrate_history(conn)
+    # FAQ 변경 내역 테이블/트리거와 중복 검사용 질문 해시
+    # (변경 내역은 엔진이 주기적으로 읽어 인덱스에 반영하므로 DB를 직접 고쳐도 재시작 없이 반영됩니다)
+    migrate_faq(conn)
+    conn.commit()
+    # FAQ 더미데이터 자동 입력 (대량 가져오기와 같은 경로)
+    c.execute('SELECT COUNT(*) FROM faq')
+    empty = c.fetchone()[0] == 0
+    conn.close()
+    if empty and os.path.exists(FAQ_DUMMY):
+        import_faq(db_path, FAQ_DUMMY)
+
+
+class FAQEngine:
+    # FAQ 인덱스, 변경 내역 반영, 답변 찾기, 답변 이력 저장을 묶은 객체
+    # answer()는 여러 스레드에서 동시에 불러도 되고, load/sync_changes/close는 한 스레드에서 부릅니다.
+    def __init__(self, db_path=DB_PATH, tokenizer=TOKENIZER, log_history=True, ann=ANN_MODE):
+        self.db_path = db_path
+        self.tokenizer = tokenizer
+        from faq_index import FAQIndex
+        self.faq = FAQIndex(self.make_vectorizer, model_tag=tokenizer, threshold=SIMILARITY_THRESHOLDS[tokenizer],
+                            ann=ann)
+        self.history = HistoryWriter(db_path) if log_history else None
+        self.cache = AnswerCache()
+        self.change_seq = 0
+
+    def make_vectorizer(self):
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(analyzer=get_analyzer(self.tokenizer))
+
+    def load(self):
+        # DB에서 FAQ 전체 불러오기 (이 시점까지의 변경 내역은 이미 반영된 것이므로 지웁니다)
+        conn = sqlite3.connect(self.db_path)
+        self.change_seq = conn.execute('SELECT COALESCE(MAX(seq), 0) FROM faq_changes').fetchone()[0]
+        conn.execute('DELETE FROM faq_changes WHERE seq <= ?', (self.change_seq,))
+        conn.commit()
+        conn.close()
+        # TF-IDF 벡터화: FAQ 내용이 그대로면 저장된 모델을 쓰고, 바뀌었을 때만 다시 학습합니다.
+        self.faq.load(*self.read_faq())
+
+    def read_faq(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute('SELECT id, question, answer FROM faq ORDER BY id').fetchall()
+        finally:
+            conn.close()
+        return [row[0] for row in rows], [row[1] or '' for row in rows], [row[2] or '' for row in rows]
+
+    def sync_changes(self):
+        # 새 변경 내역을 FAQ 하나 단위로 인덱스에 반영하고, 끝난 재학습 결과를 적용합니다.
+        # 인덱스가 바뀌면 답변 캐시를 비웁니다. (남은 항목도 버전이 달라 쓰이지 않음)
+        version = self.faq.snapshot.version
+        conn = sqlite3.connect(self.db_path)
+        rows = conn.execute('''SELECT c.seq, c.faq_id, f.id, f.question, f.answer
+            FROM faq_changes c LEFT JOIN faq f ON f.id = c.faq_id
+            WHERE c.seq > ? ORDER BY c.seq''', (self.change_seq,)).fetchall()
+        conn.close()
+        latest = {}
+        reload = False
+        for seq, faq_id, found, question, answer in rows:
+            self.change_seq = seq
+            if faq_id is None:
+                # 대량 가져오기: 행 단위로 반영하지 않고 전체를 백그라운드에서 한 번 다시 만듭니다.
+                reload = True
+            else:
+                latest[faq_id] = (question, answer) if found is not None else None
+        if reload:
+            self.faq.start_refit(load=self.read_faq)
+            latest = {}
+        for faq_id, row in latest.items():
+            if row is None:
+                self.faq.delete(faq_id)
+            else:
+                self.faq.upsert(faq_id, row[0] or '', row[1] or '')
+        self.faq.poll()
+        if self.faq.snapshot.version != version:
+            self.cache.clear()
+
+    def answer(self, question, k=TOP_K, log=True):
+        # 질문에 대한 답변과 관련 질문 후보를 dict로 돌려줍니다.
+        # 같은 질문(정규화 기준)은 인덱스가 그대로인 동안 캐시에서 바로 돌려줍니다.
+        snapshot = self.faq.snapshot
+        key = (normalize_question(question), k)
+        result = self.cache.get(key, snapshot.version)
+        cached = result is not None
+        if not cached:
+            result = self._search(question, k, snapshot)
+            self.cache.put(key, snapshot.version, result)
+        if log and self.history is not None:
+            self.history.log(question, result['matched_question'], result['answer'])
+        return dict(result, cached=cached)
+
+    def _search(self, question, k, snapshot):
+        candidates = [(idx, score) for idx, score in self.faq.search(question, k=k, snapshot=snapshot)
+                      if score > self.faq.threshold]
+        if candidates:
+            best_idx, best_score = candidates[0]
+            result = {
+                'found': True,
+                'answer': snapshot.answers[best_idx],
+                'matched_question': snapshot.questions[best_idx],
+                'faq_id': snapshot.ids[best_idx],
+                'score': best_score,
+                'related': [{'question': snapshot.questions[idx], 'faq_id': snapshot.ids[idx], 'score': score}
+                            for idx, score in candidates[1:]],
+            }
+        else:
+            result = {'found': False, 'answer': NO_ANSWER, 'matched_question': '',
+                      'faq_id': None, 'score': 0.0, 'related': []}
+        return result
+
+    def diagnostics(self):
+        # 진단 화면/서버 /stats에 보여줄 인덱스와 캐시 상태
+        faq = self.faq
+        return {
+            'faq_count': len(faq.snapshot.ids),
+            'index_version': faq.snapshot.version,
+            'vocabulary_size': len(faq.vectorizer.vocabulary_) if faq.snapshot.ids else 0,
+            'drift': round(faq.drift(), 3) if faq.snapshot.ids else 0.0,
+            'refit_running': faq.refitting(),
+            'ann': faq.ann_status(),
+            'cache': self.cache.stats(),
+        }
+
+    def flush_history(self):
+        if self.history is not None:
+            self.history.flush()
+
+    def close(self):
+        # 큐에 남은 답변 이력을 모두 저장하고, 증분 변경된 인덱스를 저장합니다.
+        if self.history is not None:
+            self.history.close()
+        self.faq.close()
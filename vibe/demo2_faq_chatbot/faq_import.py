@@ -0,0 +1,170 @@
+import argparse
+import csv
+import hashlib
+import os
+import sqlite3
+import sys
+from answer_cache import normalize_question
+
+# FAQ 대량 가져오기 (CSV/엑셀)
+# - 파일을 IMPORT_CHUNK_ROWS 행씩 읽어 한 트랜잭션 안에서 executemany로 넣습니다.
+# - 정규화한 질문의 해시(question_hash)에 UNIQUE 인덱스를 두고 INSERT OR IGNORE로 중복을 건너뜁니다.
+#   (FAQ 편집 화면도 해시를 같이 저장합니다. DB를 직접 고친 행은 해시가 NULL이라 중복 검사에서 빠집니다)
+# - 가져오는 동안에는 행 단위 변경 내역 트리거를 끄고, 끝나면 "전체 다시 읽기" 표시 하나만 남깁니다.
+#   (엔진은 이것을 보고 인덱스를 한 번만 백그라운드에서 다시 만듭니다)
+IMPORT_CHUNK_ROWS = 10000
+QUESTION_COLUMNS = ('질문', 'question')
+ANSWER_COLUMNS = ('답변', 'answer')
+IMPORT_PRAGMAS = (
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA temp_store=MEMORY',
+    'PRAGMA cache_size=-65536',
+)
+# faq 테이블 변경을 faq_changes에 기록하는 트리거 (faq_id가 NULL인 기록 = 전체 다시 읽기)
+FAQ_TRIGGERS = {
+    'faq_after_insert': '''CREATE TRIGGER IF NOT EXISTS faq_after_insert AFTER INSERT ON faq
+        BEGIN INSERT INTO faq_changes (faq_id) VALUES (NEW.id); END''',
+    'faq_after_update': '''CREATE TRIGGER IF NOT EXISTS faq_after_update AFTER UPDATE ON faq
+        BEGIN INSERT INTO faq_changes (faq_id) VALUES (OLD.id);
+              INSERT INTO faq_changes (faq_id) SELECT NEW.id WHERE NEW.id != OLD.id; END''',
+    'faq_after_delete': '''CREATE TRIGGER IF NOT EXISTS faq_after_delete AFTER DELETE ON faq
+        BEGIN INSERT INTO faq_changes (faq_id) VALUES (OLD.id); END''',
+}
+
+
+def question_hash(question):
+    # 공백/대소문자/문장부호를 무시한 질문의 해시 (중복 판단용)
+    normalized = normalize_question(question or '')
+    return hashlib.blake2b(normalized.encode('utf-8'), digest_size=8).hexdigest()
+
+
+def migrate_faq(conn):
+    # init_db에서 호출: 변경 내역 테이블/트리거, 질문 해시 컬럼과 UNIQUE 인덱스를 만듭니다.
+    c = conn.cursor()
+    c.execute('''CREATE TABLE IF NOT EXISTS faq_changes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        faq_id INTEGER
+    )''')
+    columns = [row[1] for row in c.execute('PRAGMA table_info(faq)')]
+    if 'question_hash' not in columns:
+        c.execute('ALTER TABLE faq ADD COLUMN question_hash TEXT')
+        # 기존 행의 해시를 채웁니다. 이미 중복된 질문은 첫 행만 해시를 갖고 나머지는 NULL로 둡니다.
+        seen = set()
+        updates = []
+        for faq_id, question in c.execute('SELECT id, question FROM faq ORDER BY id').fetchall():
+            h = question_hash(question)
+            if h not in seen:
+                seen.add(h)
+                updates.append((h, faq_id))
+        c.executemany('UPDATE faq SET question_hash = ? WHERE id = ?', updates)
+    c.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_faq_question_hash ON faq (question_hash)')
+    for sql in FAQ_TRIGGERS.values():
+        c.execute(sql)
+
+
+def _find_column(header, names, default):
+    lowered = [str(h or '').strip().lower() for h in header]
+    for name in names:
+        if name in lowered:
+            return lowered.index(name)
+    return default
+
+
+def _split_rows(rows):
+    # 첫 행(헤더)에서 질문/답변 컬럼을 찾고 (질문, 답변)을 하나씩 돌려줍니다.
+    # 컬럼 이름이 없으면 첫 번째 = 질문, 두 번째 = 답변으로 봅니다.
+    header = next(rows, None)
+    if header is None:
+        return
+    q_col = _find_column(header, QUESTION_COLUMNS, 0)
+    a_col = _find_column(header, ANSWER_COLUMNS, 1)
+    answer_is_last = a_col == len(header) - 1
+    for row in rows:
+        if len(row) <= max(q_col, a_col):
+            continue
+        question = str(row[q_col] or '').strip()
+        # 답변이 마지막 컬럼인데 따옴표 없이 쉼표가 들어가 칸이 늘어난 행은 뒤쪽 칸을 답변에 합칩니다.
+        if answer_is_last and len(row) > len(header):
+            answer = ','.join(str(v or '') for v in row[a_col:]).strip()
+        else:
+            answer = str(row[a_col] or '').strip()
+        if question and answer:
+            yield question, answer
+
+
+def iter_faq_file(path):
+    # CSV(utf-8, BOM 허용) 또는 엑셀 첫 시트를 스트리밍으로 읽습니다.
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        from openpyxl import load_workbook
+        wb = load_workbook(path, read_only=True, data_only=True)
+        try:
+            yield from _split_rows(wb.worksheets[0].iter_rows(values_only=True))
+        finally:
+            wb.close()
+        return
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        yield from _split_rows(csv.reader(f))
+
+
+def import_faq(db_path, path, progress=None):
+    # FAQ 파일을 가져와 {'read': 읽은 행, 'inserted': 추가, 'skipped': 중복으로 건너뜀}을 돌려줍니다.
+    # progress(읽은 행 수)는 청크마다 호출됩니다. 실패하면 전부 되돌립니다.
+    conn = sqlite3.connect(db_path, isolation_level=None)
+    for pragma in IMPORT_PRAGMAS:
+        conn.execute(pragma)
+    read = inserted = 0
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        # 행마다 변경 내역 트리거가 돌지 않도록 트랜잭션 안에서 잠시 지웁니다.
+        for name in FAQ_TRIGGERS:
+            conn.execute(f'DROP TRIGGER IF EXISTS {name}')
+        before = conn.total_changes
+        batch = []
+        for question, answer in iter_faq_file(path):
+            batch.append((question, answer, question_hash(question)))
+            if len(batch) >= IMPORT_CHUNK_ROWS:
+                read += _insert(conn, batch)
+                if progress is not None:
+                    progress(read)
+        read += _insert(conn, batch)
+        inserted = conn.total_changes - before
+        if inserted:
+            conn.execute('INSERT INTO faq_changes (faq_id) VALUES (NULL)')
+        for sql in FAQ_TRIGGERS.values():
+            conn.execute(sql)
+        conn.execute('COMMIT')
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+    return {'read': read, 'inserted': inserted, 'skipped': read - inserted}
+
+
+def _insert(conn, batch):
+    if not batch:
+        return 0
+    conn.executemany('INSERT OR IGNORE INTO faq (question, answer, question_hash) VALUES (?, ?, ?)', batch)
+    n = len(batch)
+    batch.clear()
+    return n
+
+
+def main():
+    # 명령줄에서 가져오기: python faq_import.py faq.csv [--db faq_chatbot.db]
+    from engine import DB_PATH, init_db
+    parser = argparse.ArgumentParser(description='FAQ 대량 가져오기 (CSV/엑셀)')
+    parser.add_argument('path')
+    parser.add_argument('--db', default=DB_PATH)
+    args = parser.parse_args()
+    init_db(args.db)
+    result = import_faq(args.db, args.path, progress=lambda n: print(f'\r{n:,}행 읽음', end='', file=sys.stderr))
+    print(file=sys.stderr)
+    print(f"{result['read']:,}행 중 {result['inserted']:,}행 추가, 중복 {result['skipped']:,}행 건너뜀")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,287 @@
+import sys
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import scipy.sparse as sp
+from sklearn.preprocessing import normalize
+from ann import ANNRetriever, IVFIndex, sparse_bytes
+from retrieval import FAQRetriever
+from model_store import MODEL_DIR, faq_fingerprint, load_model, save_model
+
+# 마지막 학습 이후 바뀐 행 수 + 새로 등장한 단어 수가 학습 당시 행 수의 이 비율을 넘으면
+# 백그라운드에서 IDF(어휘)를 다시 학습합니다.
+DRIFT_RATIO = 0.1
+# 근사 검색(ANN) 사용: 'auto'면 FAQ가 ANN_MIN_ROWS개 이상일 때만, 'on'이면 항상, 'off'면 사용 안 함
+ANN_MODES = ('auto', 'on', 'off')
+ANN_MIN_ROWS = 200000
+
+# 검색에 쓰는 읽기 전용 상태. 변경할 때마다 새로 만들어 통째로 바꾸므로
+# 다른 스레드는 snapshot 하나를 잡고 검색/조회하면 중간 상태를 보지 않습니다.
+# version은 바뀔 때마다 1씩 늘어납니다. (답변 캐시 무효화에 사용)
+IndexSnapshot = namedtuple('IndexSnapshot', 'retriever ids questions answers version')
+
+
+class FAQIndex:
+    # FAQ 검색 인덱스. 질문 하나를 추가/수정/삭제할 때는 그 행만 벡터화해 행렬에 반영하고
+    # (어휘에 없는 단어는 어휘 끝에 붙임), 변화가 쌓이면 전체 재학습을 백그라운드 스레드에서 합니다.
+    # 변경(load/upsert/delete/poll)은 한 스레드에서만 호출하고, poll()로 재학습 결과를 반영합니다.
+    # 검색은 어느 스레드에서나 snapshot으로 할 수 있습니다.
+    # model_tag: 저장된 모델을 구분하는 벡터화 설정 이름 (예: 토크나이저 이름)
+    # threshold: 이 벡터화 설정에서 답변으로 인정하는 최소 유사도 (모델과 함께 저장)
+    # ANN 인덱스는 학습(load/재학습)이 끝날 때마다 백그라운드에서 만들고, 그 전까지는 정확 검색을 씁니다.
+    def __init__(self, make_vectorizer, model_tag='', threshold=0.0, model_dir=MODEL_DIR, ann='auto'):
+        self.make_vectorizer = make_vectorizer
+        self.model_tag = model_tag
+        self.threshold = threshold
+        self.ann = ann
+        self.model_dir = model_dir
+        self.ids = []
+        self.questions = []
+        self.answers = []
+        self.snapshot = IndexSnapshot(None, (), (), (), 0)
+        self._pool = ThreadPoolExecutor(max_workers=1)
+        self._refit = None
+        # 재학습 중에 바뀐 행 {faq_id: (질문, 답변) 또는 None(삭제)}
+        self._refit_changes = {}
+        # 재학습 중에 들어온 전체 다시 읽기 요청 (끝나면 이어서 시작)
+        self._pending_load = None
+        self._dirty = False
+        # ANN: 만들어진 인덱스와 그때의 faq id 목록, 빌드 이후 바뀐 faq id
+        self._ivf = None
+        self._ivf_ids = None
+        self._ann_job = None
+        self._ann_job_ids = None
+        self._ann_stale = set()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def load(self, ids, questions, answers):
+        # 저장된 모델이 있으면 불러오고, 없으면 학습한 뒤 저장합니다.
+        vectorizer = self.make_vectorizer()
+        key = faq_fingerprint(ids, questions, self.model_tag)
+        cached = load_model(self.model_dir, key, vectorizer, self.threshold)
+        drift = None
+        if cached is not None and cached[1] == list(ids):
+            matrix, _, drift = cached
+        else:
+            matrix = vectorizer.fit_transform(questions)
+            self._save(key, vectorizer, matrix, ids)
+        self._install(vectorizer, matrix, ids, questions, answers)
+        self._dirty = False
+        # 증분 변경이 쌓인 채 저장된 모델이면 그 변화량을 이어받고, 기준을 넘었으면 바로 재학습합니다.
+        if drift is not None:
+            self._fit_rows = drift['fit_rows']
+            self._changed_rows = drift['changed_rows']
+            self._unseen_terms = set(drift['unseen_terms'])
+            if self.drift() > DRIFT_RATIO:
+                self.start_refit()
+
+    def _save(self, key, vectorizer, matrix, ids, drift=None):
+        try:
+            save_model(self.model_dir, key, vectorizer, matrix, ids, drift, self.threshold)
+        except OSError:
+            # 저장에 실패해도 이번 실행에는 지장이 없습니다.
+            pass
+
+    def _install(self, vectorizer, matrix, ids, questions, answers):
+        self.vectorizer = vectorizer
+        self._analyzer = vectorizer.build_analyzer()
+        self.matrix = normalize(sp.csr_matrix(matrix), norm='l2')
+        self.ids = list(ids)
+        self.questions = list(questions)
+        self.answers = list(answers)
+        self._positions = {faq_id: pos for pos, faq_id in enumerate(self.ids)}
+        self._fit_rows = len(self.ids)
+        self._changed_rows = 0
+        self._unseen_terms = set()
+        self._start_ann()
+        self._publish()
+
+    def use_ann(self, rows=None):
+        rows = len(self.ids) if rows is None else rows
+        return self.ann == 'on' or (self.ann == 'auto' and rows >= ANN_MIN_ROWS)
+
+    def _start_ann(self):
+        # 어휘가 바뀌었으므로 이전 ANN 인덱스는 버리고 새로 만듭니다.
+        if self._ann_job is not None:
+            self._ann_job.cancel()
+        self._ivf = self._ivf_ids = self._ann_job = None
+        self._ann_stale = set()
+        if self.use_ann() and len(self.ids) > 1:
+            self._ann_job = self._pool.submit(IVFIndex.build, self.matrix)
+            self._ann_job_ids = tuple(self.ids)
+
+    def _publish(self):
+        retriever = FAQRetriever(self.vectorizer, self.matrix, normalized=True)
+        if self._ivf is not None:
+            stale = frozenset(self._ann_stale)
+            positions = dict(self._positions)
+            delta = [positions[i] for i in stale if i in positions]
+            retriever = ANNRetriever(retriever, self._ivf, self._ivf_ids, positions, stale, delta)
+        self.snapshot = IndexSnapshot(retriever, tuple(self.ids), tuple(self.questions), tuple(self.answers),
+                                      self.snapshot.version + 1)
+
+    def search(self, query, k=5, snapshot=None):
+        # [(행 위치, 점수), ...] 위치로 snapshot의 questions/answers/ids를 찾습니다.
+        if snapshot is None:
+            snapshot = self.snapshot
+        if not snapshot.ids:
+            return []
+        return snapshot.retriever.search([query], k=k)[0]
+
+    def _vectorize(self, question):
+        # 어휘에 없는 단어가 있으면 어휘를 늘린 뒤 벡터화합니다. (새 질문도 바로 검색되게)
+        vocabulary = self.vectorizer.vocabulary_
+        unseen = [t for t in dict.fromkeys(self._analyzer(question)) if t not in vocabulary]
+        if unseen:
+            self._unseen_terms.update(unseen)
+            self._extend_vocabulary(unseen)
+        return normalize(self.vectorizer.transform([question]), norm='l2')
+
+    def _extend_vocabulary(self, terms):
+        # 새 단어를 어휘 끝에 붙이고, IDF는 지금 행 수에서 한 질문에만 나온 단어의 값으로 둡니다.
+        # (smooth_idf: ln((1 + n) / (1 + df)) + 1) 정확한 IDF는 다음 재학습 때 다시 계산합니다.
+        # 다른 스레드가 검색 중인 snapshot의 vectorizer는 건드리지 않고 새로 만들어 바꿉니다.
+        vocabulary = dict(self.vectorizer.vocabulary_)
+        start = len(vocabulary)
+        vocabulary.update((term, start + i) for i, term in enumerate(terms))
+        idf = np.log((1 + len(self.ids)) / 2) + 1
+        vectorizer = self.make_vectorizer()
+        vectorizer.vocabulary_ = vocabulary
+        vectorizer.idf_ = np.concatenate([self.vectorizer.idf_, np.full(len(terms), idf)])
+        self.vectorizer = vectorizer
+        # 기존 행은 새 단어 열이 모두 0이므로 배열은 그대로 두고 열 수만 늘립니다.
+        matrix = self.matrix
+        self.matrix = sp.csr_matrix((matrix.data, matrix.indices, matrix.indptr),
+                                    shape=(matrix.shape[0], len(vocabulary)))
+
+    def upsert(self, faq_id, question, answer):
+        # 새 FAQ면 행렬 끝에 붙이고, 있던 FAQ면 그 행만 바꿉니다.
+        row = self._vectorize(question)
+        pos = self._positions.get(faq_id)
+        if pos is None:
+            self.matrix = sp.vstack([self.matrix, row], format='csr')
+            self._positions[faq_id] = len(self.ids)
+            self.ids.append(faq_id)
+            self.questions.append(question)
+            self.answers.append(answer)
+        else:
+            self.matrix = sp.vstack([self.matrix[:pos], row, self.matrix[pos + 1:]], format='csr')
+            self.questions[pos] = question
+            self.answers[pos] = answer
+        self._changed(faq_id, (question, answer))
+
+    def delete(self, faq_id):
+        pos = self._positions.get(faq_id)
+        if pos is None:
+            return
+        keep = np.ones(len(self.ids), dtype=bool)
+        keep[pos] = False
+        self.matrix = self.matrix[keep]
+        for values in (self.ids, self.questions, self.answers):
+            del values[pos]
+        self._positions = {i: p for p, i in enumerate(self.ids)}
+        self._changed(faq_id, None)
+
+    def _changed(self, faq_id, row):
+        if self._ivf is not None or self._ann_job is not None:
+            self._ann_stale.add(faq_id)
+        self._publish()
+        self._changed_rows += 1
+        self._dirty = True
+        if self._refit is not None:
+            self._refit_changes[faq_id] = row
+        elif self.drift() > DRIFT_RATIO:
+            self.start_refit()
+
+    def drift(self):
+        return (self._changed_rows + len(self._unseen_terms)) / max(self._fit_rows, 1)
+
+    def refitting(self):
+        return self._refit is not None
+
+    def start_refit(self, load=None):
+        # 현재 질문 목록의 복사본으로 백그라운드 재학습을 시작합니다.
+        # load()를 주면 백그라운드에서 그 결과 (ids, questions, answers)로 새로 만듭니다. (대량 가져오기 후)
+        if self._refit is not None:
+            if load is not None:
+                self._pending_load = load
+            return
+        snapshot = (list(self.ids), list(self.questions), list(self.answers))
+        self._refit_changes = {}
+        self._refit = self._pool.submit(self._fit, *snapshot, load=load)
+
+    def _fit(self, ids, questions, answers, load=None):
+        if load is not None:
+            ids, questions, answers = load()
+        vectorizer = self.make_vectorizer()
+        matrix = vectorizer.fit_transform(questions)
+        return vectorizer, matrix, ids, questions, answers
+
+    def poll(self):
+        # 재학습이 끝났으면 결과로 교체하고, 그동안 바뀐 행을 다시 반영합니다.
+        # ANN 인덱스가 다 만들어졌으면 검색에 붙입니다. 무엇이든 바뀌었으면 True
+        ann_ready = self._poll_ann()
+        if self._refit is None or not self._refit.done():
+            return ann_ready
+        future, self._refit = self._refit, None
+        changes, self._refit_changes = self._refit_changes, {}
+        try:
+            vectorizer, matrix, ids, questions, answers = future.result()
+        except Exception as e:
+            # 재학습이 실패하면 지금 모델을 그대로 쓰고, 그동안의 변경은 이미 증분으로 반영되어 있습니다.
+            # (변화량이 기준을 넘은 채라 다음 변경 때 다시 재학습합니다)
+            print(f'FAQ 재학습 실패: {e}', file=sys.stderr)
+            if self._pending_load is not None:
+                load, self._pending_load = self._pending_load, None
+                self.start_refit(load)
+            return False
+        self._install(vectorizer, matrix, ids, questions, answers)
+        self._save(faq_fingerprint(ids, questions, self.model_tag), vectorizer, matrix, ids)
+        self._dirty = bool(changes)
+        for faq_id, row in changes.items():
+            if row is None:
+                self.delete(faq_id)
+            else:
+                self.upsert(faq_id, *row)
+        if self._pending_load is not None:
+            load, self._pending_load = self._pending_load, None
+            self.start_refit(load)
+        return True
+
+    def _poll_ann(self):
+        if self._ann_job is None or not self._ann_job.done():
+            return False
+        job, self._ann_job = self._ann_job, None
+        if job.cancelled() or job.exception() is not None:
+            return False
+        self._ivf = job.result()
+        self._ivf_ids = self._ann_job_ids
+        self._publish()
+        return True
+
+    def ann_status(self):
+        # 진단 화면용: ANN 사용 여부와 메모리(MiB)
+        status = {'mode': self.ann, 'active': self._ivf is not None, 'building': self._ann_job is not None,
+                  'stale_rows': len(self._ann_stale)}
+        if self._ivf is not None:
+            status['lists'] = len(self._ivf.centroids)
+            status['memory_mib'] = round(self._ivf.memory_bytes()['total'] / 2**20, 2)
+        if self.ids:
+            status['tfidf_mib'] = round(sparse_bytes(self.matrix) / 2**20, 2)
+        return status
+
+    def close(self):
+        # 증분 변경이 남아 있으면 id 순서로 저장해 다음 시작 때 재학습하지 않게 합니다.
+        # 학습 이후의 변화량도 같이 저장해, 다음 시작 때 이어서 세고 기준을 넘었으면 재학습합니다.
+        self._pool.shutdown(wait=False, cancel_futures=True)
+        if not self._dirty:
+            return
+        order = np.argsort(self.ids, kind='stable')
+        ids = [self.ids[i] for i in order]
+        questions = [self.questions[i] for i in order]
+        drift = {'fit_rows': self._fit_rows, 'changed_rows': self._changed_rows,
+                 'unseen_terms': sorted(self._unseen_terms)}
+        self._save(faq_fingerprint(ids, questions, self.model_tag), self.vectorizer, self.matrix[order], ids,
+                   drift)
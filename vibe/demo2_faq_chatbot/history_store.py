@@ -0,0 +1,117 @@
+import sqlite3
+from datetime import date, timedelta
+
+# 답변 이력 조회: created_at 인덱스를 따라 (created_at, id) 키 기준으로 페이지를 읽고(keyset),
+# 검색어는 FTS5 테이블(history_fts)에서 찾습니다. 테이블이 커도 페이지 하나는 몇 ms 안에 나옵니다.
+HISTORY_PAGE_ROWS = 100
+# trigram 토크나이저는 세 글자 이상부터 찾을 수 있어서 더 짧은 검색어는 LIKE로 찾습니다.
+FTS_MIN_CHARS = 3
+
+
+def migrate_history(conn):
+    # init_db에서 호출: 정렬용 인덱스, FTS5 검색 테이블과 동기화 트리거를 만듭니다.
+    c = conn.cursor()
+    # 모든 인덱스에는 rowid(id)가 들어 있으므로 (created_at) 인덱스만으로 정렬과 키 비교를 합니다.
+    c.execute('CREATE INDEX IF NOT EXISTS idx_history_created_at ON history (created_at)')
+    exists = c.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone()
+    if not exists:
+        try:
+            c.execute('''CREATE VIRTUAL TABLE history_fts USING fts5(
+                user_question, matched_question, answer,
+                content='history', content_rowid='id', tokenize='trigram')''')
+        except sqlite3.OperationalError:
+            # FTS5(trigram)를 지원하지 않는 SQLite면 검색어는 LIKE로만 찾습니다.
+            return
+        c.execute("INSERT INTO history_fts (history_fts) VALUES ('rebuild')")
+    c.execute('''CREATE TRIGGER IF NOT EXISTS history_fts_insert AFTER INSERT ON history BEGIN
+        INSERT INTO history_fts (rowid, user_question, matched_question, answer)
+        VALUES (NEW.id, NEW.user_question, NEW.matched_question, NEW.answer); END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS history_fts_delete AFTER DELETE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, user_question, matched_question, answer)
+        VALUES ('delete', OLD.id, OLD.user_question, OLD.matched_question, OLD.answer); END''')
+    c.execute('''CREATE TRIGGER IF NOT EXISTS history_fts_update AFTER UPDATE ON history BEGIN
+        INSERT INTO history_fts (history_fts, rowid, user_question, matched_question, answer)
+        VALUES ('delete', OLD.id, OLD.user_question, OLD.matched_question, OLD.answer);
+        INSERT INTO history_fts (rowid, user_question, matched_question, answer)
+        VALUES (NEW.id, NEW.user_question, NEW.matched_question, NEW.answer); END''')
+
+
+def has_fts(conn):
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'history_fts'").fetchone() is not None
+
+
+def _fts_phrase(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _escape_like(text):
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def fetch_history_page(db_path, after=None, limit=HISTORY_PAGE_ROWS, date_from=None, date_to=None, text=''):
+    # 최신순으로 한 페이지를 읽습니다.
+    # after: 이전 페이지의 다음 키 (created_at, id). date_from/date_to: date (끝 날짜 포함)
+    # 반환값: (행 목록 [(id, created_at, 질문, 매칭된 질문, 답변)], 다음 키 또는 None)
+    text = text.strip()
+    conn = sqlite3.connect(db_path)
+    try:
+        if len(text) >= FTS_MIN_CHARS and has_fts(conn):
+            rows = _fts_page(conn, after, limit, date_from, date_to, text)
+        else:
+            rows = _index_page(conn, after, limit, date_from, date_to, text)
+    finally:
+        conn.close()
+    next_key = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_key = (rows[-1][1], rows[-1][0])
+    return rows, next_key
+
+
+def _date_clauses(date_from, date_to):
+    clauses, params = [], []
+    if date_from is not None:
+        clauses.append('h.created_at >= ?')
+        params.append(date_from.isoformat())
+    if date_to is not None:
+        clauses.append('h.created_at < ?')
+        params.append((date_to + timedelta(days=1)).isoformat())
+    return clauses, params
+
+
+def _index_page(conn, after, limit, date_from, date_to, text):
+    # created_at 인덱스를 최신 쪽부터 훑습니다. (짧은 검색어는 LIKE로 걸러냄)
+    clauses, params = _date_clauses(date_from, date_to)
+    if after is not None:
+        clauses.append('(h.created_at, h.id) < (?, ?)')
+        params.extend(after)
+    if text:
+        pattern = '%' + _escape_like(text) + '%'
+        clauses.append("(h.user_question LIKE ? ESCAPE '\\' OR h.matched_question LIKE ? ESCAPE '\\' "
+                       "OR h.answer LIKE ? ESCAPE '\\')")
+        params.extend([pattern] * 3)
+    where = ('WHERE ' + ' AND '.join(clauses)) if clauses else ''
+    return conn.execute(f'''SELECT h.id, h.created_at, h.user_question, h.matched_question, h.answer
+        FROM history h {where}
+        ORDER BY h.created_at DESC, h.id DESC LIMIT ?''', params + [limit + 1]).fetchall()
+
+
+def _fts_page(conn, after, limit, date_from, date_to, text):
+    # 검색어가 있으면 FTS 결과를 rowid(id) 역순으로 읽습니다. 이력은 시간 순서대로 쌓이므로
+    # id 순서가 곧 최신순이고, 흔한 단어든 드문 단어든 필요한 만큼만 읽습니다.
+    clauses, params = _date_clauses(date_from, date_to)
+    clauses.insert(0, 'history_fts MATCH ?')
+    params.insert(0, _fts_phrase(text))
+    if after is not None:
+        clauses.append('history_fts.rowid < ?')
+        params.append(after[1])
+    return conn.execute(f'''SELECT h.id, h.created_at, h.user_question, h.matched_question, h.answer
+        FROM history_fts JOIN history h ON h.id = history_fts.rowid
+        WHERE {' AND '.join(clauses)}
+        ORDER BY history_fts.rowid DESC LIMIT ?''', params + [limit + 1]).fetchall()
+
+
+def parse_date(text):
+    # 'YYYY-MM-DD' 문자열 -> date (빈 문자열이면 None, 형식이 틀리면 ValueError)
+    text = text.strip()
+    return date.fromisoformat(text) if text else None
@@ -0,0 +1,103 @@
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+
+# 답변 이력은 메모리 큐에 모았다가 백그라운드 스레드가 한 번에 저장합니다.
+# 이만큼 쌓이거나, 첫 기록 후 이 시간(초)이 지나면 저장합니다.
+FLUSH_ROWS = 50
+FLUSH_SECONDS = 1.0
+
+_STOP = object()
+
+
+class HistoryWriter:
+    # 연결 하나를 계속 쓰는 이력 저장 스레드 (WAL 모드, executemany)
+    # log()는 큐에 넣기만 하므로 GUI가 디스크를 기다리지 않습니다.
+    def __init__(self, db_path, flush_rows=FLUSH_ROWS, flush_seconds=FLUSH_SECONDS):
+        self.db_path = db_path
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='history-writer', daemon=True)
+        self._thread.start()
+
+    def log(self, user_question, matched_question, answer):
+        # created_at은 질문한 시각(UTC, DB 기본값 CURRENT_TIMESTAMP와 같은 형식)으로 남깁니다.
+        created_at = datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S')
+        self._queue.put((user_question, matched_question, answer, created_at))
+
+    def flush(self, timeout=5.0):
+        # 지금까지 넣은 기록이 저장될 때까지 기다립니다. (이력 보기 전에 호출)
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        # 남은 기록을 모두 저장하고 스레드를 끝냅니다.
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=10)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def _write(self, conn, batch):
+        if not batch:
+            return True
+        try:
+            with conn:
+                conn.executemany('INSERT INTO history (user_question, matched_question, answer, created_at) '
+                                 'VALUES (?, ?, ?, ?)', batch)
+        except sqlite3.Error as e:
+            # DB가 잠겨 있는 등 실패하면 기록을 버리지 않고 다음에 다시 시도합니다.
+            print(f'답변 이력 저장 실패: {e}', file=sys.stderr)
+            return False
+        batch.clear()
+        return True
+
+    def _run(self):
+        conn = self._connect()
+        batch = []
+        deadline = None
+        try:
+            while True:
+                timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                try:
+                    item = self._queue.get(timeout=timeout)
+                except queue.Empty:
+                    item = None
+                if item is _STOP:
+                    break
+                if isinstance(item, threading.Event):
+                    self._write(conn, batch)
+                    item.set()
+                elif item is not None:
+                    batch.append(item)
+                    if deadline is None:
+                        deadline = time.monotonic() + self.flush_seconds
+                if batch and (len(batch) >= self.flush_rows or time.monotonic() >= deadline):
+                    if not self._write(conn, batch):
+                        deadline = time.monotonic() + self.flush_seconds
+                if not batch:
+                    deadline = None
+            # 종료 전에 큐에 남은 기록까지 모아 저장합니다.
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if isinstance(item, tuple):
+                    batch.append(item)
+                elif isinstance(item, threading.Event):
+                    item.set()
+            self._write(conn, batch)
+        finally:
+            conn.close()
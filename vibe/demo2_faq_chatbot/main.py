@@ -1,49 +1,24 @@
+import os
+import sys
 import tkinter as tk
-from tkinter import ttk, messagebox
+from tkinter import ttk, messagebox, filedialog
 import sqlite3
-import os
-import pandas as pd
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-import nltk
-import csv
-
-DB_PATH = 'faq_chatbot.db'
-FAQ_DUMMY = 'faq_dummy.csv'
-
-# NLTK 토크나이저 다운로드(최초 1회)
-try:
-    nltk.data.find('tokenizers/punkt')
-except LookupError:
-    nltk.download('punkt')
-
-def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    c = conn.cursor()
-    # FAQ 테이블
-    c.execute('''CREATE TABLE IF NOT EXISTS faq (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        question TEXT,
-        answer TEXT
-    )''')
-    # 답변 이력 테이블
-    c.execute('''CREATE TABLE IF NOT EXISTS history (
-        id INTEGER PRIMARY KEY AUTOINCREMENT,
-        user_question TEXT,
-        matched_question TEXT,
-        answer TEXT,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )''')
-    conn.commit()
-    # FAQ 더미데이터 자동 입력
-    c.execute('SELECT COUNT(*) FROM faq')
-    if c.fetchone()[0] == 0 and os.path.exists(FAQ_DUMMY):
-        with open(FAQ_DUMMY, encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                c.execute('INSERT INTO faq (question, answer) VALUES (?, ?)', (row['질문'], row['답변']))
-        conn.commit()
-    conn.close()
+import threading
+# 여러 데모가 함께 쓰는 모듈 (vibe/shared)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'shared'))
+import instrument
+from perf_window import bind_perf_window
+from engine import DB_PATH, TOP_K, FAQEngine, init_db
+from faq_import import import_faq, question_hash
+from history_store import fetch_history_page, parse_date
+
+# FAQ 변경 내역을 확인하는 주기(ms)
+FAQ_SYNC_MS = 1000
+# 시작할 때 엔진 준비가 끝났는지 확인하는 주기(ms)
+ENGINE_POLL_MS = 100
+ENGINE_LOADING = 'FAQ를 불러오는 중입니다. 잠시 후 다시 시도해 주세요.'
+# FAQ 편집 화면에 보여줄 최대 개수 (최근 추가된 순)
+EDITOR_ROWS = 1000
 
 class FAQChatbotApp(tk.Tk):
     def __init__(self):
@@ -51,8 +26,51 @@ class FAQChatbotApp(tk.Tk):
         self.title('FAQ 챗봇 시스템')
         self.geometry('700x600')
         self.resizable(False, False)
+        # 답변 찾기는 GUI와 분리된 엔진이 합니다. (server.py와 같은 엔진)
+        # 엔진(scikit-learn 불러오기, FAQ 인덱스 준비)은 창을 먼저 띄운 뒤 작업 스레드에서 만듭니다.
+        self.engine = None
         self.create_widgets()
-        self.load_faq_data()
+        self.protocol('WM_DELETE_WINDOW', self.on_close)
+        # 숨은 성능 기록 창 (핸들러별 처리 시간, Ctrl+Shift+D)
+        bind_perf_window(self)
+        self.start_engine()
+
+    def start_engine(self):
+        job = {'engine': None, 'error': None}
+
+        def run():
+            try:
+                with instrument.measure('engine.load'):
+                    init_db()
+                    engine = FAQEngine(DB_PATH)
+                    engine.load()
+                    instrument.rows(len(engine.faq.snapshot.ids))
+                job['engine'] = engine
+            except Exception as e:
+                job['error'] = e
+
+        def check():
+            if worker.is_alive():
+                self.after(ENGINE_POLL_MS, check)
+                return
+            if job['error'] is not None:
+                self.status_label.config(text='FAQ를 불러오지 못했습니다.')
+                messagebox.showerror('오류', f'FAQ를 불러오지 못했습니다.\n{job["error"]}')
+                return
+            self.engine = job['engine']
+            self.status_label.config(text='')
+            self.after(FAQ_SYNC_MS, self.sync_faq_changes)
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        self.status_label.config(text='FAQ를 불러오는 중...')
+        check()
+
+    def engine_ready(self, parent=None):
+        if self.engine is None:
+            messagebox.showinfo('준비 중', ENGINE_LOADING, parent=parent)
+            return False
+        return True
 
     def create_widgets(self):
         # 챗봇 대화창
@@ -65,46 +83,41 @@ class FAQChatbotApp(tk.Tk):
         self.user_entry.pack(side='left', padx=5)
         self.user_entry.bind('<Return>', lambda e: self.ask_question())
         ttk.Button(input_frame, text='질문하기', command=self.ask_question).pack(side='left', padx=5)
-        # 답변 이력 보기 버튼
-        ttk.Button(self, text='답변 이력 보기', command=self.show_history).pack(pady=5)
-
-    def load_faq_data(self):
-        # DB에서 FAQ 전체 불러오기
-        conn = sqlite3.connect(DB_PATH)
-        df = pd.read_sql_query('SELECT * FROM faq', conn)
-        conn.close()
-        self.questions = df['question'].tolist()
-        self.answers = df['answer'].tolist()
-        # TF-IDF 벡터화
-        self.vectorizer = TfidfVectorizer(tokenizer=nltk.word_tokenize)
-        self.tfidf_matrix = self.vectorizer.fit_transform(self.questions)
+        # 답변 이력 보기 / FAQ 편집 버튼
+        button_frame = ttk.Frame(self)
+        button_frame.pack(pady=5)
+        ttk.Button(button_frame, text='답변 이력 보기', command=self.show_history).pack(side='left', padx=5)
+        ttk.Button(button_frame, text='FAQ 편집', command=self.show_faq_editor).pack(side='left', padx=5)
+        ttk.Button(button_frame, text='진단 정보', command=self.show_diagnostics).pack(side='left', padx=5)
+        # 엔진 준비 상태
+        self.status_label = ttk.Label(self, text='')
+        self.status_label.pack(pady=(0, 5))
+
+    def sync_faq_changes(self):
+        # FAQ_SYNC_MS마다 변경 내역과 백그라운드 재학습 결과를 반영합니다.
+        self.engine.sync_changes()
+        self.after(FAQ_SYNC_MS, self.sync_faq_changes)
 
+    def on_close(self):
+        # 큐에 남은 답변 이력을 모두 저장한 뒤 닫습니다.
+        if self.engine is not None:
+            self.engine.close()
+        self.destroy()
+
+    @instrument.timed()
     def ask_question(self):
         user_q = self.user_entry.get().strip()
-        if not user_q:
+        if not user_q or not self.engine_ready():
             return
         self.user_entry.delete(0, tk.END)
         self.append_chat(f'사용자: {user_q}')
-        # 유사도 기반 답변 찾기
-        user_vec = self.vectorizer.transform([user_q])
-        sims = cosine_similarity(user_vec, self.tfidf_matrix)[0]
-        best_idx = sims.argmax()
-        best_score = sims[best_idx]
-        if best_score > 0.3:
-            matched_q = self.questions[best_idx]
-            answer = self.answers[best_idx]
-            self.append_chat(f'챗봇: {answer}')
-        else:
-            matched_q = ''
-            answer = '죄송합니다. 해당 질문에 대한 답변을 찾지 못했습니다.'
-            self.append_chat(f'챗봇: {answer}')
-        # 답변 이력 저장
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('INSERT INTO history (user_question, matched_question, answer) VALUES (?, ?, ?)',
-                  (user_q, matched_q, answer))
-        conn.commit()
-        conn.close()
+        # 유사도 기반 답변 찾기 (상위 TOP_K개 후보, 답변 이력은 엔진이 백그라운드에서 저장)
+        result = self.engine.answer(user_q, k=TOP_K)
+        instrument.rows(len(self.engine.faq.snapshot.ids))
+        self.append_chat(f'챗봇: {result["answer"]}')
+        if result['related']:
+            related = ', '.join(f'{r["question"]} ({r["score"]:.2f})' for r in result['related'])
+            self.append_chat(f'  관련 질문: {related}')
 
     def append_chat(self, msg):
         self.chat_text.config(state='normal')
@@ -113,19 +126,247 @@ class FAQChatbotApp(tk.Tk):
         self.chat_text.see(tk.END)
 
     def show_history(self):
+        # 최신순 이력을 페이지 단위로 읽고, 목록 끝 근처까지 스크롤하면 다음 페이지를 읽습니다.
+        if not self.engine_ready():
+            return
         win = tk.Toplevel(self)
         win.title('답변 이력')
-        text = tk.Text(win, width=80, height=20)
+        self.engine.flush_history()
+        # 검색 조건: 기간(YYYY-MM-DD, UTC)과 검색어
+        filter_frame = ttk.Frame(win)
+        filter_frame.pack(padx=10, pady=(10, 0), fill='x')
+        ttk.Label(filter_frame, text='시작일').pack(side='left')
+        from_entry = ttk.Entry(filter_frame, width=11)
+        from_entry.pack(side='left', padx=(2, 8))
+        ttk.Label(filter_frame, text='종료일').pack(side='left')
+        to_entry = ttk.Entry(filter_frame, width=11)
+        to_entry.pack(side='left', padx=(2, 8))
+        ttk.Label(filter_frame, text='검색어').pack(side='left')
+        text_entry = ttk.Entry(filter_frame, width=20)
+        text_entry.pack(side='left', padx=(2, 8))
+        status = ttk.Label(win, text='')
+        # 이력 목록
+        list_frame = ttk.Frame(win)
+        list_frame.pack(padx=10, pady=5, fill='both', expand=True)
+        columns = ('created_at', 'user_question', 'matched_question', 'answer')
+        tree = ttk.Treeview(list_frame, columns=columns, show='headings', height=20)
+        for col, title, width in zip(columns, ('시간', '질문', '매칭된 질문', '답변'), (140, 180, 180, 300)):
+            tree.heading(col, text=title)
+            tree.column(col, width=width)
+        scrollbar = ttk.Scrollbar(list_frame, orient='vertical', command=tree.yview)
+        tree.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        status.pack(padx=10, pady=(0, 10), anchor='w')
+        state = {'filters': {}, 'next': None, 'loading': False, 'count': 0}
+
+        @instrument.timed('history.load_page')
+        def load_page():
+            state['loading'] = True
+            rows, state['next'] = fetch_history_page(DB_PATH, after=state['next'], **state['filters'])
+            instrument.rows(len(rows))
+            for row_id, created_at, user_q, matched_q, answer in rows:
+                tree.insert('', tk.END, iid=str(row_id), values=(created_at, user_q, matched_q, answer))
+            state['count'] += len(rows)
+            more = ' (스크롤하면 더 불러옵니다)' if state['next'] else ''
+            status.config(text=f'{state["count"]}건 표시{more}')
+            state['loading'] = False
+
+        def on_scroll(first, last):
+            scrollbar.set(first, last)
+            if float(last) > 0.9 and state['next'] is not None and not state['loading']:
+                state['loading'] = True
+                win.after_idle(load_page)
+
+        def search():
+            try:
+                filters = {'date_from': parse_date(from_entry.get()), 'date_to': parse_date(to_entry.get()),
+                           'text': text_entry.get()}
+            except ValueError:
+                messagebox.showwarning('입력 오류', '날짜는 YYYY-MM-DD 형식으로 입력하세요.', parent=win)
+                return
+            state.update(filters=filters, next=None, count=0)
+            tree.delete(*tree.get_children())
+            load_page()
+
+        tree.configure(yscrollcommand=on_scroll)
+        ttk.Button(filter_frame, text='검색', command=search).pack(side='left')
+        text_entry.bind('<Return>', lambda e: search())
+        search()
+
+    def show_diagnostics(self):
+        # 인덱스와 답변 캐시 상태 (창이 열려 있는 동안 1초마다 갱신)
+        if not self.engine_ready():
+            return
+        win = tk.Toplevel(self)
+        win.title('진단 정보')
+        text = tk.Text(win, width=50, height=19)
         text.pack(padx=10, pady=10)
-        conn = sqlite3.connect(DB_PATH)
-        c = conn.cursor()
-        c.execute('SELECT user_question, matched_question, answer, created_at FROM history ORDER BY created_at DESC LIMIT 30')
-        for row in c.fetchall():
-            text.insert(tk.END, f'[{row[3]}]\nQ: {row[0]}\n매칭된 질문: {row[1]}\nA: {row[2]}\n---\n')
-        conn.close()
-        text.config(state='disabled')
+        labels = [
+            ('FAQ 수', lambda d: d['faq_count']),
+            ('인덱스 버전', lambda d: d['index_version']),
+            ('어휘 수', lambda d: d['vocabulary_size']),
+            ('변경 누적(drift)', lambda d: d['drift']),
+            ('재학습 중', lambda d: '예' if d['refit_running'] else '아니오'),
+            ('근사 검색(ANN)', lambda d: '사용 중' if d['ann']['active'] else ('만드는 중' if d['ann']['building'] else '사용 안 함')),
+            ('TF-IDF 행렬', lambda d: f"{d['ann'].get('tfidf_mib', 0)} MiB"),
+            ('ANN 인덱스', lambda d: f"{d['ann'].get('memory_mib', 0)} MiB"),
+            ('캐시 항목', lambda d: f"{d['cache']['size']} / {d['cache']['maxsize']}"),
+            ('캐시 적중', lambda d: d['cache']['hits']),
+            ('캐시 실패', lambda d: d['cache']['misses']),
+            ('캐시 적중률', lambda d: f"{d['cache']['hit_rate']:.1%}"),
+            ('만료(TTL)', lambda d: d['cache']['expired']),
+            ('무효(FAQ 변경)', lambda d: d['cache']['stale']),
+        ]
+
+        def refresh():
+            if not win.winfo_exists():
+                return
+            diagnostics = self.engine.diagnostics()
+            text.config(state='normal')
+            text.delete('1.0', tk.END)
+            for label, value in labels:
+                text.insert(tk.END, f'{label}: {value(diagnostics)}\n')
+            text.config(state='disabled')
+            win.after(1000, refresh)
+
+        refresh()
+
+    def show_faq_editor(self):
+        # FAQ 추가/수정/삭제. DB에 저장하면 변경 내역을 통해 바로 검색에 반영됩니다.
+        if not self.engine_ready():
+            return
+        win = tk.Toplevel(self)
+        win.title('FAQ 편집')
+        tree = ttk.Treeview(win, columns=('question', 'answer'), show='headings', height=12)
+        tree.heading('question', text='질문')
+        tree.heading('answer', text='답변')
+        tree.column('question', width=250)
+        tree.column('answer', width=400)
+        tree.pack(padx=10, pady=10, fill='both', expand=True)
+        form = ttk.Frame(win)
+        form.pack(padx=10, fill='x')
+        ttk.Label(form, text='질문').grid(row=0, column=0, sticky='w')
+        question_entry = ttk.Entry(form, width=80)
+        question_entry.grid(row=0, column=1, pady=2)
+        ttk.Label(form, text='답변').grid(row=1, column=0, sticky='w')
+        answer_entry = ttk.Entry(form, width=80)
+        answer_entry.grid(row=1, column=1, pady=2)
+
+        status = ttk.Label(win, text='')
+
+        def refresh():
+            tree.delete(*tree.get_children())
+            snapshot = self.engine.faq.snapshot
+            start = max(len(snapshot.ids) - EDITOR_ROWS, 0)
+            for pos in range(len(snapshot.ids) - 1, start - 1, -1):
+                tree.insert('', tk.END, iid=str(snapshot.ids[pos]),
+                            values=(snapshot.questions[pos], snapshot.answers[pos]))
+            shown = f' (최근 {EDITOR_ROWS}개만 표시)' if start else ''
+            status.config(text=f'FAQ {len(snapshot.ids)}개{shown}')
+
+        def on_select(event):
+            selected = tree.selection()
+            if not selected:
+                return
+            question, answer = tree.item(selected[0], 'values')
+            question_entry.delete(0, tk.END)
+            question_entry.insert(0, question)
+            answer_entry.delete(0, tk.END)
+            answer_entry.insert(0, answer)
+
+        def save(sql, params):
+            conn = sqlite3.connect(DB_PATH)
+            try:
+                conn.execute(sql, params)
+                conn.commit()
+            except sqlite3.IntegrityError:
+                messagebox.showwarning('중복 질문', '같은 질문이 이미 있습니다.', parent=win)
+                return
+            except sqlite3.OperationalError as e:
+                # 다른 프로그램(서버, 대량 가져오기 등)이 DB에 쓰는 중이면 잠겨 있을 수 있습니다.
+                messagebox.showwarning('저장 실패', f'지금은 FAQ를 저장할 수 없습니다. 잠시 후 다시 시도하세요.\n({e})',
+                                       parent=win)
+                return
+            finally:
+                conn.close()
+            self.engine.sync_changes()
+            refresh()
+
+        def add():
+            question, answer = question_entry.get().strip(), answer_entry.get().strip()
+            if not question or not answer:
+                messagebox.showwarning('입력 오류', '질문과 답변을 모두 입력하세요.', parent=win)
+                return
+            save('INSERT INTO faq (question, answer, question_hash) VALUES (?, ?, ?)',
+                 (question, answer, question_hash(question)))
+
+        def update():
+            selected = tree.selection()
+            question, answer = question_entry.get().strip(), answer_entry.get().strip()
+            if not selected or not question or not answer:
+                messagebox.showwarning('입력 오류', '수정할 FAQ를 선택하고 질문과 답변을 입력하세요.', parent=win)
+                return
+            save('UPDATE faq SET question = ?, answer = ?, question_hash = ? WHERE id = ?',
+                 (question, answer, question_hash(question), int(selected[0])))
+
+        def delete():
+            selected = tree.selection()
+            if not selected:
+                return
+            if messagebox.askyesno('삭제 확인', '선택한 FAQ를 삭제할까요?', parent=win):
+                save('DELETE FROM faq WHERE id = ?', (int(selected[0]),))
+
+        def import_file():
+            # 대량 가져오기는 작업 스레드에서 하고, 끝나면 인덱스를 한 번만 다시 만듭니다.
+            # 가져오는 동안은 DB에 쓰기 잠금이 걸려 있으므로 편집 버튼도 막아 둡니다.
+            path = filedialog.askopenfilename(parent=win, title='FAQ 파일 선택',
+                                              filetypes=[('FAQ 파일', '*.csv *.xlsx'), ('모든 파일', '*.*')])
+            if not path:
+                return
+            for button in edit_buttons:
+                button.config(state='disabled')
+            job = {'read': 0, 'result': None, 'error': None}
+
+            def run():
+                try:
+                    job['result'] = import_faq(DB_PATH, path, progress=lambda n: job.update(read=n))
+                except Exception as e:
+                    job['error'] = e
+
+            def check():
+                if worker.is_alive():
+                    status.config(text=f'가져오는 중... {job["read"]:,}행')
+                    win.after(200, check)
+                    return
+                for button in edit_buttons:
+                    button.config(state='normal')
+                if job['error'] is not None:
+                    messagebox.showerror('가져오기 실패', str(job['error']), parent=win)
+                    refresh()
+                    return
+                result = job['result']
+                self.engine.sync_changes()
+                refresh()
+                messagebox.showinfo('가져오기 완료', f"{result['read']:,}행 중 {result['inserted']:,}행 추가, "
+                                    f"중복 {result['skipped']:,}행 건너뜀\n검색 인덱스는 백그라운드에서 다시 만듭니다.",
+                                    parent=win)
+
+            worker = threading.Thread(target=run, daemon=True)
+            worker.start()
+            check()
+
+        tree.bind('<<TreeviewSelect>>', on_select)
+        buttons = ttk.Frame(win)
+        buttons.pack(pady=5)
+        edit_buttons = [ttk.Button(buttons, text='추가', command=add),
+                        ttk.Button(buttons, text='수정', command=update),
+                        ttk.Button(buttons, text='삭제', command=delete),
+                        ttk.Button(buttons, text='파일에서 가져오기', command=import_file)]
+        for button in edit_buttons:
+            button.pack(side='left', padx=5)
+        status.pack(pady=(0, 10))
+        refresh()
 
 if __name__ == '__main__':
-    init_db()
     app = FAQChatbotApp()
     app.mainloop() 
\ No newline at end of file
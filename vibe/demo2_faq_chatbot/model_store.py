@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import numpy as np
+import scipy.sparse as sp
+
+# 학습된 TF-IDF 모델(어휘, IDF, 질문 행렬)을 디스크에 저장해 두고
+# FAQ 테이블 내용이 그대로이면 다시 학습하지 않고 불러옵니다.
+MODEL_DIR = 'faq_model'
+# 벡터화 설정이 바뀌면 올려서 예전 캐시를 쓰지 않게 합니다.
+MODEL_VERSION = 3
+
+
+def faq_fingerprint(ids, questions, tag=''):
+    # FAQ (id, 질문) 목록의 내용 해시. 질문이 추가/수정/삭제되거나 tag(토크나이저 이름)가 바뀌면 달라집니다.
+    h = hashlib.sha256(f'v{MODEL_VERSION}\x1f{tag}'.encode())
+    for faq_id, question in zip(ids, questions):
+        h.update(f'{faq_id}\x1f{question}\x1e'.encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _paths(model_dir, key):
+    base = os.path.join(model_dir, f'tfidf_{key}')
+    return base + '.npz', base + '.json'
+
+
+def save_model(model_dir, key, vectorizer, matrix, ids, drift=None, threshold=None):
+    # 임시 파일에 쓴 뒤 교체하므로 중간에 끊겨도 깨진 캐시가 남지 않습니다.
+    # drift: 증분 변경한 모델이면 마지막 학습 이후의 변화량 (새로 학습한 모델이면 None)
+    # threshold: 이 모델로 답변을 인정하는 최소 유사도
+    os.makedirs(model_dir, exist_ok=True)
+    matrix_path, meta_path = _paths(model_dir, key)
+    meta = {
+        'version': MODEL_VERSION,
+        'ids': [int(i) for i in ids],
+        'vocabulary': {term: int(pos) for term, pos in vectorizer.vocabulary_.items()},
+        'idf': vectorizer.idf_.tolist(),
+        'drift': drift,
+        'threshold': threshold,
+    }
+    tmp_matrix = matrix_path + '.tmp.npz'
+    tmp_meta = meta_path + '.tmp'
+    sp.save_npz(tmp_matrix, sp.csr_matrix(matrix), compressed=False)
+    with open(tmp_meta, 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False)
+    os.replace(tmp_matrix, matrix_path)
+    os.replace(tmp_meta, meta_path)
+    remove_models(model_dir, keep=key)
+
+
+def load_model(model_dir, key, vectorizer, threshold=None):
+    # 저장된 모델이 있으면 vectorizer에 어휘/IDF를 채우고 (행렬, id 목록, 변화량)을 돌려줍니다.
+    # 없거나 읽을 수 없거나, 함께 저장된 최소 유사도가 threshold와 다르면(다시 맞춘 경우) None
+    matrix_path, meta_path = _paths(model_dir, key)
+    if not (os.path.exists(matrix_path) and os.path.exists(meta_path)):
+        return None
+    try:
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') != MODEL_VERSION or meta.get('threshold') != threshold:
+            return None
+        matrix = sp.load_npz(matrix_path).tocsr()
+    except (OSError, ValueError, KeyError):
+        return None
+    vectorizer.vocabulary_ = meta['vocabulary']
+    vectorizer.idf_ = np.asarray(meta['idf'], dtype=np.float64)
+    return matrix, meta['ids'], meta.get('drift')
+
+
+def remove_models(model_dir, keep=None):
+    # keep 이외의 저장된 모델 파일을 지웁니다.
+    if not os.path.isdir(model_dir):
+        return
+    for name in os.listdir(model_dir):
+        if not name.startswith('tfidf_'):
+            continue
+        if keep is not None and name in (f'tfidf_{keep}.npz', f'tfidf_{keep}.json'):
+            continue
+        try:
+            os.remove(os.path.join(model_dir, name))
+        except OSError:
+            pass
@@ -0,0 +1,43 @@
+import numpy as np
+from sklearn.preprocessing import normalize
+
+
+class FAQRetriever:
+    # TF-IDF 행렬을 한 번만 L2 정규화해 두고, 질문 벡터와의 희소 내적으로 점수를 매깁니다.
+    # (정규화된 벡터의 내적 = 코사인 유사도)
+    # normalized=True면 이미 정규화된 행렬로 보고 그대로 씁니다.
+    def __init__(self, vectorizer, matrix, normalized=False):
+        self.vectorizer = vectorizer
+        self.matrix = matrix.tocsr() if normalized else normalize(matrix.tocsr(), norm='l2', copy=True)
+        # 질문(행) x FAQ(열) 점수를 희소 곱셈 한 번으로 구하기 위해 전치 행렬을 준비합니다.
+        self.matrix_t = self.matrix.T.tocsr()
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def score(self, queries):
+        # 질문 목록의 점수 행렬 (희소, 질문 수 x FAQ 수)
+        query_matrix = normalize(self.vectorizer.transform(queries), norm='l2')
+        return (query_matrix @ self.matrix_t).tocsr()
+
+    def search(self, queries, k=5):
+        # 질문마다 점수 상위 k개를 [(FAQ 위치, 점수), ...]로 돌려줍니다. (점수 내림차순)
+        # 0점이 아닌 항목만 보면 되므로 희소 결과의 행마다 argpartition을 합니다.
+        scores = self.score(queries)
+        results = []
+        for i in range(scores.shape[0]):
+            start, end = scores.indptr[i], scores.indptr[i + 1]
+            data = scores.data[start:end]
+            indices = scores.indices[start:end]
+            if len(data) > k:
+                top = np.argpartition(-data, k - 1)[:k]
+                data, indices = data[top], indices[top]
+            # 점수가 같으면 앞쪽 FAQ를 먼저 (기존 argmax와 같은 순서)
+            order = np.lexsort((indices, -data))
+            results.append([(int(indices[j]), float(data[j])) for j in order])
+        return results
+
+    def best(self, query):
+        # 가장 점수가 높은 (FAQ 위치, 점수). 겹치는 단어가 없으면 None
+        results = self.search([query], k=1)[0]
+        return results[0] if results else None
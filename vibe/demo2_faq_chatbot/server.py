@@ -0,0 +1,163 @@
+import argparse
+import json
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+from engine import ANN_MODE, DB_PATH, TOP_K, TOKENIZER, FAQEngine, init_db
+from faq_index import ANN_MODES
+from tokenizer import TOKENIZERS
+
+# GUI 없이 FAQ 답변을 HTTP로 제공하는 서버 (웹 프론트엔드, 부하 테스트용)
+#   GET  /ask?q=질문[&k=3]        POST /ask  {"question": "...", "k": 3}
+#   GET  /health                   GET  /stats (최근 요청 지연 시간 통계, 인덱스/캐시 상태)
+# 요청마다 스레드가 하나씩 붙고, 모든 스레드가 엔진의 읽기 전용 인덱스(snapshot)를 함께 씁니다.
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8000
+# FAQ 변경 내역을 확인하는 주기(초)
+SYNC_SECONDS = 1.0
+# 지연 시간 통계에 쓰는 최근 요청 수
+LATENCY_WINDOW = 1000
+
+
+class LatencyStats:
+    # 최근 요청들의 처리 시간(ms)을 모아 요약합니다.
+    def __init__(self, window=LATENCY_WINDOW):
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.total = 0
+
+    def add(self, ms):
+        with self._lock:
+            self._samples.append(ms)
+            self.total += 1
+
+    def summary(self):
+        with self._lock:
+            samples = sorted(self._samples)
+            total = self.total
+        if not samples:
+            return {'requests': total, 'window': 0}
+
+        def pct(p):
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 3)
+        return {
+            'requests': total,
+            'window': len(samples),
+            'avg_ms': round(sum(samples) / len(samples), 3),
+            'p50_ms': pct(0.5),
+            'p95_ms': pct(0.95),
+            'p99_ms': pct(0.99),
+            'max_ms': round(samples[-1], 3),
+        }
+
+
+class FAQRequestHandler(BaseHTTPRequestHandler):
+    # server.engine, server.stats를 씁니다.
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path == '/ask':
+            self._ask(params.get('q', [''])[0], params.get('k', [TOP_K])[0])
+        elif url.path == '/health':
+            self._send(200, {'status': 'ok', 'faq_count': len(self.server.engine.faq.snapshot.ids)})
+        elif url.path == '/stats':
+            self._send(200, dict(self.server.stats.summary(), engine=self.server.engine.diagnostics()))
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if urlparse(self.path).path != '/ask':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            body = json.loads(self.rfile.read(length) or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            self._send(400, {'error': 'invalid JSON'})
+            return
+        if not isinstance(body, dict):
+            self._send(400, {'error': 'JSON body must be an object'})
+            return
+        self._ask(str(body.get('question', '')), body.get('k', TOP_K))
+
+    def _ask(self, question, k):
+        start = time.perf_counter()
+        question = question.strip()
+        try:
+            k = max(1, int(k))
+        except (TypeError, ValueError):
+            self._send(400, {'error': 'k must be an integer'})
+            return
+        if not question:
+            self._send(400, {'error': 'question is required'})
+            return
+        result = self.server.engine.answer(question, k=k, log=self.server.log_history)
+        latency_ms = (time.perf_counter() - start) * 1000
+        self.server.stats.add(latency_ms)
+        result['latency_ms'] = round(latency_ms, 3)
+        self._send(200, result, latency_ms)
+
+    def _send(self, status, payload, latency_ms=None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if latency_ms is not None:
+            self.send_header('X-Response-Time-ms', f'{latency_ms:.3f}')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # 요청마다 콘솔에 찍으면 부하 테스트가 느려지므로 기본 접근 로그는 끕니다.
+        pass
+
+
+class FAQServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, engine, log_history=True):
+        super().__init__(address, FAQRequestHandler)
+        self.engine = engine
+        self.log_history = log_history
+        self.stats = LatencyStats()
+
+
+def sync_loop(engine, stop):
+    # FAQ 변경 내역 반영은 이 스레드에서만 합니다. (요청 스레드는 읽기만 함)
+    while not stop.wait(SYNC_SECONDS):
+        engine.sync_changes()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='FAQ 챗봇 HTTP 서버')
+    parser.add_argument('--host', default=DEFAULT_HOST)
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--db', default=DB_PATH)
+    parser.add_argument('--tokenizer', default=TOKENIZER, choices=sorted(TOKENIZERS))
+    parser.add_argument('--ann', default=ANN_MODE, choices=ANN_MODES, help='근사 검색 사용 (auto: FAQ가 아주 많을 때만, 기본은 사용 안 함)')
+    parser.add_argument('--no-history', action='store_true', help='답변 이력을 저장하지 않음 (부하 테스트용)')
+    args = parser.parse_args()
+
+    init_db(args.db)
+    engine = FAQEngine(args.db, tokenizer=args.tokenizer, log_history=not args.no_history, ann=args.ann)
+    engine.load()
+    server = FAQServer((args.host, args.port), engine, log_history=not args.no_history)
+    stop = threading.Event()
+    syncer = threading.Thread(target=sync_loop, args=(engine, stop), daemon=True)
+    syncer.start()
+    print(f'FAQ 서버 실행 중: http://{args.host}:{server.server_port}/ask?q=... (FAQ {len(engine.faq.snapshot.ids)}개)')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        stop.set()
+        syncer.join()
+        engine.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+import re
+from functools import lru_cache
+
+# TF-IDF에 넣을 토큰을 만드는 분석기 모음
+# - char_ngram (기본): 단어 + 단어 안의 글자(음절) n-그램. "파이썬이란"에서도 "파이썬"이 나오므로
+#   조사가 붙은 한국어 질문끼리도 맞춰집니다. 영문/숫자로만 된 단어는 n-그램을 만들지 않습니다.
+#   ("class"와 "pass"가 "as", "ss"로 비슷하다고 나오는 것을 막음)
+# - word: 정규식으로 자른 단어
+# - nltk: nltk.word_tokenize (처음 쓸 때만 nltk를 불러오고 punkt를 내려받습니다)
+DEFAULT_TOKENIZER = 'char_ngram'
+NGRAM_RANGE = (2, 3)
+# 같은 질문의 토큰 목록을 다시 만들지 않도록 기억해 두는 개수
+TOKEN_CACHE_SIZE = 8192
+# 토크나이저별로 답변으로 인정하는 최소 유사도 (글자 n-그램은 부분만 겹쳐도 점수가 나오므로 조금 높게)
+# 바꾸면 저장된 모델을 다시 학습해 새 값과 함께 저장합니다. (model_store.py)
+SIMILARITY_THRESHOLDS = {
+    'char_ngram': 0.35,
+    'word': 0.3,
+    'nltk': 0.3,
+}
+
+WORD_RE = re.compile(r'\w+')
+
+
+def _words(text):
+    return WORD_RE.findall(text.lower())
+
+
+def _char_ngrams(text):
+    tokens = []
+    low, high = NGRAM_RANGE
+    for word in _words(text):
+        tokens.append(word)
+        if word.isascii():
+            continue
+        for n in range(low, min(high, len(word) - 1) + 1):
+            tokens.extend(word[i:i + n] for i in range(len(word) - n + 1))
+    return tokens
+
+
+def _nltk_words(text):
+    import nltk
+    try:
+        nltk.data.find('tokenizers/punkt')
+    except LookupError:
+        nltk.download('punkt')
+    return [token.lower() for token in nltk.word_tokenize(text)]
+
+
+TOKENIZERS = {
+    'char_ngram': _char_ngrams,
+    'word': _words,
+    'nltk': _nltk_words,
+}
+
+
+@lru_cache(maxsize=None)
+def get_analyzer(name=DEFAULT_TOKENIZER):
+    # TfidfVectorizer(analyzer=...)에 넘길 함수. 결과는 질문 문자열별로 캐시됩니다.
+    if name not in TOKENIZERS:
+        raise ValueError(f'알 수 없는 토크나이저: {name}')
+    return lru_cache(maxsize=TOKEN_CACHE_SIZE)(lambda text: tuple(TOKENIZERS[name](text)))
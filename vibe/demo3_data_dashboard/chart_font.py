@@ -0,0 +1,51 @@
+import shutil
+import subprocess
+from functools import lru_cache
+import matplotlib
+from matplotlib import font_manager
+
+# 그래프에 쓸 한글 글꼴 찾기 (프로그램마다 한 번만 찾고 결과를 기억합니다)
+# - matplotlib이 저장해 둔 글꼴 목록(fontlist 캐시)에서 잘 알려진 한글 글꼴을 순서대로 찾습니다.
+#   (윈도우: 맑은 고딕, macOS: 애플고딕, 리눅스: 나눔고딕/Noto Sans CJK 등)
+# - 목록에 없으면 fontconfig(fc-list, 리눅스)로 한글을 지원하는 글꼴 파일을 찾아 등록합니다.
+# - 그래도 없으면 기본 글꼴을 그대로 씁니다. (한글이 네모로 보일 수 있음)
+KOREAN_FONTS = ('Malgun Gothic', 'AppleGothic', 'Apple SD Gothic Neo', 'NanumGothic', 'NanumBarunGothic',
+                'Noto Sans CJK KR', 'Noto Sans KR', 'UnDotum', 'Baekmuk Gulim')
+FC_LIST_TIMEOUT = 5
+
+
+@lru_cache(maxsize=None)
+def korean_font_name():
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    for name in KOREAN_FONTS:
+        if name in installed:
+            return name
+    return _fontconfig_font()
+
+
+def _fontconfig_font():
+    fc_list = shutil.which('fc-list')
+    if fc_list is None:
+        return None
+    try:
+        output = subprocess.run([fc_list, ':lang=ko', 'file'], capture_output=True, text=True,
+                                timeout=FC_LIST_TIMEOUT).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    for path in sorted(line.strip().rstrip(':') for line in output.splitlines() if line.strip()):
+        try:
+            font_manager.fontManager.addfont(path)
+            return font_manager.FontProperties(fname=path).get_name()
+        except (OSError, RuntimeError, ValueError):
+            continue
+    return None
+
+
+def use_korean_font():
+    # 찾은 한글 글꼴을 기본 글꼴로 정합니다. 반환값: 글꼴 이름 (못 찾으면 None)
+    name = korean_font_name()
+    if name is not None:
+        matplotlib.rcParams['font.family'] = name
+    # 한글 글꼴에는 유니코드 빼기 기호가 없는 경우가 많습니다.
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return name
@@ -1,20 +1,33 @@
+import importlib
 import os
+import sys
+import threading
+import time
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-import pandas as pd
-import matplotlib
-import matplotlib.pyplot as plt
-from matplotlib import font_manager
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-
-matplotlib.use('TkAgg')
-
-font_path = 'C:/Windows/Fonts/malgun.ttf'  # 윈도우 기본 맑은 고딕 경로
-fontprop = font_manager.FontProperties(fname=font_path)
-plt.rcParams['font.family'] = fontprop.get_name()
-plt.rcParams['axes.unicode_minus'] = False
+# 여러 데모가 함께 쓰는 모듈 (vibe/shared)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, 'shared'))
+from lazy_import import lazy_module
+import instrument
+from perf_window import bind_perf_window
 
 DATA_FILE = 'staff_dummy.csv'
+# 불러오기/내보내기 중 진행률을 확인하는 주기(ms)
+LOAD_POLL_MS = 100
+EXPORT_TEXT = '파일로 내보내기'
+# pandas/matplotlib을 쓰는 모듈은 창을 먼저 띄운 뒤 불러오기 작업 스레드에서 불러옵니다. (시작 시간 단축)
+# 표와 그래프는 이 모듈들이 준비되면 만들고, 함수는 staff_cube.StaffCube처럼 모듈 이름을 붙여서 씁니다.
+# (pyplot은 쓰지 않고 Figure를 Tk 캔버스에 바로 붙입니다)
+PRELOAD_MODULES = ('staff_loader', 'staff_cube', 'virtual_table', 'staff_chart', 'chart_font',
+                   'matplotlib.figure', 'matplotlib.backends.backend_tkagg', 'table_export')
+staff_loader = lazy_module('staff_loader')
+staff_cube = lazy_module('staff_cube')
+virtual_table = lazy_module('virtual_table')
+staff_chart = lazy_module('staff_chart')
+chart_font = lazy_module('chart_font')
+mpl_figure = lazy_module('matplotlib.figure')
+mpl_backend = lazy_module('matplotlib.backends.backend_tkagg')
+table_export = lazy_module('table_export')
 
 
 class StaffDashboardApp(tk.Tk):
@@ -24,13 +37,26 @@ class StaffDashboardApp(tk.Tk):
         self.geometry('1400x900')
         self.resizable(False, False)
         self.df = None
-        self.filtered_df = None
+        # 필터는 데이터를 복사하지 않고 조건({컬럼: 값})과 맞는 행 번호(rows, None이면 전체)만 바꿉니다.
+        self.cube = None
+        self.filters = {}
+        self.rows = None
+        # 표와 그래프 (모듈이 준비되면 create_views에서 만듭니다)
+        self.table = None
+        self.chart = None
+        # 진행 중인 내보내기 작업 (없으면 None)
+        self.export_job = None
         self.create_widgets()
+        # 숨은 성능 기록 창 (핸들러별 처리 시간, Ctrl+Shift+D)
+        bind_perf_window(self)
         self.load_data()
         self.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def on_close(self):
-        plt.close('all')
+        if self.export_job is not None:
+            self.export_job['cancel'] = True
+        if self.chart is not None:
+            self.chart.cancel()
         self.destroy()
 
     def create_widgets(self):
@@ -61,9 +87,14 @@ class StaffDashboardApp(tk.Tk):
         ttk.Button(filter_frame, text='초기화',
                    command=self.reset_filter).pack(
             side='left', padx=5)
-        ttk.Button(filter_frame, text='Excel로 내보내기',
-                   command=self.export_excel).pack(
-            side='right', padx=5)
+        self.export_btn = ttk.Button(filter_frame, text=EXPORT_TEXT,
+                                     command=self.export_excel)
+        self.export_btn.pack(side='right', padx=5)
+        # 데이터 불러오기/내보내기 진행률
+        self.load_progress = ttk.Progressbar(filter_frame, length=150, maximum=1.0)
+        self.load_progress.pack(side='right', padx=5)
+        self.load_status = ttk.Label(filter_frame, text='')
+        self.load_status.pack(side='right', padx=5)
 
         # 그래프 옵션 체크박스
         chart_frame = ttk.LabelFrame(
@@ -83,162 +114,206 @@ class StaffDashboardApp(tk.Tk):
             command=self.update_stats_and_chart).pack(side='left', padx=10)
 
         # 중단: 표(데이터 테이블)
-        table_frame = ttk.LabelFrame(self, text='교직원 데이터', padding=10)
-        table_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        columns = ['이름', '부서', '직급', '입사년도', '성별', '나이']
-        self.tree = ttk.Treeview(
-            table_frame, columns=columns,
-            show='headings', height=10)
-        for col in columns:
-            self.tree.heading(col, text=col)
-            self.tree.column(col, width=100)
-        self.tree.pack(fill='both', expand=True)
+        self.table_frame = ttk.LabelFrame(self, text='교직원 데이터', padding=10)
+        self.table_frame.pack(fill='both', expand=True, padx=10, pady=5)
 
         # 하단: 통계/차트
-        stat_frame = ttk.LabelFrame(self, text='통계 및 시각화', padding=10)
-        stat_frame.pack(fill='both', expand=True, padx=10, pady=5)
-        self.stat_text = tk.Text(stat_frame, height=7, width=60)
+        self.stat_frame = ttk.LabelFrame(self, text='통계 및 시각화', padding=10)
+        self.stat_frame.pack(fill='both', expand=True, padx=10, pady=5)
+        self.stat_text = tk.Text(self.stat_frame, height=7, width=60)
         self.stat_text.pack(side='left', fill='y', padx=5)
-        self.fig, self.ax = plt.subplots(figsize=(10, 5))
-        self.canvas = FigureCanvasTkAgg(self.fig, master=stat_frame)
+
+    def create_views(self):
+        # 보이는 행만 그리는 표 (컬럼 제목을 누르면 정렬)
+        columns = ['이름', '부서', '직급', '입사년도', '성별', '나이']
+        self.table = virtual_table.VirtualTable(self.table_frame, columns, column_width=100, height=10)
+        self.table.pack(fill='both', expand=True)
+        self.fig = mpl_figure.Figure(figsize=(10, 5))
+        self.ax = self.fig.subplots()
+        self.canvas = mpl_backend.FigureCanvasTkAgg(self.fig, master=self.stat_frame)
         self.canvas.get_tk_widget().pack(side='left', fill='both', expand=True)
+        # 막대를 다시 만들지 않고 높이만 바꾸는 차트 (빠른 연속 클릭은 한 번으로 모아서 그림)
+        self.chart = staff_chart.StaffChart(self.fig, self.ax, self.canvas)
 
     def load_data(self):
-        if not os.path.exists(DATA_FILE):
-            messagebox.showerror('오류', f'{DATA_FILE} 파일이 없습니다.')
-            return
-        self.df = pd.read_csv(DATA_FILE)
-        self.filtered_df = self.df.copy()
-        self.update_filter_options()
-        self.update_table()
-        self.update_stats_and_chart()
+        # 작업 스레드에서 모듈을 불러온 뒤(그동안 창은 먼저 보임) 데이터를 나눠 읽고,
+        # 앞부분은 다 읽기 전에 표에 먼저 보여줍니다.
+        # 필터/통계는 전체를 다 읽고 색인(큐브)을 만든 뒤부터 동작합니다.
+        job = {'progress': 0.0, 'rows': 0, 'views': False, 'preview': None, 'result': None, 'error': None}
+        started = time.perf_counter()
+
+        def run():
+            try:
+                for name in PRELOAD_MODULES:
+                    importlib.import_module(name)
+                # 한글 글꼴은 그래프를 만들기 전에 한 번만 찾습니다.
+                chart_font.use_korean_font()
+            except Exception as e:
+                job['error'] = f'프로그램 모듈을 불러오지 못했습니다.\n{e}'
+                return
+            job['views'] = True
+            if not os.path.exists(DATA_FILE):
+                job['error'] = f'{DATA_FILE} 파일이 없습니다.'
+                return
+            try:
+                with instrument.measure('load_data'):
+                    df = staff_loader.read_staff_csv(
+                        DATA_FILE, progress=lambda p, n: job.update(progress=p, rows=n),
+                        preview=lambda df: job.update(preview=df))
+                    job['result'] = (df, staff_cube.StaffCube(df))
+                    instrument.rows(len(df))
+            except Exception as e:
+                job['error'] = f'{DATA_FILE} 파일을 읽지 못했습니다.\n{e}'
+
+        def check():
+            if job['views'] and self.table is None:
+                self.create_views()
+            if job['preview'] is not None:
+                self.table.set_frame(job['preview'])
+                job['preview'] = None
+            self.load_progress['value'] = job['progress']
+            if worker.is_alive():
+                self.load_status.config(text=f"불러오는 중... {job['rows']:,}행")
+                self.after(LOAD_POLL_MS, check)
+                return
+            if job['error'] is not None:
+                self.load_status.config(text='불러오기 실패')
+                messagebox.showerror('오류', job['error'])
+                return
+            self.df, self.cube = job['result']
+            self.filters = {}
+            self.rows = None
+            self.table.set_frame(self.df)
+            self.update_filter_options()
+            self.update_stats_and_chart()
+            self.load_progress['value'] = 1.0
+            self.load_status.config(text=f'{len(self.df):,}명 ({time.perf_counter() - started:.1f}초)')
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        self.load_status.config(text='불러오는 중...')
+        check()
 
     def update_filter_options(self):
-        self.dept_combo['values'] = ['전체'] + sorted(self.df['부서'].unique())
-        self.rank_combo['values'] = ['전체'] + sorted(self.df['직급'].unique())
-        self.gender_combo['values'] = ['전체'] + sorted(self.df['성별'].unique())
+        self.dept_combo['values'] = ['전체'] + self.cube.categories['부서']
+        self.rank_combo['values'] = ['전체'] + self.cube.categories['직급']
+        self.gender_combo['values'] = ['전체'] + self.cube.categories['성별']
         self.dept_combo.set('전체')
         self.rank_combo.set('전체')
         self.gender_combo.set('전체')
 
+    @instrument.timed()
     def apply_filter(self):
-        df = self.df.copy()
-        if self.dept_var.get() != '전체':
-            df = df[df['부서'] == self.dept_var.get()]
-        if self.rank_var.get() != '전체':
-            df = df[df['직급'] == self.rank_var.get()]
-        if self.gender_var.get() != '전체':
-            df = df[df['성별'] == self.gender_var.get()]
-        self.filtered_df = df
+        if self.cube is None:
+            return
+        filters = {}
+        for col, var in (('부서', self.dept_var), ('직급', self.rank_var), ('성별', self.gender_var)):
+            if var.get() and var.get() != '전체':
+                filters[col] = var.get()
+        self.filters = filters
+        self.rows = self.cube.select(filters)
+        instrument.rows(len(self.df) if self.rows is None else len(self.rows))
         self.update_table()
         self.update_stats_and_chart()
 
+    @instrument.timed()
     def reset_filter(self):
-        self.filtered_df = self.df.copy()
+        if self.cube is None:
+            return
+        self.filters = {}
+        self.rows = None
         self.update_filter_options()
         self.update_table()
         self.update_stats_and_chart()
 
+    @instrument.timed()
     def update_table(self):
-        for row in self.tree.get_children():
-            self.tree.delete(row)
-        for _, row in self.filtered_df.iterrows():
-            self.tree.insert('', 'end', values=list(row))
+        self.table.set_rows(self.rows)
+        instrument.rows(len(self.df) if self.rows is None else len(self.rows))
 
+    @instrument.timed()
     def update_stats_and_chart(self):
-        df = self.filtered_df.copy()
+        # 통계와 그래프는 행을 다시 훑지 않고 미리 계산한 큐브에서 가져옵니다.
+        if self.cube is None:
+            return
+        cube, filters = self.cube, self.filters
         self.stat_text.config(state='normal')
         self.stat_text.delete(1.0, tk.END)
         self.stat_text.insert(
-            tk.END, f'총 인원: {len(df)}명\n')
+            tk.END, f'총 인원: {cube.total(filters)}명\n')
         self.stat_text.insert(
-            tk.END, f"부서별 인원: {df['부서'].value_counts().to_dict()}\n")
+            tk.END, f"부서별 인원: {cube.value_counts('부서', filters).to_dict()}\n")
         self.stat_text.insert(
-            tk.END, f"직급별 인원: {df['직급'].value_counts().to_dict()}\n")
+            tk.END, f"직급별 인원: {cube.value_counts('직급', filters).to_dict()}\n")
         self.stat_text.insert(
-            tk.END, f"성별 인원: {df['성별'].value_counts().to_dict()}\n")
+            tk.END, f"성별 인원: {cube.value_counts('성별', filters).to_dict()}\n")
         self.stat_text.insert(
-            tk.END, f"평균 나이: {df['나이'].mean():.1f}세\n")
+            tk.END, f"평균 나이: {cube.mean('나이', filters):.1f}세\n")
         self.stat_text.insert(
-            tk.END, f"평균 입사년도: {df['입사년도'].mean():.0f}년\n")
+            tk.END, f"평균 입사년도: {cube.mean('입사년도', filters):.0f}년\n")
         self.stat_text.config(state='disabled')
-        # 차트 옵션별 시각화
-        self.ax.clear()
+        # 차트 옵션별 시각화 (그리기는 StaffChart가 모아서 한 번에)
+        self.chart.request(lambda: staff_chart.chart_spec(self.cube, self.filters, self.group_columns()))
+
+    def group_columns(self):
         group_cols = []
         if self.opt_dept.get():
             group_cols.append('부서')
         if self.opt_age.get():
-            bins = [0, 29, 39, 200]
-            labels = ['20대', '30대', '40대 이상']
-            df['연령대'] = pd.cut(df['나이'], bins=bins, labels=labels, right=True)
             group_cols.append('연령대')
         if self.opt_gender.get():
             group_cols.append('성별')
-        # 체크박스 모두 해제 시 안내 문구만 표시하고 return
-        if not group_cols:
-            self.ax.text(
-                0.5, 0.5, '옵션을 1개 이상 선택하세요.',
-                ha='center', va='center', fontsize=14
-            )
-            self.canvas.draw()
-            return
-        # 그룹화 및 시각화
-        if self.opt_gender.get() and len(group_cols) > 1:
-            # 성별 포함 + 다른 그룹도 선택: grouped bar chart (남: 파랑, 여: 빨강)
-            groupby_cols = [col for col in group_cols if col != '성별']
-            grouped = df.groupby(groupby_cols + ['성별']).size().unstack(
-                fill_value=0)
-            x_labels = [
-                '/'.join(map(str, idx)) if isinstance(idx, tuple) else str(idx)
-                for idx in grouped.index
-            ]
-            x = range(len(x_labels))
-            width = 0.35
-            self.ax.bar(
-                [i - width/2 for i in x],
-                grouped.get('남', [0]*len(x)),
-                width, label='남', color='royalblue')
-            self.ax.bar(
-                [i + width/2 for i in x],
-                grouped.get('여', [0]*len(x)),
-                width, label='여', color='crimson')
-            self.ax.set_xticks(list(x))
-            self.ax.set_xticklabels(x_labels, rotation=30, ha='right')
-            self.ax.legend()
-            self.ax.set_ylabel('인원수')
-            self.ax.set_title(' / '.join(groupby_cols + ['성별']) + ' 인원수')
-        else:
-            # 성별만 단독 or 성별 미포함: 단일 bar chart
-            grouped = df.groupby(group_cols).size()
-            x_labels = [
-                '/'.join(map(str, idx)) if isinstance(idx, tuple) else str(idx)
-                for idx in grouped.index
-            ]
-            color = [
-                'royalblue' if x == '남' else 'crimson' if x == '여'
-                else 'mediumseagreen' for x in x_labels
-            ]
-            bars = self.ax.bar(x_labels, grouped.values, color=color)
-            # x축 라벨 개수와 bar 개수가 다를 경우 set_xticklabels 생략
-            if len(x_labels) == len(bars):
-                self.ax.set_xticks(range(len(x_labels)))
-                self.ax.set_xticklabels(x_labels, rotation=30, ha='right')
-            self.ax.set_ylabel('인원수')
-            self.ax.set_title(' / '.join(group_cols) + ' 인원수')
-        self.canvas.draw()
+        return group_cols
 
     def export_excel(self):
+        # 저장 중에 한 번 더 누르면 취소합니다.
+        if self.export_job is not None:
+            self.export_job['cancel'] = True
+            return
+        if self.df is None:
+            return
+        # 엑셀 외에 훨씬 빠른 CSV/Parquet도 고를 수 있습니다.
         save_path = filedialog.asksaveasfilename(
             defaultextension='.xlsx',
-            filetypes=[('Excel files', '*.xlsx')],
-            title='Excel로 내보내기')
+            filetypes=[(f'{name} files', f'*{ext}') for ext, name in table_export.export_formats()],
+            title='파일로 내보내기')
         if not save_path:
             return
-        try:
-            self.filtered_df.to_excel(save_path, index=False)
-            messagebox.showinfo('성공', 'Excel 파일로 저장되었습니다!')
-        except Exception:
-            messagebox.showerror('오류', '저장 실패!')
+        # 필터 결과를 표에 보이는 순서(정렬 포함) 그대로, 작업 스레드에서 나눠 씁니다.
+        df, rows = self.df, self.table.visible_rows()
+        job = {'done': 0, 'total': len(rows), 'cancel': False, 'result': None, 'error': None}
+        self.export_job = job
+
+        def run():
+            try:
+                with instrument.measure('export', rows=len(rows)):
+                    job['result'] = table_export.export_dataframe(
+                        df, save_path, rows, progress=lambda done, total: job.update(done=done),
+                        should_cancel=lambda: job['cancel'])
+            except Exception as e:
+                job['error'] = e
+
+        def check():
+            self.load_progress['value'] = job['done'] / job['total'] if job['total'] else 0.0
+            if worker.is_alive():
+                self.load_status.config(text=f"저장 중... {job['done']:,}/{job['total']:,}행")
+                self.after(LOAD_POLL_MS, check)
+                return
+            self.export_job = None
+            self.export_btn.config(text=EXPORT_TEXT)
+            if job['error'] is not None:
+                self.load_status.config(text='저장 실패')
+                messagebox.showerror('오류', f'저장 실패!\n{job["error"]}')
+            elif job['result']:
+                self.load_status.config(text=f"{job['total']:,}행 저장 완료")
+                messagebox.showinfo('성공', f'{os.path.basename(save_path)} 파일로 저장되었습니다!')
+            else:
+                self.load_status.config(text='저장 취소됨')
+
+        worker = threading.Thread(target=run, daemon=True)
+        worker.start()
+        self.export_btn.config(text='내보내기 취소')
+        check()
 
 
 if __name__ == '__main__':
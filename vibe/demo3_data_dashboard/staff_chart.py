@@ -0,0 +1,171 @@
+import numpy as np
+import instrument
+
+# 그룹화 막대그래프를 빠르게 다시 그리는 차트 계층
+# - 막대(Rectangle)는 그룹화 옵션이나 x축 항목이 바뀔 때만 새로 만들고,
+#   필터만 바뀌면 기존 막대의 높이만 바꿉니다. (ax.clear() 없음)
+# - 막대는 animated로 두고 배경을 저장해 두었다가, y축 범위가 그대로면 막대만 다시 그려 붙입니다(blit).
+#   그 밖의 경우에는 draw_idle()로 Tk가 한가할 때 한 번만 그립니다.
+# - request()로 들어온 요청은 CHART_DELAY_MS 동안 모아서 마지막 것 하나만 그립니다.
+#   (체크박스를 빠르게 여러 번 눌러도 한 번만 그림)
+# - 그리기 시간은 성능 기록(instrument)에 chart.render / canvas.draw / chart.blit으로 남습니다.
+CHART_DELAY_MS = 50
+GENDER_COLORS = {'남': 'royalblue', '여': 'crimson'}
+OTHER_COLOR = 'mediumseagreen'
+SPLIT_BAR_WIDTH = 0.35
+BAR_WIDTH = 0.8
+# y축 위쪽 여유 비율. 최댓값이 범위를 넘거나 범위의 절반 아래로 떨어질 때만 y축을 바꿉니다.
+Y_MARGIN = 1.15
+EMPTY_MESSAGE = '옵션을 1개 이상 선택하세요.'
+
+
+def _label(idx):
+    return '/'.join(map(str, idx)) if isinstance(idx, tuple) else str(idx)
+
+
+def chart_spec(cube, filters, group_cols):
+    # 그룹화 옵션에 맞는 그래프 내용(dict)을 큐브에서 만듭니다. (df.groupby를 다시 하지 않음)
+    if not group_cols:
+        return {'message': EMPTY_MESSAGE}
+    if '성별' in group_cols and len(group_cols) > 1:
+        # 성별 포함 + 다른 그룹도 선택: 남/여 막대를 나란히 (남: 파랑, 여: 빨강)
+        groupby_cols = [col for col in group_cols if col != '성별']
+        grouped = cube.counts(groupby_cols + ['성별'], filters).unstack(fill_value=0)
+        labels = [_label(idx) for idx in grouped.index]
+        zeros = np.zeros(len(labels))
+        series = [
+            (gender, grouped[gender].to_numpy() if gender in grouped else zeros,
+             [GENDER_COLORS[gender]] * len(labels), offset, SPLIT_BAR_WIDTH)
+            for gender, offset in (('남', -SPLIT_BAR_WIDTH / 2), ('여', SPLIT_BAR_WIDTH / 2))
+        ]
+        return {'labels': labels, 'series': series, 'legend': True,
+                'title': ' / '.join(groupby_cols + ['성별']) + ' 인원수'}
+    # 성별만 단독 or 성별 미포함: 단일 막대그래프
+    grouped = cube.counts(group_cols, filters)
+    labels = [_label(idx) for idx in grouped.index]
+    colors = [GENDER_COLORS.get(label, OTHER_COLOR) for label in labels]
+    return {'labels': labels, 'series': [(None, grouped.to_numpy(), colors, 0.0, BAR_WIDTH)],
+            'legend': False, 'title': ' / '.join(group_cols) + ' 인원수'}
+
+
+class StaffChart:
+    def __init__(self, fig, ax, canvas, delay_ms=CHART_DELAY_MS):
+        self.fig = fig
+        self.ax = ax
+        self.canvas = canvas
+        self.delay_ms = delay_ms
+        self._layout = None
+        self._containers = []
+        self._bars = []
+        self._message = None
+        self._background = None
+        self._job = None
+        self._make_spec = None
+        self.renders = 0
+        self.blits = 0
+        # draw_idle()이 나중에 부르는 전체 그리기(canvas.draw)도 시간을 잽니다.
+        canvas.draw = instrument.timed('canvas.draw')(canvas.draw)
+        canvas.mpl_connect('draw_event', self._on_draw)
+
+    def request(self, make_spec):
+        # make_spec(): 그릴 때 불러서 그래프 내용을 만드는 함수. 대기 중인 요청은 마지막 것만 남습니다.
+        self._make_spec = make_spec
+        if self._job is None:
+            self._job = self.canvas.get_tk_widget().after(self.delay_ms, self._run)
+
+    def cancel(self):
+        if self._job is not None:
+            self.canvas.get_tk_widget().after_cancel(self._job)
+            self._job = None
+
+    def _run(self):
+        self._job = None
+        self.render(self._make_spec())
+
+    @instrument.timed('chart.render')
+    def render(self, spec):
+        self.renders += 1
+        layout = (spec.get('message'), spec.get('title'), tuple(spec.get('labels', ())),
+                  tuple((name, offset, width) for name, _, _, offset, width in spec.get('series', ())))
+        if layout != self._layout:
+            self._rebuild(spec)
+            self._layout = layout
+            self.canvas.draw_idle()
+            return
+        values = [np.asarray(s[1]) for s in spec['series']]
+        for container, heights in zip(self._containers, values):
+            for rect, height in zip(container, heights):
+                rect.set_height(height)
+        if self._set_ylim(values):
+            self.canvas.draw_idle()
+        else:
+            self._blit()
+
+    def _set_ylim(self, values):
+        # y축 범위를 바꿨으면 True
+        top = max((float(v.max()) for v in values if len(v)), default=0.0)
+        low, high = self.ax.get_ylim()
+        if high > 0 and top <= high and top >= high / 2:
+            return False
+        new_high = max(top * Y_MARGIN, 1.0)
+        if new_high == high:
+            return False
+        self.ax.set_ylim(0, new_high)
+        return True
+
+    def _rebuild(self, spec):
+        # 기존 막대/안내 문구/범례만 지우고 새로 만듭니다.
+        for container in self._containers:
+            container.remove()
+        self._containers = []
+        self._bars = []
+        if self._message is not None:
+            self._message.remove()
+            self._message = None
+        legend = self.ax.get_legend()
+        if legend is not None:
+            legend.remove()
+        ax = self.ax
+        if 'message' in spec:
+            ax.set_xticks([])
+            ax.set_title('')
+            ax.set_ylabel('')
+            ax.set_ylim(0, 1)
+            self._message = ax.text(0.5, 0.5, spec['message'], ha='center', va='center', fontsize=14,
+                                    transform=ax.transAxes)
+            return
+        x = np.arange(len(spec['labels']))
+        for name, heights, colors, offset, width in spec['series']:
+            container = ax.bar(x + offset, heights, width, label=name, color=colors, animated=True)
+            self._containers.append(container)
+            self._bars.extend(container)
+        ax.set_xticks(x)
+        ax.set_xticklabels(spec['labels'], rotation=30, ha='right')
+        ax.set_ylabel('인원수')
+        ax.set_title(spec['title'])
+        if spec['legend']:
+            legend = ax.legend()
+            # 범례 견본은 막대의 animated 속성을 물려받으므로 평소처럼 그려지게 되돌립니다.
+            for handle in getattr(legend, 'legend_handles', None) or legend.legendHandles:
+                handle.set_animated(False)
+        ax.set_ylim(0, 1)
+        self._set_ylim([np.asarray(s[1]) for s in spec['series']])
+
+    def _on_draw(self, event):
+        # 전체를 그릴 때마다 막대를 뺀 배경을 저장하고, 그 위에 막대를 그립니다.
+        self._background = self.canvas.copy_from_bbox(self.ax.bbox)
+        self._draw_bars()
+
+    def _draw_bars(self):
+        for rect in self._bars:
+            self.ax.draw_artist(rect)
+
+    def _blit(self):
+        if self._background is None:
+            self.canvas.draw_idle()
+            return
+        self.blits += 1
+        with instrument.measure('chart.blit'):
+            self.canvas.restore_region(self._background)
+            self._draw_bars()
+            self.canvas.blit(self.ax.bbox)
@@ -0,0 +1,125 @@
+import numpy as np
+import pandas as pd
+
+# 필터와 통계를 빠르게 계산하기 위한 교직원 데이터 색인
+# - 부서/직급/성별/연령대를 정수 코드로 바꾸고, 값마다 해당하는 행 번호 배열을 미리 만들어 둡니다.
+#   필터는 가장 짧은 행 번호 배열에서 시작해 나머지 조건의 코드만 확인합니다. (데이터 복사 없음)
+# - 네 컬럼의 모든 조합별 인원수와 나이/입사년도 합계(group-by 큐브)를 한 번만 계산해 두고,
+#   필터를 바꿔도 통계와 그래프는 큐브를 잘라 더하기만 합니다.
+DIMENSIONS = ('부서', '직급', '성별', '연령대')
+MEASURES = ('나이', '입사년도')
+AGE_BINS = [0, 29, 39, 200]
+AGE_LABELS = ['20대', '30대', '40대 이상']
+
+
+def age_groups(ages):
+    return pd.cut(ages, bins=AGE_BINS, labels=AGE_LABELS, right=True)
+
+
+class StaffCube:
+    def __init__(self, df):
+        self.size = len(df)
+        self.categories = {}
+        self.codes = {}
+        self._rows = {}
+        for dim in DIMENSIONS:
+            values = age_groups(df['나이']) if dim == '연령대' else df[dim]
+            codes, uniques = pd.factorize(values, sort=True)
+            # 값이 비어 있는 행은 마지막 칸(len(uniques))에 모읍니다. 합계에는 들어가고 그룹 목록에서는 빠집니다.
+            codes = np.where(codes < 0, len(uniques), codes).astype(_code_dtype(len(uniques) + 1))
+            self.categories[dim] = list(uniques)
+            self.codes[dim] = codes
+            self._rows[dim] = _rows_by_code(codes, len(uniques) + 1)
+        self.shape = tuple(len(self.categories[dim]) + 1 for dim in DIMENSIONS)
+        cell = np.ravel_multi_index([self.codes[dim] for dim in DIMENSIONS], self.shape)
+        cells = int(np.prod(self.shape))
+        self.count = np.bincount(cell, minlength=cells).reshape(self.shape)
+        self.sums = {}
+        self.valid = {}
+        for col in MEASURES:
+            values = pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+            present = ~np.isnan(values)
+            self.sums[col] = np.bincount(cell[present], weights=values[present], minlength=cells).reshape(self.shape)
+            self.valid[col] = np.bincount(cell[present], minlength=cells).reshape(self.shape)
+
+    def select(self, filters):
+        # filters: {컬럼: 값}. 조건에 맞는 행 번호 배열 (조건이 없으면 None = 전체)
+        if not filters:
+            return None
+        parts = []
+        for dim, value in filters.items():
+            code = self._code(dim, value)
+            if code is None:
+                return np.empty(0, dtype=np.int64)
+            parts.append((len(self._rows[dim][code]), dim, code))
+        parts.sort()
+        _, dim, code = parts[0]
+        rows = self._rows[dim][code]
+        for _, dim, code in parts[1:]:
+            rows = rows[self.codes[dim][rows] == code]
+        return rows
+
+    def _code(self, dim, value):
+        try:
+            return self.categories[dim].index(value)
+        except ValueError:
+            return None
+
+    def _slice(self, cube, filters):
+        # 필터 값이 아닌 칸을 0으로 만든 큐브 (모양은 그대로라 필터 컬럼으로 묶어도 됩니다)
+        if not filters:
+            return cube
+        index = []
+        for dim in DIMENSIONS:
+            if dim in filters:
+                code = self._code(dim, filters[dim])
+                index.append(slice(code, code + 1) if code is not None else slice(0, 0))
+            else:
+                index.append(slice(None))
+        index = tuple(index)
+        sliced = np.zeros_like(cube)
+        sliced[index] = cube[index]
+        return sliced
+
+    def _reduce(self, cube, filters, by=()):
+        # by에 없는 차원은 모두 더해서 by 순서의 배열로 만듭니다.
+        cube = self._slice(cube, filters)
+        axes = tuple(i for i, dim in enumerate(DIMENSIONS) if dim not in by)
+        cube = cube.sum(axis=axes)
+        kept = [dim for dim in DIMENSIONS if dim in by]
+        return np.transpose(cube, [kept.index(dim) for dim in by]) if len(by) > 1 else cube
+
+    def total(self, filters=None):
+        return int(self._reduce(self.count, filters).sum())
+
+    def mean(self, col, filters=None):
+        valid = self._reduce(self.valid[col], filters).sum()
+        return float(self._reduce(self.sums[col], filters).sum() / valid) if valid else float('nan')
+
+    def counts(self, by, filters=None):
+        # by 컬럼 조합별 인원수 Series (인원이 0인 조합과 빈 값은 빠짐, 값 순서대로 정렬)
+        by = list(by)
+        # 마지막 칸(빈 값)은 빼고 펼칩니다.
+        counts = self._reduce(self.count, filters, by)[tuple(slice(0, -1) for _ in by)]
+        if len(by) == 1:
+            index = pd.Index(self.categories[by[0]], name=by[0])
+        else:
+            index = pd.MultiIndex.from_product([self.categories[dim] for dim in by], names=by)
+        series = pd.Series(counts.ravel(), index=index)
+        return series[series > 0]
+
+    def value_counts(self, col, filters=None):
+        # pandas value_counts처럼 인원수가 많은 순서
+        return self.counts([col], filters).sort_values(ascending=False, kind='stable')
+
+
+def _code_dtype(n):
+    return np.int8 if n < 128 else np.int16 if n < 32768 else np.int32
+
+
+def _rows_by_code(codes, n):
+    # 코드별 행 번호 배열 (오름차순). 한 번의 정렬로 만들고 각 배열은 그 결과의 일부분(view)입니다.
+    order = np.argsort(codes, kind='stable').astype(np.int64)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(np.bincount(codes, minlength=n), out=offsets[1:])
+    return [order[offsets[i]:offsets[i + 1]] for i in range(n)]
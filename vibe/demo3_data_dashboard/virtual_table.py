@@ -0,0 +1,219 @@
+from tkinter import ttk
+import numpy as np
+import pandas as pd
+import instrument
+
+# 행이 아주 많아도 빠른 표 (Treeview 가상화)
+# - Treeview에는 화면에 보이는 행 수 + BUFFER_ROWS개의 항목만 만들어 두고,
+#   스크롤하면 그 항목들의 값만 컬럼 배열에서 바꿔 넣습니다. (전체 행을 insert하지 않음)
+# - 스크롤바는 Treeview가 아니라 전체 행 위치(offset)에 연결됩니다.
+# - 컬럼 제목을 누르면 정렬합니다. 컬럼별 정렬 순서는 처음 한 번만 계산해 두고,
+#   필터가 바뀌면 그 순서에서 필터에 맞는 행만 골라냅니다. (다시 정렬하지 않음)
+# - 선택은 Treeview 항목이 아니라 원본 행 번호로 기억해, 스크롤/정렬/필터 뒤에도 보이면 다시 표시합니다.
+#   위/아래 방향키는 선택을 한 행씩 옮기고, 선택이 보이는 범위 끝을 넘어갈 때만 스크롤합니다.
+BUFFER_ROWS = 2
+DEFAULT_ROW_HEIGHT = 20
+SORT_MARKS = {True: ' ▲', False: ' ▼'}
+
+
+class VirtualTable(ttk.Frame):
+    def __init__(self, master, columns, column_width=100, height=10):
+        super().__init__(master)
+        self.columns = list(columns)
+        self.tree = ttk.Treeview(self, columns=self.columns, show='headings', height=height,
+                                 selectmode='browse')
+        for col in self.columns:
+            self.tree.heading(col, text=col, command=lambda c=col: self.sort_by(c))
+            self.tree.column(col, width=column_width)
+        self.scrollbar = ttk.Scrollbar(self, orient='vertical', command=self._on_scrollbar)
+        self.tree.pack(side='left', fill='both', expand=True)
+        self.scrollbar.pack(side='right', fill='y')
+        self._df = None
+        self._arrays = {}
+        self._rows = None
+        self._view = np.empty(0, dtype=np.int64)
+        self._sort_orders = {}
+        self._sort = None
+        self._offset = 0
+        self._items = []
+        # 선택된 원본 행 번호와, refresh가 마지막으로 Treeview에 표시한 선택 항목
+        self._selected = set()
+        self._shown_selection = ()
+        self.tree.bind('<Configure>', lambda e: self._resize())
+        # Treeview가 스스로 스크롤하지 않도록 휠/키 입력을 직접 처리합니다.
+        for seq in ('<MouseWheel>', '<Button-4>', '<Button-5>'):
+            self.tree.bind(seq, self._on_wheel)
+        for key, rows in (('<Up>', -1), ('<Down>', 1)):
+            self.tree.bind(key, lambda e, n=rows: self._move_selection(n))
+        self.tree.bind('<Prior>', lambda e: self._scroll(-self._page_rows()))
+        self.tree.bind('<Next>', lambda e: self._scroll(self._page_rows()))
+        self.tree.bind('<Home>', lambda e: self._scroll(-len(self._view)))
+        self.tree.bind('<End>', lambda e: self._scroll(len(self._view)))
+        self.tree.bind('<<TreeviewSelect>>', lambda e: self._on_select())
+
+    def set_frame(self, df, rows=None):
+        # 새 데이터: 컬럼 배열만 참조하고, 정렬 순서 캐시는 비웁니다.
+        self._df = df
+        self._arrays = {col: df[col].to_numpy() for col in self.columns} if df is not None else {}
+        self._sort_orders = {}
+        self._selected = set()
+        self.set_rows(rows)
+
+    def set_rows(self, rows=None):
+        # 같은 데이터에서 보여줄 행(원본 행 번호 배열, None이면 전체)만 바꿉니다.
+        self._rows = rows
+        self._update_view()
+        self._offset = 0
+        self.refresh()
+
+    def row_count(self):
+        return len(self._view)
+
+    def visible_rows(self):
+        # 현재 정렬 순서대로의 원본 행 번호 배열
+        return self._view
+
+    @instrument.timed('table.sort_by')
+    def sort_by(self, col):
+        # 같은 컬럼을 다시 누르면 오름차순/내림차순을 바꿉니다.
+        ascending = not (self._sort is not None and self._sort[0] == col and self._sort[1])
+        self._sort = (col, ascending)
+        for c in self.columns:
+            self.tree.heading(c, text=c + (SORT_MARKS[ascending] if c == col else ''))
+        self._update_view()
+        instrument.rows(len(self._view))
+        self.refresh()
+
+    def _sort_order(self, col, ascending):
+        # 오름차순 행 순서와 빈 값이 아닌 행 수. 내림차순도 빈 값은 맨 뒤에 둡니다.
+        if col not in self._sort_orders:
+            series = pd.Series(self._arrays[col])
+            order = series.sort_values(kind='stable', na_position='last').index.to_numpy()
+            self._sort_orders[col] = (order, int(series.notna().sum()))
+        order, valid = self._sort_orders[col]
+        if ascending:
+            return order
+        return np.concatenate([order[:valid][::-1], order[valid:]])
+
+    def _update_view(self):
+        n = len(self._df) if self._df is not None else 0
+        if self._sort is None:
+            self._view = np.arange(n) if self._rows is None else np.asarray(self._rows)
+            return
+        col, ascending = self._sort
+        order = self._sort_order(col, ascending)
+        if self._rows is not None:
+            keep = np.zeros(n, dtype=bool)
+            keep[self._rows] = True
+            order = order[keep[order]]
+        self._view = order
+
+    def _row_height(self):
+        height = ttk.Style(self).lookup('Treeview', 'rowheight')
+        try:
+            return int(height) or DEFAULT_ROW_HEIGHT
+        except (TypeError, ValueError):
+            return DEFAULT_ROW_HEIGHT
+
+    def _page_rows(self):
+        # 지금 창 크기에서 보이는 행 수
+        height = self.tree.winfo_height()
+        if height <= 1:
+            return int(self.tree.cget('height'))
+        return max(1, height // self._row_height() - 1)
+
+    def _resize(self):
+        count = self._page_rows() + BUFFER_ROWS
+        if count != len(self._items):
+            self.refresh()
+
+    def _scroll(self, rows):
+        self._set_offset(self._offset + rows)
+        return 'break'
+
+    def _set_offset(self, offset):
+        offset = max(0, min(offset, len(self._view) - self._page_rows()))
+        if offset != self._offset:
+            self._offset = offset
+            self.refresh()
+
+    def _move_selection(self, step):
+        total = len(self._view)
+        if not total:
+            return 'break'
+        pos = self._selected_position()
+        # 선택된 행이 없으면(또는 필터로 빠졌으면) 보이는 첫 행을 선택합니다.
+        pos = self._offset if pos is None else max(0, min(pos + step, total - 1))
+        page = self._page_rows()
+        offset = self._offset
+        if pos < offset:
+            offset = pos
+        elif pos >= offset + page:
+            offset = pos - page + 1
+        self._offset = max(0, min(offset, total - page))
+        self._selected = {int(self._view[pos])}
+        self.refresh()
+        self.tree.focus(self._items[pos - self._offset])
+        return 'break'
+
+    def _selected_position(self):
+        # 선택된 원본 행의 지금 보기(정렬/필터) 안에서의 위치. 없으면 None
+        if not self._selected:
+            return None
+        hits = np.flatnonzero(self._view == next(iter(self._selected)))
+        return int(hits[0]) if len(hits) else None
+
+    def _on_select(self):
+        # 반쯤 보이는 마지막 행을 눌러도 Treeview 자체 스크롤은 맨 위에 고정합니다.
+        self.tree.yview_moveto(0)
+        selection = self.tree.selection()
+        # refresh가 다시 표시한 선택이면 그대로 둡니다. (선택 이벤트는 나중에 한꺼번에 옴)
+        if selection == self._shown_selection:
+            return
+        self._shown_selection = selection
+        positions = [self._offset + self._items.index(item) for item in selection if item in self._items]
+        self._selected = {int(self._view[pos]) for pos in positions if pos < len(self._view)}
+
+    def _on_wheel(self, event):
+        if getattr(event, 'num', None) == 4 or getattr(event, 'delta', 0) > 0:
+            return self._scroll(-3)
+        return self._scroll(3)
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == 'moveto':
+            self._set_offset(int(float(value) * len(self._view)))
+        elif unit == 'pages':
+            self._scroll(int(value) * self._page_rows())
+        else:
+            self._scroll(int(value))
+
+    def refresh(self):
+        # 보이는 행 + 여유 행 개수만큼만 Treeview 항목을 두고 값을 채웁니다.
+        page = self._page_rows()
+        count = page + BUFFER_ROWS
+        while len(self._items) < count:
+            self._items.append(self.tree.insert('', 'end', values=()))
+        while len(self._items) > count:
+            self.tree.delete(self._items.pop())
+        rows = self._view[self._offset:self._offset + count]
+        cells = [_format(self._arrays[col][rows]) for col in self.columns]
+        for i, item in enumerate(self._items):
+            if i < len(rows):
+                self.tree.item(item, values=[column[i] for column in cells])
+            else:
+                self.tree.item(item, values=())
+        # 항목에 들어간 행이 바뀌었으므로 선택된 원본 행이 있는 항목만 다시 선택합니다.
+        selection = tuple(item for item, row in zip(self._items, rows) if row in self._selected)
+        if selection != self.tree.selection():
+            self.tree.selection_set(selection)
+        self._shown_selection = selection
+        total = len(self._view)
+        if total:
+            self.scrollbar.set(self._offset / total, min(1.0, (self._offset + page) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+
+def _format(values):
+    # 빈 값(NaN)은 빈칸으로 보여줍니다.
+    return ['' if pd.isna(v) else str(v) for v in values]
@@ -0,0 +1,49 @@
+import argparse
+import subprocess
+import sys
+
+# 시작 시간 확인용: python -X importtime으로 모듈을 불러오고, 오래 걸린 모듈을 정리해서 보여줍니다.
+# 사용법 (데모 폴더에서): python ../shared/import_profile.py main
+# 표의 시간은 그 모듈이 불러온 하위 모듈까지 포함한 시간(cumulative)입니다.
+TOP_MODULES = 15
+
+
+def import_times(module, python=sys.executable):
+    # [(깊이, 자체 시간 us, 누적 시간 us, 모듈 이름)] (importtime 출력 순서 그대로)
+    result = subprocess.run([python, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((depth, int(self_us), int(cumulative_us), name.strip()))
+    return rows
+
+
+def summary(rows, module, top=TOP_MODULES):
+    # 전체 시간과, module이 직접 불러온 모듈 중 오래 걸린 것
+    # (importtime은 하위 모듈을 먼저 출력하므로 module 행 바로 앞의 깊이 1 행들이 직접 불러온 모듈입니다)
+    total = sum(self_us for _, self_us, _, _ in rows)
+    end = max(i for i, row in enumerate(rows) if row[0] == 0 and row[3] == module)
+    start = max((i for i, row in enumerate(rows[:end]) if row[0] == 0), default=-1) + 1
+    direct = sorted((row for row in rows[start:end] if row[0] == 1), key=lambda row: -row[2])
+    return total, [(name, cumulative_us) for _, _, cumulative_us, name in direct[:top]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모듈 import 시간 요약 (python -X importtime)')
+    parser.add_argument('module', help='불러올 모듈 이름 (예: main)')
+    parser.add_argument('--top', type=int, default=TOP_MODULES, help='보여줄 모듈 수')
+    args = parser.parse_args()
+    total, modules = summary(import_times(args.module), args.module, args.top)
+    print(f'import {args.module}: {total / 1000:.0f} ms')
+    for name, cumulative_us in modules:
+        print(f'  {cumulative_us / 1000:8.1f} ms  {name}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,323 @@
+import atexit
+import functools
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# 이벤트 핸들러 성능 기록 (여러 데모가 함께 씀)
+# - @timed() 로 감싼 함수나 with measure('canvas.draw'): 블록의 걸린 시간, 처리한 행 수, 메모리 변화(RSS)를
+#   최근 RING_SIZE개까지 메모리(링 버퍼)에 남깁니다. 처리한 행 수는 핸들러 안에서 rows(n)으로 알려줍니다.
+# - 환경 변수 VIBE_PERF_LOG=perf.jsonl (또는 perf.db)을 주거나 open_log()를 부르면 파일에도 남깁니다.
+#   (작업 스레드가 모아서 쓰므로 화면이 멈추지 않음)
+# - profile_next()를 부르면 다음 한 번의 동작을 cProfile로 재서 PROFILE_DIR에 .prof 파일과 요약을 남깁니다.
+# - 각 앱의 숨은 진단 창(Ctrl+Shift+D)이 summary_rows()로 핸들러별 p50/p95를 보여줍니다.
+try:
+    import psutil
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+RING_SIZE = 5000
+LOG_ENV = 'VIBE_PERF_LOG'
+JSONL_EXTS = ('.jsonl', '.json')
+SQLITE_EXTS = ('.db', '.sqlite', '.sqlite3')
+PROFILE_DIR = 'profiles'
+PROFILE_LINES = 25
+PROFILE_KEEP = 5
+STATM_PATH = '/proc/self/statm'
+MIB = 1024 * 1024
+SUMMARY_HEADERS = ('핸들러', '횟수', 'p50 (ms)', 'p95 (ms)', '최대 (ms)', '최근 행 수', '메모리 최대 (MiB)', '오류')
+# 함수 코드 객체의 *args 표시 (inspect.CO_VARARGS, inspect는 불러오는 데 오래 걸려 쓰지 않음)
+CO_VARARGS = 0x04
+
+
+def rss_bytes():
+    # 프로세스가 실제로 쓰는 메모리 (psutil, 없으면 리눅스 /proc/self/statm, 둘 다 없으면 None)
+    if HAS_PSUTIL:
+        return psutil.Process().memory_info().rss
+    try:
+        with open(STATM_PATH) as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def percentile(sorted_values, p):
+    # 정렬된 값에서 p 백분위수 (가장 가까운 순위)
+    index = max(0, min(len(sorted_values) - 1, -(-len(sorted_values) * p // 100) - 1))
+    return sorted_values[index]
+
+
+class Span:
+    # 측정 중인 한 번의 동작. rows는 rows(n)이나 span.rows = n으로 채웁니다.
+    def __init__(self, name, rows=None):
+        self.name = name
+        self.rows = rows
+
+
+class Recorder:
+    def __init__(self, size=RING_SIZE):
+        self.track_memory = rss_bytes() is not None
+        self._records = deque(maxlen=size)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._writer = None
+        self._profile_request = None
+        self._profiling = False
+        self.profiles = deque(maxlen=PROFILE_KEEP)
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def measure(self, name, rows=None):
+        span = Span(name, rows)
+        stack = self._stack()
+        stack.append(span)
+        profiler = self._start_profile(name)
+        memory = rss_bytes() if self.track_memory else None
+        created = time.time()
+        start = time.perf_counter()
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = type(e).__name__
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            if profiler is not None:
+                self._finish_profile(profiler, name)
+            stack.pop()
+            after = rss_bytes() if memory is not None else None
+            self.add({
+                'created': created,
+                'name': name,
+                'seconds': seconds,
+                'rows': span.rows,
+                'memory': None if after is None else after - memory,
+                'thread': threading.current_thread().name,
+                'error': error,
+            })
+
+    def rows(self, count):
+        # 지금 측정 중인 (가장 안쪽) 동작의 처리 행 수
+        stack = self._stack()
+        if stack:
+            stack[-1].rows = None if count is None else int(count)
+
+    def add(self, record):
+        with self._lock:
+            self._records.append(record)
+            writer = self._writer
+        if writer is not None:
+            writer.put(record)
+
+    def records(self, name=None):
+        with self._lock:
+            records = list(self._records)
+        return records if name is None else [r for r in records if r['name'] == name]
+
+    def clear(self):
+        with self._lock:
+            self._records.clear()
+
+    def summary(self):
+        # {이름: {'count', 'p50', 'p95', 'max'(초), 'rows'(최근), 'memory'(최대 바이트), 'errors'}}
+        groups = {}
+        for record in self.records():
+            groups.setdefault(record['name'], []).append(record)
+        result = {}
+        for name, records in groups.items():
+            seconds = sorted(r['seconds'] for r in records)
+            rows = [r['rows'] for r in records if r['rows'] is not None]
+            memory = [r['memory'] for r in records if r['memory'] is not None]
+            result[name] = {
+                'count': len(records),
+                'p50': percentile(seconds, 50),
+                'p95': percentile(seconds, 95),
+                'max': seconds[-1],
+                'rows': rows[-1] if rows else None,
+                'memory': max(memory) if memory else None,
+                'errors': sum(r['error'] is not None for r in records),
+            }
+        return result
+
+    def summary_rows(self):
+        # 진단 창에 보여줄 행 (SUMMARY_HEADERS 순서, p95가 큰 순)
+        rows = []
+        for name, s in sorted(self.summary().items(), key=lambda item: -item[1]['p95']):
+            rows.append((name, s['count'], f"{s['p50'] * 1000:.1f}", f"{s['p95'] * 1000:.1f}",
+                         f"{s['max'] * 1000:.1f}", '' if s['rows'] is None else f"{s['rows']:,}",
+                         '' if s['memory'] is None else f"{s['memory'] / MIB:+.1f}", s['errors'] or ''))
+        return rows
+
+    # --- 파일 기록 ---
+    def open_log(self, path):
+        # 이후 기록을 path(.jsonl 또는 .db)에도 남깁니다. 이미 열린 기록 파일은 닫습니다.
+        writer = _LogWriter(path)
+        with self._lock:
+            old, self._writer = self._writer, writer
+        if old is not None:
+            old.close()
+        return path
+
+    def close_log(self):
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            writer.close()
+
+    @property
+    def log_path(self):
+        writer = self._writer
+        return None if writer is None else writer.path
+
+    # --- cProfile ---
+    def profile_next(self, name=None):
+        # 다음 한 번의 동작(name이 있으면 그 이름의 동작)을 cProfile로 잽니다.
+        with self._lock:
+            self._profile_request = name or ''
+
+    @property
+    def profile_pending(self):
+        return self._profile_request is not None
+
+    def _start_profile(self, name):
+        with self._lock:
+            request = self._profile_request
+            if request is None or self._profiling or request not in ('', name):
+                return None
+            self._profile_request = None
+            self._profiling = True
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+        return profiler
+
+    def _finish_profile(self, profiler, name):
+        profiler.disable()
+        try:
+            import io
+            import pstats
+            os.makedirs(PROFILE_DIR, exist_ok=True)
+            path = os.path.join(PROFILE_DIR, f"{name}_{datetime.now():%Y%m%d_%H%M%S}.prof")
+            profiler.dump_stats(path)
+            out = io.StringIO()
+            pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+            self.profiles.append({'name': name, 'path': path, 'text': out.getvalue()})
+        except OSError as e:
+            self.profiles.append({'name': name, 'path': None, 'text': f'프로파일을 저장하지 못했습니다: {e}'})
+        finally:
+            with self._lock:
+                self._profiling = False
+
+
+class _LogWriter:
+    # 기록을 큐에 넣으면 작업 스레드가 쌓인 만큼 한 번에 씁니다. close()는 남은 기록을 다 쓰고 끝냅니다.
+    def __init__(self, path):
+        ext = os.path.splitext(path)[1].lower()
+        if ext not in JSONL_EXTS + SQLITE_EXTS:
+            raise ValueError(f"기록 파일은 {', '.join(JSONL_EXTS + SQLITE_EXTS)} 중 하나여야 합니다: {path}")
+        self.path = path
+        self.sqlite = ext in SQLITE_EXTS
+        # 파일은 여기서 열어 잘못된 경로를 바로 알리고, 쓰기는 작업 스레드에서만 합니다.
+        self._target = self._open()
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='perf-log', daemon=True)
+        self._thread.start()
+
+    def put(self, record):
+        self._queue.put(record)
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        target = self._target
+        try:
+            while True:
+                batch = [self._queue.get()]
+                while not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                done = None in batch
+                self._write(target, [record for record in batch if record is not None])
+                if done:
+                    return
+        finally:
+            target.close()
+
+    def _open(self):
+        if not self.sqlite:
+            return open(self.path, 'a', encoding='utf-8')
+        import sqlite3
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute('''CREATE TABLE IF NOT EXISTS perf_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            created_at TEXT NOT NULL,
+            name TEXT NOT NULL,
+            seconds REAL NOT NULL,
+            rows INTEGER,
+            memory INTEGER,
+            thread TEXT,
+            error TEXT
+        )''')
+        conn.execute('CREATE INDEX IF NOT EXISTS idx_perf_log_name ON perf_log (name, created_at)')
+        conn.commit()
+        return conn
+
+    def _write(self, target, records):
+        if not records:
+            return
+        rows = [(datetime.fromtimestamp(r['created']).isoformat(timespec='milliseconds'), r['name'],
+                 r['seconds'], r['rows'], r['memory'], r['thread'], r['error']) for r in records]
+        if self.sqlite:
+            target.executemany('INSERT INTO perf_log (created_at, name, seconds, rows, memory, thread, error) '
+                               'VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            target.commit()
+            return
+        import json
+        keys = ('created_at', 'name', 'seconds', 'rows', 'memory', 'thread', 'error')
+        for row in rows:
+            target.write(json.dumps(dict(zip(keys, row)), ensure_ascii=False) + '\n')
+        target.flush()
+
+
+recorder = Recorder()
+measure = recorder.measure
+rows = recorder.rows
+summary = recorder.summary
+summary_rows = recorder.summary_rows
+profile_next = recorder.profile_next
+
+
+def timed(name=None):
+    # 함수 전체를 measure(name 또는 함수 이름)로 감쌉니다.
+    # Qt 신호는 함수가 받지 않는 인자(clicked의 checked 등)도 넘기므로, 원래 함수가 받는 개수만큼만 넘깁니다.
+    def decorate(fn):
+        label = name or fn.__name__
+        code = fn.__code__
+        limit = None if code.co_flags & CO_VARARGS else code.co_argcount
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with recorder.measure(label):
+                return fn(*args[:limit], **kwargs)
+        return wrapper
+    return decorate
+
+
+if os.environ.get(LOG_ENV):
+    try:
+        recorder.open_log(os.environ[LOG_ENV])
+    except (ValueError, OSError) as e:
+        print(f'{LOG_ENV}: {e}', file=sys.stderr)
+atexit.register(recorder.close_log)
@@ -0,0 +1,43 @@
+import importlib
+import threading
+
+# 시작 시간을 줄이기 위한 지연 import
+# - lazy_module('storage')는 모듈을 불러오지 않고 대리 객체를 바로 돌려줍니다.
+#   storage.load_dataframe처럼 속성을 처음 읽을 때 import 합니다.
+#   (from storage import load_dataframe처럼 쓰면 그 자리에서 불러오므로 모듈 이름을 붙여서 씁니다)
+# - preload()는 창을 띄운 뒤 작업 스레드에서 모듈을 미리 불러 둡니다.
+#   다 불러오기 전에 화면에서 쓰면 그 모듈의 import가 끝날 때까지 기다렸다가 이어서 씁니다. (import 잠금)
+
+
+class LazyModule:
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+
+def lazy_module(name):
+    return LazyModule(name)
+
+
+def preload(names, on_error=None):
+    # names의 모듈을 작업 스레드(daemon)에서 차례로 불러옵니다. 실패하면 on_error(이름, 예외)
+    # (실패해도 나중에 그 모듈을 쓸 때 같은 오류가 다시 나므로 여기서는 알리기만 합니다)
+    def run():
+        for name in names:
+            try:
+                importlib.import_module(name)
+            except Exception as e:
+                if on_error is not None:
+                    on_error(name, e)
+
+    thread = threading.Thread(target=run, name='preload', daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,102 @@
+import tkinter as tk
+from tkinter import ttk, filedialog, messagebox
+import instrument
+
+# 핸들러별 처리 시간 창 (Tk 데모가 함께 씀)
+# 메뉴/버튼 없이 Ctrl+Shift+D로 열고, 열려 있는 동안 REFRESH_MS마다 갱신합니다.
+# - '다음 동작 프로파일': 고른 핸들러(기본: 아무 동작)의 다음 한 번을 cProfile로 재서 아래에 요약을 보여줍니다.
+# - '기록 파일...': 이후 기록을 JSONL/SQLite 파일에도 남깁니다. (instrument.open_log)
+REFRESH_MS = 1000
+SHORTCUT = '<Control-D>'
+ANY_HANDLER = '(다음 동작)'
+COLUMN_WIDTHS = (180, 50, 70, 70, 70, 90, 110, 40)
+LOG_FILETYPES = [('JSON Lines', '*.jsonl'), ('SQLite DB', '*.db')]
+
+_window = None
+
+
+def bind_perf_window(root):
+    # Ctrl+Shift+D (Tk에서는 Shift를 누른 대문자 D로 씁니다)
+    root.bind_all(SHORTCUT, lambda e: show_perf_window(root))
+
+
+def show_perf_window(root):
+    global _window
+    if _window is not None and _window.winfo_exists():
+        _window.deiconify()
+        _window.lift()
+        return _window
+    win = _window = tk.Toplevel(root)
+    win.title('성능 기록 (핸들러별 처리 시간)')
+    columns = [f'c{i}' for i in range(len(instrument.SUMMARY_HEADERS))]
+    tree = ttk.Treeview(win, columns=columns, show='headings', height=12)
+    for i, (col, header) in enumerate(zip(columns, instrument.SUMMARY_HEADERS)):
+        tree.heading(col, text=header)
+        tree.column(col, width=COLUMN_WIDTHS[i], anchor='w' if i == 0 else 'e')
+    tree.pack(fill='both', expand=True, padx=10, pady=(10, 5))
+
+    controls = ttk.Frame(win)
+    controls.pack(fill='x', padx=10)
+    target = ttk.Combobox(controls, state='readonly', width=28, values=[ANY_HANDLER])
+    target.set(ANY_HANDLER)
+    target.pack(side='left')
+    status = ttk.Label(win, text='')
+    profile_text = tk.Text(win, height=16, width=110, state='disabled', font='TkFixedFont', wrap='none')
+    shown = {'profile': None}
+
+    def arm():
+        name = target.get()
+        instrument.profile_next(None if name == ANY_HANDLER else name)
+        refresh_status()
+
+    def clear():
+        instrument.recorder.clear()
+        refresh()
+
+    def choose_log():
+        path = filedialog.asksaveasfilename(parent=win, title='기록 파일', defaultextension='.jsonl',
+                                            filetypes=LOG_FILETYPES)
+        if not path:
+            return
+        try:
+            instrument.recorder.open_log(path)
+        except (ValueError, OSError) as e:
+            messagebox.showerror('오류', str(e), parent=win)
+        refresh_status()
+
+    ttk.Button(controls, text='다음 동작 프로파일', command=arm).pack(side='left', padx=5)
+    ttk.Button(controls, text='기록 지우기', command=clear).pack(side='left', padx=5)
+    ttk.Button(controls, text='기록 파일...', command=choose_log).pack(side='left', padx=5)
+    status.pack(fill='x', padx=10, pady=5)
+    profile_text.pack(fill='both', expand=True, padx=10, pady=(0, 10))
+
+    def refresh_status():
+        parts = [f'기록 파일: {instrument.recorder.log_path or "없음"}']
+        if instrument.recorder.profile_pending:
+            parts.append('다음 동작을 프로파일합니다...')
+        status.config(text='  |  '.join(parts))
+
+    def show_profile():
+        profiles = instrument.recorder.profiles
+        if not profiles or profiles[-1] is shown['profile']:
+            return
+        profile = shown['profile'] = profiles[-1]
+        profile_text.config(state='normal')
+        profile_text.delete('1.0', tk.END)
+        profile_text.insert(tk.END, f"[{profile['name']}] {profile['path'] or ''}\n{profile['text']}")
+        profile_text.config(state='disabled')
+
+    def refresh():
+        if not win.winfo_exists():
+            return
+        rows = instrument.summary_rows()
+        tree.delete(*tree.get_children())
+        for row in rows:
+            tree.insert('', 'end', values=row)
+        target['values'] = [ANY_HANDLER] + sorted(row[0] for row in rows)
+        refresh_status()
+        show_profile()
+        win.after(REFRESH_MS, refresh)
+
+    refresh()
+    return win
@@ -0,0 +1,163 @@
+import os
+import pandas as pd
+from openpyxl import Workbook
+
+# 여러 데모가 함께 쓰는 표 내보내기 (엑셀/CSV/Parquet)
+# - 데이터를 EXPORT_CHUNK_ROWS행씩 나눠 쓰므로 한 번에 한 조각만 메모리에 올라갑니다.
+# - 엑셀은 openpyxl write-only 모드로 행을 바로 흘려 쓰고, 시트 한 장의 행 수 제한(1,048,576행)을
+#   넘으면 다음 시트(Sheet2, Sheet3...)에 제목 행부터 이어서 씁니다.
+# - 임시 파일에 쓴 뒤 교체하므로 취소/실패 시 반쯤 쓰인 파일이 남지 않습니다.
+# 작업 스레드에서 호출하고, progress(쓴 행 수, 전체 행 수)와 should_cancel()로 진행률/취소를 주고받습니다.
+try:
+    import pyarrow
+    import pyarrow.parquet
+    HAS_PARQUET = True
+except ImportError:
+    HAS_PARQUET = False
+
+EXPORT_CHUNK_ROWS = 10000
+EXCEL_MAX_ROWS = 1048576
+EXPORT_FORMATS = {'.xlsx': 'Excel', '.csv': 'CSV', '.parquet': 'Parquet'}
+# CSV는 엑셀에서 바로 열어도 한글이 깨지지 않게 BOM을 붙입니다.
+CSV_ENCODING = 'utf-8-sig'
+
+
+def export_formats():
+    # 파일 선택 창에 보여줄 (확장자, 이름) 목록 (pyarrow가 없으면 Parquet 제외)
+    return [(ext, name) for ext, name in EXPORT_FORMATS.items() if ext != '.parquet' or HAS_PARQUET]
+
+
+def frame_chunks(df, rows=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # df(또는 rows에 있는 행 위치만)를 chunk_rows행씩 잘라서 돌려줍니다. 전체를 복사하지 않습니다.
+    total = len(df) if rows is None else len(rows)
+    for start in range(0, total, chunk_rows):
+        if rows is None:
+            yield df.iloc[start:start + chunk_rows]
+        else:
+            yield df.take(rows[start:start + chunk_rows])
+
+
+def export_dataframe(df, file_path, rows=None, progress=None, should_cancel=None):
+    # DataFrame(필터 결과라면 rows = 행 위치 배열)을 확장자에 맞는 형식으로 저장합니다.
+    total = len(df) if rows is None else len(rows)
+    return export_chunks(frame_chunks(df, rows), file_path, list(df.columns), total,
+                         progress=progress, should_cancel=should_cancel)
+
+
+def export_chunks(chunks, file_path, columns, total=None, progress=None, should_cancel=None):
+    # chunks: 같은 컬럼의 DataFrame 조각들. 끝까지 썼으면 True, 취소되면 False
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in EXPORT_FORMATS:
+        raise ValueError(f'지원하지 않는 형식입니다: {ext or "(확장자 없음)"}')
+    if ext == '.parquet' and not HAS_PARQUET:
+        raise ValueError('Parquet로 저장하려면 pyarrow를 설치하세요.')
+    root = os.path.splitext(file_path)[0]
+    tmp_path = f'{root}.tmp{ext}'
+    writer = {'.xlsx': _ExcelWriter, '.csv': _CsvWriter, '.parquet': _ParquetWriter}[ext](tmp_path, columns)
+    done = 0
+    try:
+        try:
+            for chunk in chunks:
+                if should_cancel is not None and should_cancel():
+                    return False
+                writer.write(chunk)
+                done += len(chunk)
+                if progress is not None:
+                    progress(done, total)
+        finally:
+            writer.close()
+        if should_cancel is not None and should_cancel():
+            return False
+        os.replace(tmp_path, file_path)
+        return True
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _cell_rows(chunk):
+    # 엑셀 셀 값: 빈 값(NaN/NaT/NA)은 빈칸(None), 나머지는 그대로
+    values = chunk.astype(object)
+    return values.where(chunk.notna(), None).itertuples(index=False, name=None)
+
+
+class _ExcelWriter:
+    def __init__(self, path, columns):
+        self.path = path
+        self.header = [str(col) for col in columns]
+        self.workbook = Workbook(write_only=True)
+        self.sheet = None
+        self.sheet_rows = EXCEL_MAX_ROWS
+
+    def _next_sheet(self):
+        self.sheet = self.workbook.create_sheet(f'Sheet{len(self.workbook.worksheets) + 1}')
+        self.sheet.append(self.header)
+        self.sheet_rows = 1
+
+    def write(self, chunk):
+        for row in _cell_rows(chunk):
+            if self.sheet_rows >= EXCEL_MAX_ROWS:
+                self._next_sheet()
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        if self.sheet is None:
+            self._next_sheet()
+        self.workbook.save(self.path)
+
+
+class _CsvWriter:
+    def __init__(self, path, columns):
+        self.file = open(path, 'w', encoding=CSV_ENCODING, newline='')
+        self.columns = list(columns)
+        self.header = True
+
+    def write(self, chunk):
+        chunk.to_csv(self.file, index=False, header=self.header)
+        self.header = False
+
+    def close(self):
+        if self.header:
+            pd.DataFrame(columns=self.columns).to_csv(self.file, index=False)
+        self.file.close()
+
+
+class _ParquetWriter:
+    def __init__(self, path, columns):
+        self.path = path
+        self.columns = list(columns)
+        self.writer = None
+
+    def write(self, chunk):
+        # 첫 조각의 스키마로 파일을 만들고, 이후 조각은 그 스키마에 맞춰 씁니다.
+        # 숫자와 글자가 섞인 컬럼(엑셀/DB에서 흔함)과 첫 조각에서 값이 모두 빈 컬럼은 글자로 저장합니다.
+        chunk = chunk.rename(columns=str)
+        text_columns = [col for col in chunk.columns if chunk[col].dtype == object
+                        and pd.api.types.infer_dtype(chunk[col], skipna=True).startswith('mixed')]
+        if self.writer is not None:
+            text_columns += [field.name for field in self.writer.schema
+                             if pyarrow.types.is_string(field.type) and chunk[field.name].dtype == object]
+        for col in text_columns:
+            values = chunk[col]
+            chunk[col] = values.where(values.isna(), values.astype(str))
+        try:
+            if self.writer is None:
+                table = pyarrow.Table.from_pandas(chunk, preserve_index=False)
+                schema = pyarrow.schema(
+                    [pyarrow.field(f.name, pyarrow.string()) if pyarrow.types.is_null(f.type) else f
+                     for f in table.schema], metadata=table.schema.metadata)
+                table = table.cast(schema)
+                self.writer = pyarrow.parquet.ParquetWriter(self.path, schema)
+            else:
+                table = pyarrow.Table.from_pandas(chunk, schema=self.writer.schema, preserve_index=False)
+        except (pyarrow.ArrowInvalid, pyarrow.ArrowTypeError, pyarrow.ArrowNotImplementedError) as e:
+            raise ValueError('Parquet는 컬럼마다 값의 형식이 같아야 합니다. '
+                             '형식이 섞인 데이터는 CSV나 엑셀로 저장하세요.') from e
+        self.writer.write_table(table)
+
+    def close(self):
+        if self.writer is None:
+            pd.DataFrame(columns=[str(col) for col in self.columns]).to_parquet(self.path, index=False)
+        else:
+            self.writer.close()
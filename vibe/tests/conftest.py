@@ -0,0 +1,10 @@
+import os
+import sys
+
+# 데모 모듈을 "cd demoX && python main.py"로 실행할 때처럼 이름만으로 불러올 수 있게 합니다.
+# (각 데모의 main.py는 이름이 같으므로 테스트에서 불러오지 않습니다)
+VIBE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for name in ('shared', 'demo1_lecture_manager', 'demo2_faq_chatbot', 'demo3_data_dashboard'):
+    path = os.path.join(VIBE_DIR, name)
+    if path not in sys.path:
+        sys.path.insert(0, path)
@@ -0,0 +1,53 @@
+import os
+import shutil
+import pytest
+import engine
+import model_store
+
+FAQ_DUMMY = os.path.join(os.path.dirname(os.path.abspath(engine.__file__)), engine.FAQ_DUMMY)
+
+
+@pytest.fixture(params=['char_ngram', 'word'])
+def faq_engine(request, tmp_path, monkeypatch):
+    # 더미 FAQ로 임시 폴더에 DB/모델을 만듭니다. (저장소의 faq_chatbot.db는 건드리지 않음)
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(FAQ_DUMMY, engine.FAQ_DUMMY)
+    engine.init_db(engine.DB_PATH)
+    faq = engine.FAQEngine(engine.DB_PATH, tokenizer=request.param, log_history=False)
+    faq.load()
+    yield faq
+    faq.close()
+
+
+@pytest.mark.parametrize('question, expected', [
+    ('파이썬 설치는 어떻게 해', '파이썬 설치 방법'),
+    ('리스트랑 튜플 차이', '리스트와 튜플의 차이'),
+    ('클래스 정의하기', '파이썬에서 클래스 정의'),
+    ('딕셔너리란', '파이썬에서 딕셔너리란?'),
+])
+def test_answers_related_question(faq_engine, question, expected):
+    result = faq_engine.answer(question, log=False)
+    assert result['found']
+    assert result['matched_question'] == expected
+
+
+@pytest.mark.parametrize('question', ['asdf', 'class', 'qwerty', 'hello world', '오늘 날씨 어때', '점심 메뉴 추천'])
+def test_nonsense_and_off_topic_are_not_answered(faq_engine, question):
+    result = faq_engine.answer(question, log=False)
+    assert not result['found']
+    assert result['answer'] == engine.NO_ANSWER
+
+
+def test_threshold_is_saved_with_model(tmp_path, monkeypatch):
+    # 최소 유사도를 다시 맞추면 예전 값으로 저장된 모델은 쓰지 않고 다시 학습합니다.
+    monkeypatch.chdir(tmp_path)
+    shutil.copy(FAQ_DUMMY, engine.FAQ_DUMMY)
+    engine.init_db(engine.DB_PATH)
+    faq = engine.FAQEngine(engine.DB_PATH, log_history=False)
+    faq.load()
+    faq.close()
+    ids = faq.faq.ids
+    key = model_store.faq_fingerprint(ids, faq.faq.questions, faq.tokenizer)
+    vectorizer = faq.make_vectorizer()
+    assert model_store.load_model(model_store.MODEL_DIR, key, vectorizer, faq.faq.threshold) is not None
+    assert model_store.load_model(model_store.MODEL_DIR, key, vectorizer, faq.faq.threshold + 0.1) is None
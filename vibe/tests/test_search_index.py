@@ -0,0 +1,26 @@
+import numpy as np
+import pandas as pd
+import pytest
+from search_index import SearchIndex, scan_search
+
+
+@pytest.fixture
+def frame():
+    # 빈 값(None/NaN)이 마지막 고유값과 맞는지 가리기 위해 컬럼마다 빈 칸을 둡니다.
+    return pd.DataFrame({
+        '강좌명': ['x1', None, 'pa', 'p1', '파이썬 기초'],
+        '점수': [1.0, np.nan, 2.0, 1.0, 10.0],
+        '강사': ['김철수', '이영희', None, '박민수', 'PARK'],
+    })
+
+
+@pytest.mark.parametrize('term', ['pa', '1', 'p', 'park', '파이썬', '기초', '김', 'nan', 'none', 'zz'])
+def test_index_matches_scan(frame, term):
+    index = SearchIndex.build(frame)
+    assert index.search(term).tolist() == scan_search(frame, term).tolist()
+
+
+@pytest.mark.parametrize('pattern', [r'^p', r'\d', r'.*', r'수$'])
+def test_index_matches_scan_regex(frame, pattern):
+    index = SearchIndex.build(frame)
+    assert index.search(pattern, regex=True).tolist() == scan_search(frame, pattern, regex=True).tolist()
@@ -0,0 +1,37 @@
+import pytest
+from staff_loader import read_staff_csv
+
+HEADER = '이름,부서,직급,입사년도,성별,나이\n'
+
+
+def write_csv(tmp_path, rows):
+    path = tmp_path / 'staff.csv'
+    path.write_text(HEADER + ''.join(row + '\n' for row in rows), encoding='utf-8-sig')
+    return str(path)
+
+
+def test_small_ints_are_narrowed(tmp_path):
+    df = read_staff_csv(write_csv(tmp_path, ['김철수,교무부,교사,2010,남,45', '이영희,행정실,주무관,2020,여,31']))
+    assert str(df['나이'].dtype) == 'int8'
+    assert str(df['입사년도'].dtype) == 'int16'
+
+
+def test_out_of_range_value_is_kept(tmp_path):
+    # 나이 200은 int8에 들어가지 않으므로 -56으로 깨지지 않고 더 큰 정수 형식으로 읽혀야 합니다.
+    df = read_staff_csv(write_csv(tmp_path, ['김철수,교무부,교사,2010,남,200', '이영희,행정실,주무관,2020,여,']))
+    assert df['나이'].tolist()[0] == 200
+    assert str(df['나이'].dtype) == 'Int16'
+    assert df['나이'].isna().tolist() == [False, True]
+
+
+def test_out_of_range_across_chunks(tmp_path, monkeypatch):
+    # 조각마다 형식이 달라도(int8 / int16) 합친 결과는 값이 그대로여야 합니다.
+    monkeypatch.setattr('staff_loader.PREVIEW_ROWS', 1)
+    monkeypatch.setattr('staff_loader.LOAD_CHUNK_ROWS', 1)
+    df = read_staff_csv(write_csv(tmp_path, ['김철수,교무부,교사,2010,남,45', '이영희,행정실,주무관,2020,여,300']))
+    assert df['나이'].tolist() == [45, 300]
+
+
+def test_value_beyond_int64_is_a_load_error(tmp_path):
+    with pytest.raises(ValueError, match='나이'):
+        read_staff_csv(write_csv(tmp_path, ['김철수,교무부,교사,2010,남,1e30']))